@@ -0,0 +1,29 @@
+"""
+Admin Access - guard for debugging and introspection features
+Profiling and memory introspection are useful in production but must not be
+reachable by arbitrary clients (they cost CPU and expose internals). They are
+off unless AI_SERVICE_ADMIN_TOKEN is set, and then require the same token in
+the X-Admin-Token header.
+"""
+
+import hmac
+import os
+from typing import Optional
+
+from flask import Request
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def admin_token() -> Optional[str]:
+    """Configured admin token (read per call so tests and reloads can change it)."""
+    return os.getenv("AI_SERVICE_ADMIN_TOKEN") or None
+
+
+def is_admin_request(req: Request) -> bool:
+    """Whether the request carries the configured admin token (False if none is configured)."""
+    token = admin_token()
+    supplied = req.headers.get(ADMIN_TOKEN_HEADER)
+    if not token or not supplied:
+        return False
+    return hmac.compare_digest(token.encode(), supplied.encode())
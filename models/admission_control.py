@@ -0,0 +1,330 @@
+"""
+Admission Control - concurrency limits and backpressure for expensive endpoints
+Without limits an application surge piles unbounded /api/match-application and
+/api/execute-code requests onto the service until it runs out of memory or every
+request times out. Each admission group (the resource an endpoint consumes)
+admits a fixed number of concurrent requests and keeps a bounded wait queue;
+overflow gets an immediate 503 with Retry-After.
+
+Priority classes:
+- interactive: live candidate requests (apply, run code, submit assessment)
+- batch:       recruiter bulk jobs (bulk matching, clustering, generation)
+
+Waiting requests are admitted interactive-first (FIFO within a class). When the
+queue is full, an arriving interactive request displaces the newest queued batch
+request instead of being rejected. Clients may override an endpoint's default
+class with the X-Request-Priority header.
+
+Admitted and queued requests each hold a request thread, so all groups share
+one thread budget: once it is used up, further limited requests get an
+immediate 503 and the remaining threads stay free for /health and cheap
+endpoints.
+
+Limits apply per service process and only bind where a process serves many
+requests at once: ASGI mode (AI_SERVICE_MODE=asgi, a2wsgi request threads) or
+gunicorn gthread workers. start.sh's default sync gunicorn workers serve one
+request at a time, so there the worker count is the only concurrency limit.
+
+Environment:
+    AI_SERVICE_ADMISSION=0                   - disable admission control
+    AI_SERVICE_ADMISSION_<GROUP>=<n>:<queue> - e.g. AI_SERVICE_ADMISSION_ENCODE=4:32
+    AI_SERVICE_ADMISSION_QUEUE_TIMEOUT       - max seconds in queue (default: 10)
+    AI_SERVICE_ADMISSION_MAX_HELD            - admitted + queued requests across all groups
+                                               (default: AI_SERVICE_ASGI_THREADS - 8)
+"""
+
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from service_metrics import Counter, Gauge, Histogram, register_collector
+
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+# Endpoint -> (admission group, default priority class)
+ADMISSION_RULES = {
+    "/api/match-application": ("encode", "interactive"),
+    "/api/shortlist-pdf": ("encode", "interactive"),
+    "/api/match-applications": ("encode", "batch"),
+    "/api/embeddings": ("encode", "batch"),
+    "/api/cluster-applicants": ("encode", "batch"),
+    "/api/assign-applicants": ("encode", "batch"),
+    "/api/execute-code": ("cpu", "interactive"),
+    "/api/score-assessment": ("cpu", "interactive"),
+    "/api/parse-pdf": ("cpu", "interactive"),
+    "/api/score-assessments": ("cpu", "batch"),
+    "/api/parse-pdfs": ("cpu", "batch"),
+    "/api/generate-assessment": ("gemini", "batch"),
+}
+
+# Group -> (max concurrent, max queued); all groups together are capped by MAX_HELD_THREADS
+DEFAULT_LIMITS = {
+    "encode": (4, 32),
+    "cpu": (max(2, os.cpu_count() or 2), 32),
+    "gemini": (8, 16),
+}
+
+QUEUE_TIMEOUT_SECONDS = float(os.getenv("AI_SERVICE_ADMISSION_QUEUE_TIMEOUT", 10))
+
+# Request threads left for unlimited endpoints (/health, /api/analyze-jd, ...)
+RESERVED_THREADS = 8
+MAX_HELD_THREADS = int(os.getenv(
+    "AI_SERVICE_ADMISSION_MAX_HELD", max(1, int(os.getenv("AI_SERVICE_ASGI_THREADS", 32)) - RESERVED_THREADS)
+))
+MAX_RETRY_AFTER_SECONDS = 60
+
+QUEUE_WAIT = Histogram(
+    "ai_service_admission_queue_wait_seconds", "Time admitted requests spent waiting in the queue",
+    ("group", "priority")
+)
+REJECTED_TOTAL = Counter(
+    "ai_service_admission_rejected_total", "Requests rejected with 503 by admission control",
+    ("group", "priority", "reason")
+)
+ACTIVE = Gauge(
+    "ai_service_admission_active", "Requests currently admitted per admission group",
+    ("group",)
+)
+QUEUED = Gauge(
+    "ai_service_admission_queued", "Requests waiting for admission per group",
+    ("group",)
+)
+
+
+def admission_enabled() -> bool:
+    return os.getenv("AI_SERVICE_ADMISSION", "1").lower() not in ("0", "false", "no")
+
+
+def _env_limits(group: str) -> Tuple[int, int]:
+    """Read "<concurrency>:<queue>" for a group from the environment."""
+    default = DEFAULT_LIMITS[group]
+    value = os.getenv(f"AI_SERVICE_ADMISSION_{group.upper()}")
+    if not value:
+        return default
+    try:
+        concurrency, _, queue = value.partition(":")
+        return max(1, int(concurrency)), max(0, int(queue or default[1]))
+    except ValueError:
+        return default
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted (queue full, displaced or timed out)."""
+
+    def __init__(self, group: str, reason: str, retry_after: int):
+        super().__init__(f"{group} admission rejected: {reason}")
+        self.group = group
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class ThreadBudget:
+    """
+    Request threads that admitted and queued requests may hold, across groups.
+
+    Args:
+        limit: Threads that may be held at once
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.held = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.held >= self.limit:
+                return False
+            self.held += 1
+            return True
+
+    def give_back(self) -> None:
+        with self._lock:
+            self.held -= 1
+
+
+class _Waiter:
+    __slots__ = ("priority", "rejected")
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.rejected = False
+
+
+class AdmissionController:
+    """
+    Concurrency limit with a bounded, priority-ordered wait queue.
+
+    Args:
+        group: Admission group name (metric label)
+        max_concurrent: Requests admitted at once
+        max_queue: Requests allowed to wait for a slot
+        queue_timeout: Longest a request may wait before a 503
+        budget: Thread budget shared with other groups (None = unbounded)
+    """
+
+    def __init__(self, group: str, max_concurrent: int, max_queue: int,
+                 queue_timeout: float = QUEUE_TIMEOUT_SECONDS, budget: Optional[ThreadBudget] = None):
+        self.group = group
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.budget = budget
+        self.active = 0
+        self._cond = threading.Condition()
+        self._queue = []  # heap of (priority, sequence, waiter)
+        self._sequence = itertools.count()
+        # Moving average of how long admitted requests hold a slot (for Retry-After)
+        self._avg_hold = 1.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def _retry_after(self) -> int:
+        waves = (len(self._queue) + 1) / self.max_concurrent
+        return max(1, min(MAX_RETRY_AFTER_SECONDS, math.ceil(self._avg_hold * waves)))
+
+    def _reject(self, priority_name: str, reason: str) -> AdmissionRejected:
+        REJECTED_TOTAL.inc(self.group, priority_name, reason)
+        return AdmissionRejected(self.group, reason, self._retry_after())
+
+    def _remove(self, waiter: _Waiter) -> None:
+        self._queue = [entry for entry in self._queue if entry[2] is not waiter]
+        heapq.heapify(self._queue)
+
+    def acquire(self, priority_name: str = "interactive", max_wait: Optional[float] = None) -> float:
+        """
+        Wait for a slot.
+
+        Args:
+            priority_name: "interactive" or "batch"
+            max_wait: Optional shorter wait than queue_timeout (e.g. time left
+                      before the request's deadline)
+
+        Returns:
+            perf_counter() timestamp of admission (pass to release())
+
+        Raises:
+            AdmissionRejected: thread budget used up, queue full, displaced by
+                               higher priority, or timed out
+        """
+        if self.budget is not None and not self.budget.take():
+            raise self._reject(priority_name, "threads_exhausted")
+        try:
+            return self._acquire(priority_name, max_wait)
+        except AdmissionRejected:
+            if self.budget is not None:
+                self.budget.give_back()
+            raise
+
+    def _acquire(self, priority_name: str, max_wait: Optional[float]) -> float:
+        priority = PRIORITIES.get(priority_name, PRIORITIES["interactive"])
+        start = time.perf_counter()
+
+        with self._cond:
+            if self.active < self.max_concurrent and not self._queue:
+                self.active += 1
+                QUEUE_WAIT.observe(0.0, self.group, priority_name)
+                return start
+
+            if len(self._queue) >= self.max_queue:
+                # Displace the newest waiter of the lowest class, if it ranks below us
+                victim = max(self._queue, default=None)
+                if victim is None or victim[0] <= priority:
+                    raise self._reject(priority_name, "queue_full")
+                victim[2].rejected = True
+                self._remove(victim[2])
+                self._cond.notify_all()
+
+            waiter = _Waiter(priority)
+            heapq.heappush(self._queue, (priority, next(self._sequence), waiter))
+            deadline = start + (self.queue_timeout if max_wait is None else min(self.queue_timeout, max_wait))
+
+            while True:
+                if waiter.rejected:
+                    raise self._reject(priority_name, "displaced")
+                if self._queue[0][2] is waiter and self.active < self.max_concurrent:
+                    heapq.heappop(self._queue)
+                    self.active += 1
+                    # The next waiter may also fit (several slots freed at once)
+                    self._cond.notify_all()
+                    admitted = time.perf_counter()
+                    QUEUE_WAIT.observe(admitted - start, self.group, priority_name)
+                    return admitted
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._remove(waiter)
+                    self._cond.notify_all()
+                    raise self._reject(priority_name, "timeout")
+                self._cond.wait(remaining)
+
+    def release(self, admitted_at: float) -> None:
+        """Free a slot taken by acquire()."""
+        held = time.perf_counter() - admitted_at
+        with self._cond:
+            self.active -= 1
+            self._avg_hold = 0.8 * self._avg_hold + 0.2 * held
+            self._cond.notify_all()
+        if self.budget is not None:
+            self.budget.give_back()
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "queued": len(self._queue),
+                "avg_hold_seconds": round(self._avg_hold, 4)
+            }
+
+
+# Global controllers (one per admission group, created lazily) and their shared thread budget
+_controllers: Dict[str, AdmissionController] = {}
+_controllers_lock = threading.Lock()
+_thread_budget = ThreadBudget(MAX_HELD_THREADS)
+
+
+def get_controller(group: str) -> AdmissionController:
+    """Get (or create) the controller for an admission group."""
+    with _controllers_lock:
+        if group not in _controllers:
+            _controllers[group] = AdmissionController(group, *_env_limits(group), budget=_thread_budget)
+        return _controllers[group]
+
+
+def resolve_admission(endpoint: str, priority_header: Optional[str]) -> Optional[Tuple[AdmissionController, str]]:
+    """
+    Controller and priority class for a request, or None if the endpoint is unlimited.
+
+    Args:
+        endpoint: Route pattern (e.g. "/api/match-application")
+        priority_header: X-Request-Priority header value, if any
+    """
+    rule = ADMISSION_RULES.get(endpoint)
+    if rule is None or not admission_enabled():
+        return None
+    group, default_priority = rule
+    priority = (priority_header or "").strip().lower()
+    return get_controller(group), priority if priority in PRIORITIES else default_priority
+
+
+def get_admission_stats() -> Dict[str, Dict]:
+    """Statistics for every admission group used so far."""
+    with _controllers_lock:
+        controllers = dict(_controllers)
+    return {group: controller.stats() for group, controller in controllers.items()}
+
+
+def _collect_admission_metrics() -> None:
+    for group, stats in get_admission_stats().items():
+        ACTIVE.set(stats["active"], group)
+        QUEUED.set(stats["queued"], group)
+
+
+register_collector(_collect_admission_metrics)
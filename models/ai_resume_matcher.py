@@ -32,11 +32,24 @@ KEY PRINCIPLE:
 ================================================================================
 """
 
+from __future__ import annotations
+
+import importlib.util
 import json
-from typing import List, Dict, Tuple, Optional
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+# sentence-transformers pulls in torch (several seconds); it is imported by
+# load_model() on first use, but a missing install still fails at import time
+if importlib.util.find_spec("sentence_transformers") is None:
+    raise ImportError("sentence-transformers not installed. Run: pip install sentence-transformers")
+
+from service_metrics import stage
+
+MODEL_NAME = 'all-mpnet-base-v2'
 
 # Global model cache for backend integration (load once, reuse many times)
 _model_cache: Optional[SentenceTransformer] = None
@@ -57,13 +70,32 @@ def load_model(force_reload: bool = False) -> SentenceTransformer:
     
     if _model_cache is None or force_reload:
         try:
-            _model_cache = SentenceTransformer('all-mpnet-base-v2')
+            from sentence_transformers import SentenceTransformer
+            _model_cache = SentenceTransformer(MODEL_NAME)
+            _time_tokenization(_model_cache)
         except Exception as e:
             raise RuntimeError(f"Failed to load model: {str(e)}")
     
     return _model_cache
 
 
+def _time_tokenization(model: SentenceTransformer) -> None:
+    """
+    Report tokenizer time as its own stage.
+
+    encode() tokenizes each batch via model.preprocess (sentence-transformers >= 6)
+    or model.tokenize (older releases); the instance attribute is wrapped.
+    """
+    method_name = "preprocess" if hasattr(model, "preprocess") else "tokenize"
+    tokenize = getattr(model, method_name)
+
+    def timed_tokenize(*args, **kwargs):
+        with stage("tokenization"):
+            return tokenize(*args, **kwargs)
+
+    setattr(model, method_name, timed_tokenize)
+
+
 def get_model() -> Optional[SentenceTransformer]:
     """
     Get cached model instance if available.
@@ -75,6 +107,12 @@ def get_model() -> Optional[SentenceTransformer]:
     return _model_cache
 
 
+def unload_model() -> None:
+    """Drop the cached model (it is freed once no caller still holds it)."""
+    global _model_cache
+    _model_cache = None
+
+
 def clean_text(text: str) -> str:
     """Minimal text cleanup - whitespace normalization only."""
     if not text or not isinstance(text, str):
@@ -97,12 +135,13 @@ def generate_embeddings(model: SentenceTransformer, texts: List[str]) -> np.ndar
         return np.array([]).reshape(0, 768)
     
     cleaned_texts = [clean_text(text) for text in texts]
-    embeddings = model.encode(
-        cleaned_texts,
-        batch_size=32,
-        show_progress_bar=False,
-        normalize_embeddings=True
-    )
+    with stage("encoding"):
+        embeddings = model.encode(
+            cleaned_texts,
+            batch_size=32,
+            show_progress_bar=False,
+            normalize_embeddings=True
+        )
     return np.array(embeddings)
 
 
@@ -120,8 +159,11 @@ def compute_similarity(jd_embedding: np.ndarray, resume_embeddings: np.ndarray)
     if resume_embeddings.shape[0] == 0:
         return np.array([])
     
+    from sklearn.metrics.pairwise import cosine_similarity
+    
     jd_reshaped = jd_embedding.reshape(1, -1)
-    similarities = cosine_similarity(jd_reshaped, resume_embeddings)[0]
+    with stage("similarity"):
+        similarities = cosine_similarity(jd_reshaped, resume_embeddings)[0]
     return np.clip(similarities, 0.0, 1.0)
 
 
@@ -209,7 +251,8 @@ def evaluate_application(
         jd_text: Job description text
         resume_text: Single candidate resume text
         min_score_threshold: Minimum score required by recruiter (0.0 to 1.0)
-        model: Optional pre-loaded model instance (for backend efficiency)
+        model: Optional pre-loaded model instance (for backend efficiency),
+               or an encoder_server.RemoteEncoder sharing one model across workers
         
     Returns:
         Dictionary with application result:
@@ -245,8 +288,8 @@ def evaluate_application(
     # Use provided model or load/cache model
     if model is None:
         model = load_model()
-    elif not isinstance(model, SentenceTransformer):
-        raise ValueError("model must be a SentenceTransformer instance")
+    elif not hasattr(model, "encode"):
+        raise ValueError("model must be a SentenceTransformer instance (or RemoteEncoder)")
     
     try:
         # Generate embeddings
@@ -261,29 +304,159 @@ def evaluate_application(
             raise RuntimeError(f"Resume embedding shape mismatch: expected 768, got {resume_embedding.shape[0]}")
         
         # Compute similarity
+        from sklearn.metrics.pairwise import cosine_similarity
         jd_reshaped = jd_embedding.reshape(1, -1)
         resume_reshaped = resume_embedding.reshape(1, -1)
-        similarity_score = float(cosine_similarity(jd_reshaped, resume_reshaped)[0][0])
-        similarity_score = max(0.0, min(1.0, similarity_score))  # Clip to [0, 1]
+        with stage("similarity"):
+            similarity_score = float(cosine_similarity(jd_reshaped, resume_reshaped)[0][0])
+        
+        return _build_application_result(similarity_score, min_score_threshold)
+        
+    except Exception as e:
+        raise RuntimeError(f"Error during candidate application evaluation: {str(e)}")
+
+
+def encode_job_description(jd_text: str, model: SentenceTransformer) -> np.ndarray:
+    """
+    Encode one job description for reuse across many applications.
+    
+    Args:
+        jd_text: Job description text
+        model: Loaded model (or RemoteEncoder)
+        
+    Returns:
+        Normalized JD embedding of shape (768,)
+    """
+    if not jd_text or not isinstance(jd_text, str):
+        raise ValueError("jd_text must be a non-empty string")
+    return generate_embeddings(model, [jd_text])[0]
+
+
+def evaluate_application_with_jd_embedding(
+    jd_embedding: np.ndarray,
+    resume_text: str,
+    min_score_threshold: float,
+    model: SentenceTransformer
+) -> Dict:
+    """
+    evaluate_application() with the JD already encoded (see encode_job_description),
+    so only the resume is encoded per application.
+    
+    Returns:
+        Same dictionary as evaluate_application()
+    """
+    if not resume_text or not isinstance(resume_text, str):
+        raise ValueError("resume_text must be a non-empty string")
+    
+    if not isinstance(min_score_threshold, (int, float)) or min_score_threshold < 0.0 or min_score_threshold > 1.0:
+        raise ValueError("min_score_threshold must be a float between 0.0 and 1.0")
+    
+    resume_embeddings = generate_embeddings(model, [resume_text])
+    similarity_score = float(compute_similarity(jd_embedding, resume_embeddings)[0])
+    return _build_application_result(similarity_score, min_score_threshold)
+
+
+def evaluate_applications(
+    items: List[Dict],
+    model: Optional[SentenceTransformer] = None
+) -> List[Dict]:
+    """
+    BULK VARIANT of evaluate_application() for many applications at once.
+    
+    Same threshold-based decision per item, but every distinct text (JDs and
+    resumes) is encoded exactly once in a single batched pass, so repeated JDs
+    cost nothing extra.
+    
+    Args:
+        items: List of {"jd_text": str, "resume_text": str, "min_score_threshold": float (0-1)}
+        model: Optional pre-loaded model instance (for backend efficiency)
         
-        # Check if candidate meets threshold
-        is_shortlisted = similarity_score >= min_score_threshold
+    Returns:
+        List of results in input order. Each entry is the evaluate_application()
+        result dictionary, or {"error": str} when that item's input is invalid.
+    """
+    if not isinstance(items, list):
+        raise ValueError("items must be a list")
+    
+    if model is None:
+        model = load_model()
+    elif not hasattr(model, "encode"):
+        raise ValueError("model must be a SentenceTransformer instance (or RemoteEncoder)")
+    
+    # Validate items and collect distinct texts (dict preserves first-seen order)
+    text_index: Dict[str, int] = {}
+    valid_items = []
+    results: List[Optional[Dict]] = [None] * len(items)
+    
+    for position, item in enumerate(items):
+        item = item if isinstance(item, dict) else {}
+        jd_text = item.get("jd_text")
+        resume_text = item.get("resume_text")
+        threshold = item.get("min_score_threshold")
         
-        # Generate reason
-        if is_shortlisted:
-            reason = generate_reason(similarity_score)
+        if not jd_text or not isinstance(jd_text, str):
+            results[position] = {"error": "jd_text must be a non-empty string"}
+        elif not resume_text or not isinstance(resume_text, str):
+            results[position] = {"error": "resume_text must be a non-empty string"}
+        elif not isinstance(threshold, (int, float)) or threshold < 0.0 or threshold > 1.0:
+            results[position] = {"error": "min_score_threshold must be a float between 0.0 and 1.0"}
         else:
-            reason = f"Score {similarity_score:.4f} below required threshold {min_score_threshold:.4f}"
+            jd_idx = text_index.setdefault(jd_text, len(text_index))
+            resume_idx = text_index.setdefault(resume_text, len(text_index))
+            valid_items.append((position, jd_idx, resume_idx, threshold))
+    
+    if not valid_items:
+        return results
+    
+    try:
+        embeddings = generate_embeddings(model, list(text_index))
         
-        return {
-            "shortlisted": is_shortlisted,
-            "score": round(similarity_score, 4),
-            "reason": reason,
-            "threshold": round(min_score_threshold, 4)
-        }
+        if embeddings.shape[1] != 768:
+            raise RuntimeError(f"Embedding dimension mismatch: expected 768, got {embeddings.shape[1]}")
+        
+        # Embeddings are L2-normalized, so the row-wise dot product is the cosine similarity
+        jd_rows = embeddings[[jd_idx for _, jd_idx, _, _ in valid_items]]
+        resume_rows = embeddings[[resume_idx for _, _, resume_idx, _ in valid_items]]
+        with stage("similarity"):
+            similarities = np.einsum('ij,ij->i', jd_rows, resume_rows)
+        
+        for (position, _, _, threshold), similarity in zip(valid_items, similarities):
+            results[position] = _build_application_result(float(similarity), threshold)
+        
+        return results
         
     except Exception as e:
-        raise RuntimeError(f"Error during candidate application evaluation: {str(e)}")
+        raise RuntimeError(f"Error during bulk application evaluation: {str(e)}")
+
+
+def _build_application_result(similarity_score: float, min_score_threshold: float) -> Dict:
+    """
+    INTERNAL HELPER: Threshold decision and explanation for one application.
+    
+    Args:
+        similarity_score: Raw cosine similarity between JD and resume
+        min_score_threshold: Recruiter's minimum score (0.0 to 1.0)
+        
+    Returns:
+        {"shortlisted": bool, "score": float, "reason": str, "threshold": float}
+    """
+    similarity_score = max(0.0, min(1.0, similarity_score))  # Clip to [0, 1]
+    
+    # Check if candidate meets threshold
+    is_shortlisted = similarity_score >= min_score_threshold
+    
+    # Generate reason
+    if is_shortlisted:
+        reason = generate_reason(similarity_score)
+    else:
+        reason = f"Score {similarity_score:.4f} below required threshold {min_score_threshold:.4f}"
+    
+    return {
+        "shortlisted": is_shortlisted,
+        "score": round(similarity_score, 4),
+        "reason": reason,
+        "threshold": round(min_score_threshold, 4)
+    }
 
 
 def batch_match_for_recruiter(
@@ -359,8 +532,8 @@ def batch_match_for_recruiter(
     # Use provided model or load/cache model
     if model is None:
         model = load_model()
-    elif not isinstance(model, SentenceTransformer):
-        raise ValueError("model must be a SentenceTransformer instance")
+    elif not hasattr(model, "encode"):
+        raise ValueError("model must be a SentenceTransformer instance (or RemoteEncoder)")
     
     try:
         # Generate embeddings
@@ -5,17 +5,66 @@ Provides HTTP endpoints for AI models (Resume Matching, Assessment Generation, P
 
 import os
 import sys
+import io
 import json
-from flask import Flask, request, jsonify
+import logging
+import threading
+import time
+import tracemalloc
+from flask import Flask, Request, request, jsonify, g, Response, send_file
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 from typing import Optional
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from service_pools import run_blocking, get_pool_stats, offload_enabled
+from assessment_jobs import JobStoreFull, SECTIONS, get_job_store, submit_generation_job
+from admission_control import AdmissionRejected, resolve_admission, get_admission_stats
+from admin_access import admin_token, is_admin_request
+from request_deadline import (
+    DEADLINE_EXCEEDED_TOTAL, TIMEOUT_HEADER, DeadlineExceeded, check_deadline, expired, remaining, resolve_deadline
+)
+from idempotency import (
+    IDEMPOTENCY_HEADER, IDEMPOTENT_ENDPOINTS, REPLAYED_HEADER, IdempotencyConflict, StoredResponse, claim_key,
+    get_idempotency_store
+)
+from embedding_export import export_embeddings
+from ndjson_stream import ndjson_response, wants_ndjson
+from request_schemas import (
+    AnalyzeJDRequest, AssessmentRequest, AssignApplicantsRequest, ClusterApplicantsRequest, EmbeddingsRequest,
+    ExecuteCodeRequest, MatchApplicationRequest, MatchApplicationsRequest, RequestValidationError, ScoreAssessmentRequest,
+    ScoreAssessmentsRequest, decode_request, peek_timeout
+)
+from component_registry import get_component_registry
+from memory_report import (
+    deep_sizeof, get_allocation_peaks, get_heap_snapshots, model_parameter_bytes, read_rss,
+    rss_by_mapping, tracemalloc_requested
+)
+from request_profiler import (
+    PROFILE_HEADER, PROFILE_ID_HEADER, RequestProfile, list_profiles, profile_artifact, wants_profile
+)
+from request_tracing import REQUEST_ID_HEADER, TRACEPARENT_HEADER, get_tracer, resolve_request_id
+from response_cache import get_cache_memory, get_response_cache, make_cache_key
+from sampling_profiler import get_sampling_profiler
+from response_encoding import init_app as init_response_encoding
+from service_logging import configure_logging
+from service_metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, REQUESTS_TOTAL,
+    REQUEST_ERRORS_TOTAL, REQUEST_DURATION, REQUESTS_IN_FLIGHT, record_cache_lookup, render_metrics
+)
+from traffic_recorder import describe_request, get_traffic_recorder
+
+configure_logging()  # JSON lines via a queue and writer thread; never blocks a request
+logger = logging.getLogger("ai_service")
+
 # Import AI modules
 try:
-    from ai_resume_matcher import load_model, evaluate_application, get_model
+    from ai_resume_matcher import (
+        load_model, evaluate_application, evaluate_applications, generate_embeddings, get_model, unload_model,
+        MODEL_NAME
+    )
     RESUME_MATCHER_AVAILABLE = True
 except (ImportError, OSError, Exception) as e:
     print(f"Warning: ai_resume_matcher not available: {e}")
@@ -23,7 +72,11 @@ except (ImportError, OSError, Exception) as e:
     RESUME_MATCHER_AVAILABLE = False
     load_model = None
     evaluate_application = None
+    evaluate_applications = None
+    generate_embeddings = None
     get_model = None
+    unload_model = None
+    MODEL_NAME = None
 
 try:
     from assessment_generator import generate_assessment, configure_gemini
@@ -33,12 +86,19 @@ except ImportError as e:
     ASSESSMENT_GENERATOR_AVAILABLE = False
 
 try:
-    from pdf_to_text import extract_resume_text
+    from pdf_to_text import extract_resume_text_from_bytes
     PDF_PARSER_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: pdf_to_text not available: {e}")
     PDF_PARSER_AVAILABLE = False
 
+try:
+    from shortlist_pipeline import UnknownJobDescription, get_jd_cache, shortlist_pdf
+    SHORTLIST_PIPELINE_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: shortlist_pipeline not available: {e}")
+    SHORTLIST_PIPELINE_AVAILABLE = False
+
 try:
     from code_executor import evaluate_dsa_solution
     CODE_EXECUTOR_AVAILABLE = True
@@ -47,33 +107,682 @@ except ImportError as e:
     CODE_EXECUTOR_AVAILABLE = False
 
 try:
-    from jd_analyzer import analyze_job_description
+    from jd_analyzer import analyze_job_description, DICTIONARY_VERSION
     JD_ANALYZER_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: jd_analyzer not available: {e}")
     JD_ANALYZER_AVAILABLE = False
 
+try:
+    from applicant_clustering import cluster_applicants, assign_applicants
+    CLUSTERING_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: applicant_clustering not available: {e}")
+    CLUSTERING_AVAILABLE = False
+
+class InMemoryUploadRequest(Request):
+    """
+    Keeps uploaded files in memory (werkzeug spools uploads over 500 KB to temp files).
+    
+    Because of that, werkzeug enforces the endpoint's body limit (BODY_LIMITS)
+    while reading, so uploads without Content-Length (chunked) are capped too.
+    """
+
+    @property
+    def body_limit(self) -> Optional[int]:
+        """Largest accepted body for this endpoint (BODY_LIMITS, else MAX_CONTENT_LENGTH)."""
+        limit = BODY_LIMITS.get(self.url_rule.rule) if self.url_rule is not None else None
+        return limit if limit is not None else super().max_content_length
+
+    @property
+    def max_content_length(self) -> Optional[int]:
+        limit = self.body_limit
+        # Without Content-Length, read one byte past the limit so a body of exactly limit bytes is accepted
+        if limit is not None and self.content_length is None:
+            return limit + 1
+        return limit
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return io.BytesIO()
+
+
 app = Flask(__name__)
+app.request_class = InMemoryUploadRequest
 CORS(app)  # Enable CORS for backend
+init_response_encoding(app)  # orjson serialization + gzip/zstd for large bodies
+
+# Bulk endpoint limits (items per request, request body size)
+MAX_BULK_ITEMS = int(os.getenv('AI_SERVICE_MAX_BULK_ITEMS', 500))
+MAX_BULK_BYTES = int(os.getenv('AI_SERVICE_MAX_BULK_BYTES', 10 * 1024 * 1024))
+
+# PDF upload limit (uploads are held in memory)
+MAX_PDF_BYTES = int(os.getenv('AI_SERVICE_MAX_PDF_BYTES', 10 * 1024 * 1024))
+MAX_BULK_PDF_BYTES = int(os.getenv('AI_SERVICE_MAX_BULK_PDF_BYTES', 50 * 1024 * 1024))
+
+# Clustering pools carry embeddings inline (~20k applicants x 768 floats is over 300 MB of JSON)
+MAX_CLUSTER_BYTES = int(os.getenv('AI_SERVICE_MAX_CLUSTER_BYTES', 512 * 1024 * 1024))
+
+# Largest request body per endpoint (others: the largest of these)
+BODY_LIMITS = {
+    '/api/match-applications': MAX_BULK_BYTES,
+    '/api/embeddings': MAX_BULK_BYTES,
+    '/api/score-assessments': MAX_BULK_BYTES,
+    '/api/parse-pdf': MAX_PDF_BYTES,
+    '/api/shortlist-pdf': MAX_PDF_BYTES,
+    '/api/parse-pdfs': MAX_BULK_PDF_BYTES,
+    '/api/cluster-applicants': MAX_CLUSTER_BYTES,
+    '/api/assign-applicants': MAX_CLUSTER_BYTES
+}
+app.config['MAX_CONTENT_LENGTH'] = max(BODY_LIMITS.values())
+
+# Applications encoded per batch when /api/match-applications streams NDJSON
+STREAM_CHUNK_SIZE = int(os.getenv('AI_SERVICE_STREAM_CHUNK_SIZE', 32))
 
-# Global model cache
+# Global model cache (loaded and unloaded through the component registry)
 _model_cache = None
+MODEL_COMPONENT = "resume_matcher"
+
+def _normalize_threshold(min_score_threshold) -> float:
+    """
+    Convert threshold from 0-100 to 0-1 if needed.
+    Backend sends threshold in 0-100 scale, but we also handle if it's already 0-1.
+    """
+    if min_score_threshold > 1.0:
+        min_score_threshold = min_score_threshold / 100.0
+    # Ensure threshold is in valid range [0, 1]
+    return max(0.0, min(1.0, min_score_threshold))
+
 
 def get_or_load_model():
-    """Get cached model or load it"""
+    """
+    Get cached model or load it.
+
+    When AI_ENCODER_SOCKET is set, returns a RemoteEncoder talking to the shared
+    encoder server (encoder_server.py) instead of loading a model copy in this worker.
+    The model may be unloaded by the memory governor (component_registry.py)
+    and is then loaded again here.
+    """
+    model = _model_cache
+    record_cache_lookup("model", model is not None)
+    if model is not None:
+        get_component_registry().touch(MODEL_COMPONENT)
+        return model
+    
+    # One loader at a time: requests arriving during warm-up wait for the registry's load
+    try:
+        return get_component_registry().get(MODEL_COMPONENT)
+    except Exception:
+        logger.exception("Error loading model; resume matching will be disabled")
+        return None
+
+
+def _load_resume_matcher():
+    """Component loader for the resume matcher model (or the shared encoder client)."""
     global _model_cache
-    if _model_cache is None and RESUME_MATCHER_AVAILABLE and load_model is not None:
-        try:
-            print("Loading AI model...")
-            _model_cache = load_model()
-            print("✅ Model loaded successfully!")
-        except Exception as e:
-            print(f"Error loading model: {e}")
-            print("Resume matching will be disabled.")
-            return None
+    encoder_socket = os.getenv('AI_ENCODER_SOCKET')
+    if encoder_socket:
+        from encoder_server import RemoteEncoder
+        logger.info("Using shared encoder server", extra={"socket": encoder_socket})
+        _model_cache = RemoteEncoder(encoder_socket)
+    elif RESUME_MATCHER_AVAILABLE and load_model is not None:
+        logger.info("Loading AI model")
+        _model_cache = load_model()
+        logger.info("Model loaded")
     return _model_cache
 
 
+def _unload_resume_matcher(model) -> None:
+    global _model_cache
+    _model_cache = None
+    if unload_model is not None:
+        unload_model()
+
+
+get_component_registry().register(
+    MODEL_COMPONENT, _load_resume_matcher, _unload_resume_matcher, size=model_parameter_bytes
+)
+
+
+def _warm_up():
+    """Import heavy dependencies and load the model (runs on the warm-up thread)."""
+    start = time.perf_counter()
+    if RESUME_MATCHER_AVAILABLE:
+        get_or_load_model()
+    if ASSESSMENT_GENERATOR_AVAILABLE:
+        import google.generativeai  # noqa: F401  (first generation request skips the import)
+    logger.info("Warm-up finished", extra={"seconds": round(time.perf_counter() - start, 1)})
+
+
+def start_warmup() -> threading.Thread:
+    """
+    Load heavy dependencies in a background thread so /health answers immediately.
+
+    Requests that need the model before warm-up finishes wait for the component
+    registry's in-progress load of it (component_registry.py).
+    Do not call before a fork (pre-fork mode preloads synchronously instead).
+    """
+    thread = threading.Thread(target=_warm_up, name="ai-service-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+# ============================================================================
+# REQUEST METRICS
+# ============================================================================
+
+def _metrics_endpoint() -> str:
+    """Route pattern for metric labels (unmatched paths share one label)."""
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+@app.before_request
+def _start_request_metrics():
+    g.metrics_start = time.perf_counter()
+    g.metrics_endpoint = _metrics_endpoint()
+    REQUESTS_IN_FLIGHT.inc(g.metrics_endpoint)
+
+
+@app.after_request
+def _record_response_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+
+@app.after_request
+def _capture_traffic(response):
+    """Sanitized request description for the traffic log (AI_SERVICE_RECORD_DIR)."""
+    recorder = get_traffic_recorder()
+    if recorder is not None and recorder.should_record():
+        g.traffic_record = {"ts": g.get('request_start'), **describe_request(request)}
+    return response
+
+
+@app.teardown_request
+def _finish_request_metrics(exc):
+    # Runs even when a handler raised (after_request is skipped then).
+    # Streamed responses are finished when their body is done (see _stream_batch)
+    if not g.get('streaming'):
+        _record_request_end(g, request.method)
+
+
+def _record_request_end(state, method: str) -> None:
+    start = state.pop('metrics_start', None)
+    if start is None:
+        return
+    endpoint = state.pop('metrics_endpoint')
+    status = state.pop('metrics_status', 500)
+    duration = time.perf_counter() - start
+    REQUESTS_IN_FLIGHT.dec(endpoint)
+    REQUESTS_TOTAL.inc(endpoint, method, str(status))
+    REQUEST_DURATION.observe(duration, endpoint)
+    if status >= 500:
+        REQUEST_ERRORS_TOTAL.inc(endpoint)
+    record = state.pop('traffic_record', None)
+    if record is not None:
+        # Streamed responses are written once their body is done, with the full duration
+        get_traffic_recorder().write(record, status, duration)
+
+
+# ============================================================================
+# REQUEST TRACING
+# ============================================================================
+
+@app.before_request
+def _start_request_trace():
+    """
+    g.request_id from the caller's X-Request-Id (or a new one); with
+    AI_SERVICE_TRACE_EXPORT set, the request's span (g.trace_span) that every
+    stage below it is traced under.
+    """
+    g.request_id = resolve_request_id(request.headers.get(REQUEST_ID_HEADER))
+    tracer = get_tracer()
+    if tracer is not None:
+        g.trace_span = tracer.start_request(
+            g.metrics_endpoint, g.request_id, request.headers.get(TRACEPARENT_HEADER),
+            {"http.request.method": request.method, "http.route": g.metrics_endpoint, "url.path": request.path}
+        )
+
+
+@app.after_request
+def _add_request_id(response):
+    response.headers[REQUEST_ID_HEADER] = g.request_id
+    return response
+
+
+@app.teardown_request
+def _finish_request_trace(exc):
+    if not g.get('streaming'):
+        _end_trace(g, exc)
+
+
+def _end_trace(state, exc: Optional[BaseException] = None) -> None:
+    span = state.pop('trace_span', None)
+    if span is not None:
+        get_tracer().end_request(span, state.get('metrics_status'), exc)
+
+
+# ============================================================================
+# REQUEST BODY LIMITS
+# ============================================================================
+
+@app.before_request
+def _read_body_within_limit():
+    """
+    Read the body (and form/files) up front, under the endpoint's limit, so an
+    oversized upload is a 413 here instead of failing inside the handler.
+    """
+    if request.method not in ('POST', 'PUT', 'PATCH'):
+        return
+    data = request.get_data(parse_form_data=True)
+    # Without Content-Length werkzeug stops reading (at limit + 1) instead of raising
+    limit = request.body_limit
+    if request.content_length is None and limit is not None and len(data) > limit:
+        raise RequestEntityTooLarge()
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def _body_too_large(e):
+    return jsonify({"error": f"Request body exceeds {request.body_limit} bytes"}), 413
+
+
+# ============================================================================
+# REQUEST DEADLINES
+# ============================================================================
+
+def _body_timeout():
+    """timeout_seconds from a JSON body (only that field is decoded; endpoints decode the rest)."""
+    return peek_timeout(request.get_data()) if request.is_json else None
+
+
+@app.before_request
+def _set_request_deadline():
+    """g.deadline: absolute time.time() by which this request's work must stop (or None)."""
+    g.request_start = time.time()
+    try:
+        g.deadline = resolve_deadline(request.headers.get(TIMEOUT_HEADER), _body_timeout(), g.request_start)
+    except ValueError as e:
+        g.deadline = None
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
+    return None
+
+
+def _deadline_exceeded_response(partial: Optional[dict] = None):
+    """504 for work abandoned at the deadline, with the partial result if there is one."""
+    DEADLINE_EXCEEDED_TOTAL.inc(g.metrics_endpoint)
+    body = {"error": "Deadline exceeded", "deadline_exceeded": True}
+    if partial is not None:
+        body["partial"] = partial
+    return jsonify(body), 504
+
+
+def _stream_batch(records, summary: dict):
+    """
+    NDJSON response whose work runs while the body is being sent.
+    
+    Flask runs teardown hooks when the view returns and again when a streamed
+    body finishes. g.streaming defers request metrics and the admission slot
+    to the second run, so both cover the streamed work.
+    """
+    g.streaming = True
+    state = g._get_current_object()
+    method = request.method
+    
+    def tracked():
+        try:
+            yield from records
+        except DeadlineExceeded:
+            DEADLINE_EXCEEDED_TOTAL.inc(state.metrics_endpoint)
+            raise
+        finally:
+            state.streaming = False
+    
+    def finish_unstarted():
+        # The client went away before the body started: nothing ran the second teardown
+        if state.get('streaming'):
+            state.streaming = False
+            _finish_profile(state)
+            _end_trace(state)
+            _record_request_end(state, method)
+            _release_slot(state)
+    
+    response = ndjson_response(tracked(), summary)
+    response.call_on_close(finish_unstarted)
+    return response
+
+
+def _batch_response(records, summary: dict):
+    """
+    Batch endpoint response: NDJSON stream if the client asked for one,
+    otherwise one JSON document {**summary, results: [...]}.
+    
+    records is a generator of per-item dicts that updates summary as it goes
+    and raises DeadlineExceeded to stop early (504 with the results so far).
+    """
+    if wants_ndjson(request):
+        return _stream_batch(records, summary)
+    
+    results = []
+    try:
+        for record in records:
+            results.append(record)
+    except DeadlineExceeded:
+        summary["deadline_exceeded"] = True
+        return _deadline_exceeded_response({**summary, "results": results})
+    return jsonify({**summary, "results": results}), 200
+
+
+# ============================================================================
+# IDEMPOTENCY KEYS
+# ============================================================================
+
+@app.before_request
+def _check_idempotency_key():
+    """
+    Retries with a known Idempotency-Key attach to the running request or
+    replay its response. Runs before admission so waiting retries hold no slot.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None or request.method != 'POST' or g.metrics_endpoint not in IDEMPOTENT_ENDPOINTS:
+        return None
+    try:
+        entry, stored = claim_key(g.metrics_endpoint, key, request.get_data(), g.deadline)
+    except IdempotencyConflict as e:
+        return jsonify({"error": str(e)}), 422
+    except DeadlineExceeded:
+        return _deadline_exceeded_response()
+    except ValueError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
+    if entry is not None:
+        g.idempotency = entry
+        return None
+    return Response(
+        stored.body, status=stored.status, content_type=stored.content_type, headers={REPLAYED_HEADER: "true"}
+    )
+
+
+@app.after_request
+def _capture_idempotent_response(response):
+    # Registered after response_encoding, so this runs first and records the uncompressed body
+    if g.get('idempotency') is not None and not response.is_streamed:
+        g.idempotency_response = StoredResponse(response.status_code, response.get_data(), response.content_type)
+    return response
+
+
+@app.teardown_request
+def _finish_idempotency_key(exc):
+    entry = g.pop('idempotency', None)
+    if entry is not None:
+        get_idempotency_store().finish(entry, g.pop('idempotency_response', None))
+
+
+# ============================================================================
+# ADMISSION CONTROL
+# ============================================================================
+
+@app.before_request
+def _admit_request():
+    """Wait for a slot on limited endpoints; fast 503 when overloaded."""
+    admission = resolve_admission(g.metrics_endpoint, request.headers.get('X-Request-Priority'))
+    if admission is None:
+        return None
+    controller, priority = admission
+    if expired(g.deadline):
+        # Out of time before admission: a timeout, not overload
+        return _deadline_exceeded_response()
+    try:
+        # Don't queue past the request's deadline
+        g.admission = (controller, controller.acquire(priority, max_wait=remaining(g.deadline)))
+    except AdmissionRejected as e:
+        return jsonify({
+            "error": "Service overloaded, retry later",
+            "reason": e.reason,
+            "retry_after": e.retry_after
+        }), 503, {"Retry-After": str(e.retry_after)}
+    return None
+
+
+@app.teardown_request
+def _release_admission(exc):
+    if not g.get('streaming'):
+        _release_slot(g)
+
+
+def _release_slot(state) -> None:
+    admission = state.pop('admission', None)
+    if admission is not None:
+        controller, admitted_at = admission
+        controller.release(admitted_at)
+
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+
+@app.before_request
+def _start_request_profile():
+    """
+    Continuous sampling (AI_SERVICE_SAMPLER) attributes this thread's stacks to
+    the endpoint; X-Profile: 1 (with the admin token) runs it under cProfile.
+    While tracemalloc is on, the request's peak allocation is recorded too.
+    """
+    g.alloc_start = get_allocation_peaks().begin()
+    sampler = get_sampling_profiler()
+    if sampler is not None:
+        g.sampled_thread = (sampler, sampler.bind(g.metrics_endpoint))
+    if not wants_profile(request.headers.get(PROFILE_HEADER)) or not is_admin_request(request):
+        return None
+    g.profile = RequestProfile(g.metrics_endpoint)
+    g.profile.start()
+    return None
+
+
+@app.after_request
+def _add_profile_id(response):
+    if g.get('profile') is not None:
+        response.headers[PROFILE_ID_HEADER] = g.profile.profile_id
+    return response
+
+
+@app.teardown_request
+def _stop_request_profile(exc):
+    if not g.get('streaming'):
+        _finish_profile(g)
+
+
+def _finish_profile(state) -> None:
+    get_allocation_peaks().end(state.get('metrics_endpoint', 'unknown'), state.pop('alloc_start', None))
+    sampled_thread = state.pop('sampled_thread', None)
+    if sampled_thread is not None:
+        sampler, thread_id = sampled_thread
+        sampler.unbind(thread_id)
+    profile = state.pop('profile', None)
+    if profile is not None:
+        path = profile.stop(state.get('metrics_status'))
+        logger.info("Request profile written", extra={"profile_endpoint": profile.endpoint, "path": path})
+
+
+def _require_admin():
+    """Error response unless the request carries the admin token (None when allowed)."""
+    if admin_token() is None:
+        return jsonify({"error": "Admin endpoints are disabled (set AI_SERVICE_ADMIN_TOKEN)"}), 404
+    if not is_admin_request(request):
+        return jsonify({"error": "Admin token required"}), 403
+    return None
+
+
+@app.route('/api/admin/flamegraph', methods=['GET', 'DELETE'])
+def admin_flamegraph():
+    """
+    ADMIN: Collapsed stacks from the sampling profiler (flamegraph.pl / speedscope input).
+    Query: endpoint=<route> for one endpoint (default: all, endpoint as root frame)
+    DELETE clears the samples and starts a new window.
+    """
+    denied = _require_admin()
+    if denied is not None:
+        return denied
+    sampler = get_sampling_profiler()
+    if sampler is None:
+        return jsonify({"error": "Sampling profiler is disabled (set AI_SERVICE_SAMPLER=1)"}), 404
+    if request.method == 'DELETE':
+        sampler.reset()
+        return jsonify({"reset": True}), 200
+    return Response(sampler.collapsed(request.args.get('endpoint')), mimetype="text/plain")
+
+
+@app.route('/api/admin/sampler', methods=['GET'])
+def admin_sampler_stats():
+    """ADMIN: Sampling profiler state (samples per endpoint, stack memory, own CPU overhead)."""
+    denied = _require_admin()
+    if denied is not None:
+        return denied
+    sampler = get_sampling_profiler()
+    if sampler is None:
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **sampler.stats()}), 200
+
+
+@app.route('/api/admin/profiles', methods=['GET'])
+def admin_list_profiles():
+    """ADMIN: Recent request profiles. Returns: {profiles: [{profile_id, created_at, summary}]}"""
+    denied = _require_admin()
+    if denied is not None:
+        return denied
+    return jsonify({"profiles": list_profiles()}), 200
+
+
+@app.route('/api/admin/profiles/<profile_id>', methods=['GET'])
+def admin_get_profile(profile_id):
+    """
+    ADMIN: Download a request profile.
+    Returns: pstats file, or the top-functions report with ?format=text
+    """
+    denied = _require_admin()
+    if denied is not None:
+        return denied
+    fmt = request.args.get('format', 'pstats')
+    path = profile_artifact(profile_id, fmt)
+    if path is None:
+        return jsonify({"error": "Profile not found"}), 404
+    if fmt == 'text':
+        return send_file(path, mimetype="text/plain")
+    return send_file(path, mimetype="application/octet-stream", as_attachment=True,
+                     download_name=f"{profile_id}.prof")
+
+
+# ============================================================================
+# MEMORY REPORT
+# ============================================================================
+
+if tracemalloc_requested():
+    get_heap_snapshots().start()
+
+
+def _kb(nbytes) -> Optional[float]:
+    return None if nbytes is None else round(nbytes / 1024, 1)
+
+
+def _cache_sizes() -> dict:
+    """Approximate size of every in-process cache and large in-memory structure."""
+    sizes = {
+        "components": get_component_registry().stats(),
+        "response_caches_kb": {name: _kb(size) for name, size in get_cache_memory().items()},
+        "idempotency_responses_kb": _kb(get_idempotency_store().memory_bytes())
+    }
+    if SHORTLIST_PIPELINE_AVAILABLE:
+        jd_cache = get_jd_cache()
+        sizes["jd_embedding_cache"] = {"entries": len(jd_cache), "kb": _kb(jd_cache.memory_bytes())}
+    sampler = get_sampling_profiler()
+    if sampler is not None:
+        sizes["sampler_stacks_kb"] = _kb(sampler.stats()["stack_bytes"])
+    # Static indexes, reported only once something has imported them
+    question_bank = sys.modules.get("question_bank")
+    if question_bank is not None:
+        sizes["question_bank_kb"] = _kb(deep_sizeof(
+            [question_bank.MCQ_QUESTIONS, question_bank.SUBJECTIVE_QUESTIONS, question_bank.DSA_QUESTIONS]
+        ))
+    jd_analyzer = sys.modules.get("jd_analyzer")
+    if jd_analyzer is not None:
+        sizes["skill_index"] = {
+            "patterns": len(jd_analyzer.SKILL_PATTERNS),
+            "kb": _kb(deep_sizeof(jd_analyzer.SKILL_PATTERNS))
+        }
+    return sizes
+
+
+@app.route('/api/admin/memory', methods=['GET'])
+def admin_memory_report():
+    """
+    ADMIN: Memory report for this worker process.
+    Returns: {pid, rss: {rss_kb, peak_rss_kb, anon_kb, file_kb, shmem_kb},
+              rss_by_mapping: [{mapping, rss_kb}], caches: {...},
+              tracing: bool, endpoint_peaks: {endpoint: {requests, max_peak_kb, last_peak_kb}}}
+    """
+    denied = _require_admin()
+    if denied is not None:
+        return denied
+    return jsonify({
+        "pid": os.getpid(),
+        "rss": read_rss(),
+        "rss_by_mapping": rss_by_mapping(),
+        "caches": _cache_sizes(),
+        "tracing": tracemalloc.is_tracing(),
+        "endpoint_peaks": get_allocation_peaks().stats()
+    }), 200
+
+
+@app.route('/api/admin/memory/snapshot', methods=['POST', 'DELETE'])
+def admin_memory_snapshot():
+    """
+    ADMIN: Take a tracemalloc snapshot (starts tracing on first use).
+    Returns: {traced_kb, traced_peak_kb, top: [...], growth: [...] since the previous snapshot}
+    DELETE stops tracing and forgets the previous snapshot and the endpoint peaks.
+    """
+    denied = _require_admin()
+    if denied is not None:
+        return denied
+    snapshots = get_heap_snapshots()
+    if request.method == 'DELETE':
+        snapshots.stop()
+        get_allocation_peaks().reset()
+        return jsonify({"tracing": False}), 200
+    return jsonify(snapshots.take()), 200
+
+
+@app.route('/api/admin/components', methods=['GET'])
+def admin_components():
+    """
+    ADMIN: Heavy components and the memory governor's settings.
+    Returns: {budget_mb, idle_seconds, components: {name: {loaded, size_kb, idle_seconds, loads, unloads, ...}}}
+    """
+    denied = _require_admin()
+    if denied is not None:
+        return denied
+    registry = get_component_registry()
+    return jsonify({
+        "budget_mb": round(registry.budget_bytes / (1024 * 1024), 1) if registry.budget_bytes else None,
+        "idle_seconds": registry.idle_seconds or None,
+        "components": registry.stats()
+    }), 200
+
+
+@app.route('/api/admin/components/<name>', methods=['DELETE'])
+def admin_unload_component(name):
+    """ADMIN: Unload a component now (it is loaded again on next use). Returns: {unloaded: bool}"""
+    denied = _require_admin()
+    if denied is not None:
+        return denied
+    registry = get_component_registry()
+    if name not in registry:
+        return jsonify({"error": f"Unknown component: {name}"}), 404
+    return jsonify({"unloaded": registry.unload(name)}), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics (text exposition format)."""
+    return Response(render_metrics(), mimetype=None, content_type=METRICS_CONTENT_TYPE)
+
+
 @app.route('/', methods=['GET'])
 def root():
     """Root endpoint - API information"""
@@ -83,12 +792,22 @@ def root():
         "status": "running",
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "match_application": "/api/match-application",
+            "match_applications": "/api/match-applications",
+            "embeddings": "/api/embeddings",
             "generate_assessment": "/api/generate-assessment",
+            "assessment_jobs": "/api/assessment-jobs",
             "score_assessment": "/api/score-assessment",
+            "score_assessments": "/api/score-assessments",
             "parse_pdf": "/api/parse-pdf",
+            "parse_pdfs": "/api/parse-pdfs",
+            "shortlist_pdf": "/api/shortlist-pdf",
             "execute_code": "/api/execute-code",
-            "analyze_jd": "/api/analyze-jd"
+            "analyze_jd": "/api/analyze-jd",
+            "pool_stats": "/api/pool-stats",
+            "cluster_applicants": "/api/cluster-applicants",
+            "assign_applicants": "/api/assign-applicants"
         },
         "documentation": "See README.md for API usage"
     }), 200
@@ -99,15 +818,32 @@ def health():
     """Health check endpoint"""
     return jsonify({
         "status": "healthy",
+        "model_loaded": _model_cache is not None,
         "services": {
             "resume_matcher": RESUME_MATCHER_AVAILABLE,
             "assessment_generator": ASSESSMENT_GENERATOR_AVAILABLE,
             "pdf_parser": PDF_PARSER_AVAILABLE,
-            "jd_analyzer": JD_ANALYZER_AVAILABLE
+            "jd_analyzer": JD_ANALYZER_AVAILABLE,
+            "applicant_clustering": CLUSTERING_AVAILABLE
         }
     }), 200
 
 
+@app.route('/api/pool-stats', methods=['GET'])
+def pool_stats():
+    """
+    Worker pool queue-depth metrics (ASGI mode) and admission control state.
+    Returns: {offload_enabled: bool, pools: {io|encode|cpu: {in_flight, queue_depth, ...}},
+              admission: {group: {active, queued, ...}}, idempotency: {in_flight, stored, max_entries}}
+    """
+    return jsonify({
+        "offload_enabled": offload_enabled(),
+        "pools": get_pool_stats(),
+        "admission": get_admission_stats(),
+        "idempotency": get_idempotency_store().stats()
+    }), 200
+
+
 @app.route('/api/match-application', methods=['POST'])
 def match_application():
     """
@@ -118,23 +854,22 @@ def match_application():
         return jsonify({"error": "Resume matcher not available"}), 503
     
     try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "Request body is required"}), 400
-        
-        jd_text = data.get('jd_text')
-        resume_text = data.get('resume_text')
-        min_score_threshold = data.get('min_score_threshold', 0.50)
-        
-        if not jd_text or not resume_text:
-            return jsonify({"error": "jd_text and resume_text are required"}), 400
+        body = decode_request(MatchApplicationRequest, request.get_data())
+        jd_text = body.jd_text
+        resume_text = body.resume_text
         
         # Convert threshold from 0-100 to 0-1 if needed
-        # Backend sends threshold in 0-100 scale, but we also handle if it's already 0-1
-        if min_score_threshold > 1.0:
-            min_score_threshold = min_score_threshold / 100.0
-        # Ensure threshold is in valid range [0, 1]
-        min_score_threshold = max(0.0, min(1.0, min_score_threshold))
+        min_score_threshold = _normalize_threshold(body.min_score_threshold)
+        
+        # Identical payloads (retries, re-evaluation) are served without touching the model
+        cache = get_response_cache("match_application")
+        cache_key = make_cache_key(
+            {"jd_text": jd_text, "resume_text": resume_text, "min_score_threshold": min_score_threshold},
+            MODEL_NAME
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return jsonify(cached), 200, {"X-Cache": "HIT"}
         
         # Get or load model
         model = get_or_load_model()
@@ -142,7 +877,9 @@ def match_application():
             return jsonify({"error": "Failed to load AI model"}), 500
         
         # Evaluate application
-        result = evaluate_application(
+        result = run_blocking(
+            "encode",
+            evaluate_application,
             jd_text=jd_text,
             resume_text=resume_text,
             min_score_threshold=min_score_threshold,
@@ -153,201 +890,343 @@ def match_application():
         result['score'] = int(result['score'] * 100)
         result['threshold'] = int(result['threshold'] * 100)
         
-        return jsonify(result), 200
+        cache.put(cache_key, result)
+        return jsonify(result), 200, {"X-Cache": "MISS"}
         
     except ValueError as e:
         return jsonify({"error": f"Invalid input: {str(e)}"}), 400
     except Exception as e:
-        print(f"Error in match_application: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in match_application")
         return jsonify({"error": f"Internal error: {str(e)}"}), 500
 
 
-@app.route('/api/score-assessment', methods=['POST'])
-def score_assessment_endpoint():
-    """Score an assessment submission"""
-    print(f"\n{'='*80}")
-    print(f"RECEIVED ASSESSMENT SCORING REQUEST")
-    print(f"{'='*80}")
+@app.route('/api/match-applications', methods=['POST'])
+def match_applications():
+    """
+    BULK: Evaluate many applications in one request (one batched encoding pass).
+    Accepts either:
+        {items: [{jd_text, resume_text, min_score_threshold?}, ...]}
+        {jd_text, resume_texts: [str, ...], min_score_threshold?}
+    Returns: {total, shortlisted, results: [...]} with results in input order;
+             invalid items get {"error": str} instead of failing the whole batch
+    Streaming (Accept: application/x-ndjson or ?stream=1): one
+             {"type": "result", "index", ...} line per application, encoded
+             in chunks of AI_SERVICE_STREAM_CHUNK_SIZE, then a summary line
+             {"type": "summary", total, shortlisted, errors}
+    """
+    if not RESUME_MATCHER_AVAILABLE:
+        return jsonify({"error": "Resume matcher not available"}), 503
+    
+    if request.content_length and request.content_length > MAX_BULK_BYTES:
+        return jsonify({"error": f"Request body exceeds {MAX_BULK_BYTES} bytes"}), 413
     
     try:
-        from assessment_scorer import score_assessment
+        body = decode_request(MatchApplicationsRequest, request.get_data())
+        default_threshold = body.min_score_threshold
+        
+        if body.items is not None:
+            items = body.items
+        else:
+            if not body.jd_text or body.resume_texts is None:
+                return jsonify({"error": "items, or jd_text and resume_texts, are required"}), 400
+            items = [
+                {"jd_text": body.jd_text, "resume_text": resume_text}
+                for resume_text in body.resume_texts
+            ]
+        
+        if not items:
+            return jsonify({"error": "At least one application is required"}), 400
+        
+        if len(items) > MAX_BULK_ITEMS:
+            return jsonify({"error": f"Too many applications: {len(items)} (max {MAX_BULK_ITEMS})"}), 413
+        
+        normalized_items = []
+        for item in items:
+            item = dict(item) if isinstance(item, dict) else {}
+            threshold = item.get('min_score_threshold', default_threshold)
+            if isinstance(threshold, (int, float)):
+                item['min_score_threshold'] = _normalize_threshold(threshold)
+            normalized_items.append(item)
+        
+        model = get_or_load_model()
+        if model is None:
+            return jsonify({"error": "Failed to load AI model"}), 500
         
-        data = request.json
-        if not data:
-            return jsonify({"error": "Request body is required"}), 400
+        if wants_ndjson(request):
+            summary = {"total": len(normalized_items), "shortlisted": 0, "errors": 0}
+            return _stream_batch(_stream_match_results(normalized_items, model, summary, g.deadline), summary)
         
-        questions = data.get('questions', [])
-        answers = data.get('answers', {})
+        results = run_blocking("encode", evaluate_applications, normalized_items, model=model)
         
-        if not questions:
-            return jsonify({"error": "Questions are required"}), 400
+        for result in results:
+            _scores_to_percent(result)
         
-        print(f"Scoring {len(questions)} questions with {len(answers)} answers")
+        return jsonify({
+            "total": len(results),
+            "shortlisted": sum(1 for r in results if r.get('shortlisted')),
+            "results": results
+        }), 200
         
-        result = score_assessment(questions, answers)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
+    except Exception as e:
+        logger.exception("Error in match_applications")
+        return jsonify({"error": f"Internal error: {str(e)}"}), 500
+
+
+def _scores_to_percent(result: dict) -> None:
+    """Convert a match result's scores back to the backend's 0-100 scale."""
+    if "error" not in result:
+        result['score'] = int(result['score'] * 100)
+        result['threshold'] = int(result['threshold'] * 100)
+
+
+def _stream_match_results(items: list, model, summary: dict, deadline: Optional[float]):
+    """Evaluate applications chunk by chunk, yielding each result as soon as its chunk is done."""
+    for start in range(0, len(items), STREAM_CHUNK_SIZE):
+        check_deadline(deadline, "bulk matching")
+        chunk = items[start:start + STREAM_CHUNK_SIZE]
+        for offset, result in enumerate(run_blocking("encode", evaluate_applications, chunk, model=model)):
+            _scores_to_percent(result)
+            if "error" in result:
+                summary["errors"] += 1
+            elif result.get('shortlisted'):
+                summary["shortlisted"] += 1
+            yield {"index": start + offset, **result}
+
+
+@app.route('/api/embeddings', methods=['POST'])
+def embeddings_endpoint():
+    """
+    Encode texts (resumes, JDs) for storage and local scoring by the backend.
+    Accepts: {texts: [str] | text: str, format?: "raw"|"msgpack"|"json", dtype?: "float32"|"float16"}
+    Returns: raw (default): header + little-endian values, see embedding_export.py
+             msgpack: {model, dim, count, dtype, data: bin}
+             json: {model, dim, count, dtype, embeddings: [[float]]}
+             Rows follow the input order; vectors are L2-normalized, so the
+             dot product of a resume and a JD vector is the match score (0-1).
+             X-Embedding-Model / -Dim / -Count / -Dtype headers repeat the header.
+    """
+    if not RESUME_MATCHER_AVAILABLE:
+        return jsonify({"error": "Resume matcher not available"}), 503
+    
+    if request.content_length and request.content_length > MAX_BULK_BYTES:
+        return jsonify({"error": f"Request body exceeds {MAX_BULK_BYTES} bytes"}), 413
+    
+    try:
+        body = decode_request(EmbeddingsRequest, request.get_data())
+        texts = body.texts if body.texts is not None else ([body.text] if body.text else [])
+        
+        if not texts:
+            return jsonify({"error": "texts (or text) is required"}), 400
         
-        print(f"Scoring complete. Overall score: {result['overall_score']}%")
-        print(f"  MCQ: {result['mcq']['score']*100:.1f}% ({result['mcq']['correct']}/{result['mcq']['total']})")
-        print(f"  SQL: {result['sql']['score']*100:.1f}% ({result['sql']['correct']}/{result['sql']['total']})")
-        print(f"  DSA: {result['dsa']['score']*100:.1f}% ({result['dsa']['correct']}/{result['dsa']['total']})")
+        if len(texts) > MAX_BULK_ITEMS:
+            return jsonify({"error": f"Too many texts: {len(texts)} (max {MAX_BULK_ITEMS})"}), 413
+        
+        model = get_or_load_model()
+        if model is None:
+            return jsonify({"error": "Failed to load AI model"}), 500
+        
+        embeddings = run_blocking("encode", generate_embeddings, model, texts)
+        data, content_type = export_embeddings(embeddings, MODEL_NAME, body.format, body.dtype)
+        
+        count, dim = embeddings.shape
+        return Response(data, content_type=content_type, headers={
+            "X-Embedding-Model": MODEL_NAME,
+            "X-Embedding-Dim": str(dim),
+            "X-Embedding-Count": str(count),
+            "X-Embedding-Dtype": body.dtype
+        })
+        
+    except ValueError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
+    except Exception as e:
+        logger.exception("Error in embeddings")
+        return jsonify({"error": f"Internal error: {str(e)}"}), 500
+
+
+@app.route('/api/score-assessment', methods=['POST'])
+def score_assessment_endpoint():
+    """Score an assessment submission"""
+    try:
+        from assessment_scorer import score_assessment
+        
+        body = decode_request(ScoreAssessmentRequest, request.get_data())
+        questions = body.questions
+        answers = body.answers or {}
+        
+        result = run_blocking("cpu", score_assessment, questions, answers, deadline=g.deadline)
+        if result["deadline_exceeded"]:
+            logger.warning("Deadline exceeded - returning partial score", extra={"questions": len(questions)})
+            return _deadline_exceeded_response(result)
+        
+        logger.info("Assessment scored", extra={
+            "questions": len(questions),
+            "answers": len(answers),
+            "overall_score": result['overall_score'],
+            **{f"{section}_correct": f"{result[section]['correct']}/{result[section]['total']}"
+               for section in ("mcq", "sql", "dsa")}
+        })
         
         return jsonify(result), 200
         
-    except ImportError as e:
-        print(f"ERROR: assessment_scorer not available: {e}")
+    except ImportError:
+        logger.exception("assessment_scorer not available")
         return jsonify({"error": "Assessment scorer not available"}), 503
+    except RequestValidationError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
     except Exception as e:
-        print(f"Error in score_assessment_endpoint: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in score_assessment_endpoint")
         return jsonify({"error": f"Internal error: {str(e)}"}), 500
 
 
+def _score_submissions(score_assessment, submissions: list, shared_questions, summary: dict,
+                       deadline: Optional[float]):
+    """Score submissions one at a time (input order), yielding each result as it completes."""
+    score_total = 0.0
+    for index, submission in enumerate(submissions):
+        check_deadline(deadline, "bulk scoring")
+        submission = submission if isinstance(submission, dict) else {}
+        questions = submission.get('questions', shared_questions)
+        answers = submission.get('answers')
+        record = {"index": index, "id": submission.get('id')}
+        
+        if not questions or not isinstance(answers, dict):
+            summary["errors"] += 1
+            yield {**record, "error": "questions and answers are required"}
+            continue
+        
+        result = run_blocking("cpu", score_assessment, questions, answers, deadline=deadline)
+        summary["scored"] += 1
+        score_total += result['overall_score']
+        summary["average_score"] = round(score_total / summary["scored"], 2)
+        yield {**record, **result}
+        
+        if result["deadline_exceeded"]:
+            raise DeadlineExceeded("Deadline exceeded during bulk scoring")
+
+
+@app.route('/api/score-assessments', methods=['POST'])
+def score_assessments_endpoint():
+    """
+    BULK: Score many assessment submissions.
+    Accepts either:
+        {questions: [...], submissions: [{id?, answers: {...}}, ...]}  (shared questions)
+        {submissions: [{id?, questions: [...], answers: {...}}, ...]}
+    Returns: {total, scored, errors, average_score, results: [{index, id, ...score_assessment result}]}
+             or an NDJSON stream (Accept: application/x-ndjson or ?stream=1)
+             of result lines followed by that summary
+    """
+    if request.content_length and request.content_length > MAX_BULK_BYTES:
+        return jsonify({"error": f"Request body exceeds {MAX_BULK_BYTES} bytes"}), 413
+    
+    try:
+        from assessment_scorer import score_assessment
+    except ImportError:
+        logger.exception("assessment_scorer not available")
+        return jsonify({"error": "Assessment scorer not available"}), 503
+    
+    try:
+        body = decode_request(ScoreAssessmentsRequest, request.get_data())
+    except RequestValidationError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
+    submissions = body.submissions
+    
+    if len(submissions) > MAX_BULK_ITEMS:
+        return jsonify({"error": f"Too many submissions: {len(submissions)} (max {MAX_BULK_ITEMS})"}), 413
+    
+    logger.info("Scoring submissions", extra={"submissions": len(submissions)})
+    
+    summary = {"total": len(submissions), "scored": 0, "errors": 0, "average_score": 0.0}
+    records = _score_submissions(score_assessment, submissions, body.questions, summary, g.deadline)
+    return _batch_response(records, summary)
+
+
+def _resolve_gemini_api_key(api_key: Optional[str]) -> Optional[str]:
+    """Gemini API key from the request body, the multi-key manager or GEMINI_API_KEY."""
+    # If not in request, try to use multi-key manager
+    if not api_key:
+        try:
+            from multi_api_key_support import get_api_key_manager
+            key_manager = get_api_key_manager()
+            api_key = key_manager.get_current_key()
+            if api_key:
+                status = key_manager.get_status()
+                logger.debug("Using API key manager", extra={
+                    "available_keys": status['available_keys'], "total_keys": status['total_keys']
+                })
+        except ImportError:
+            # Fallback to single key
+            api_key = os.getenv('GEMINI_API_KEY')
+    
+    return api_key
+
+
+def _is_quota_error(error_msg: str) -> bool:
+    """Whether a Gemini error message means the API quota / rate limit was hit."""
+    return "429" in error_msg or "quota" in error_msg.lower() or "rate limit" in error_msg.lower()
+
+
 @app.route('/api/generate-assessment', methods=['POST'])
 def generate_assessment_endpoint():
     """
     Generate assessment questions (MCQ, Subjective, Coding)
     Returns: {mcq: [...], subjective: [...], coding: [...]}
     """
-    print("\n" + "="*80)
-    print("RECEIVED ASSESSMENT GENERATION REQUEST")
-    print("="*80)
-    
     if not ASSESSMENT_GENERATOR_AVAILABLE:
-        print("ERROR: Assessment generator not available")
         return jsonify({"error": "Assessment generator not available"}), 503
     
     try:
-        data = request.json
-        if not data:
-            print("ERROR: Request body is required")
-            return jsonify({"error": "Request body is required"}), 400
+        body = decode_request(AssessmentRequest, request.get_data())
         
-        print(f"Request data keys: {list(data.keys()) if data else 'None'}")
+        api_key = _resolve_gemini_api_key(body.api_key)
         
-        # Get API key from request or environment (supports multiple keys)
-        api_key = data.get('api_key')
-        
-        # If not in request, try to use multi-key manager
         if not api_key:
-            try:
-                from multi_api_key_support import get_api_key_manager
-                key_manager = get_api_key_manager()
-                api_key = key_manager.get_current_key()
-                if api_key:
-                    status = key_manager.get_status()
-                    print(f"Using API key manager: {status['available_keys']}/{status['total_keys']} keys available")
-            except ImportError:
-                # Fallback to single key
-                api_key = os.getenv('GEMINI_API_KEY')
-        
-        if not api_key:
-            print("ERROR: GEMINI_API_KEY is required")
             return jsonify({"error": "GEMINI_API_KEY is required"}), 400
         
-        print(f"API Key provided: {'YES' if api_key else 'NO'}")
-        if api_key:
-            print(f"API Key length: {len(api_key)}")
-        
-        # Build config from request - support both flat format and sections format
-        sections_data = data.get('sections', {})
-        
-        # Extract from sections structure if provided, otherwise use flat format
-        if sections_data:
-            mcq_section = sections_data.get('mcq', {})
-            subj_section = sections_data.get('subjective', {})
-            coding_section = sections_data.get('coding', {})
-            
-            config = {
-                "experience_years": data.get('experience_years', 2),
-                "experience_level": data.get('experience_level', 'Mid'),
-                "difficulty": data.get('difficulty', 'Medium'),
-                "sections": {
-                    "mcq": {
-                        "total_time_minutes": mcq_section.get('total_time_minutes', data.get('mcq_time_minutes', 20)),
-                        "question_count": mcq_section.get('question_count', data.get('mcq_count', 15))
-                    },
-                    "subjective": {
-                        "topic": subj_section.get('topic', 'SQL'),
-                        "total_time_minutes": subj_section.get('total_time_minutes', data.get('descriptive_time_minutes', 30)),
-                        "question_count": subj_section.get('question_count', data.get('descriptive_count', 10))
-                    },
-                    "coding": {
-                        "topic": coding_section.get('topic', 'DSA'),
-                        "total_time_minutes": coding_section.get('total_time_minutes', data.get('dsa_time_minutes', 120)),
-                        "question_count": coding_section.get('question_count', data.get('dsa_count', 2))
-                    }
-                }
-            }
-        else:
-            # Fallback to flat format
-            config = {
-                "experience_years": data.get('experience_years', 2),
-                "experience_level": data.get('experience_level', 'Mid'),
-                "difficulty": data.get('difficulty', 'Medium'),
-                "sections": {
-                    "mcq": {
-                        "total_time_minutes": data.get('mcq_time_minutes', 20),
-                        "question_count": data.get('mcq_count', 15)
-                    },
-                    "subjective": {
-                        "topic": "SQL",
-                        "total_time_minutes": data.get('descriptive_time_minutes', 30),
-                        "question_count": data.get('descriptive_count', 10)
-                    },
-                    "coding": {
-                        "topic": "DSA",
-                        "total_time_minutes": data.get('dsa_time_minutes', 120),
-                        "question_count": data.get('dsa_count', 2)
-                    }
-                }
-            }
-        
-        print(f"Config structure: {json.dumps(config, indent=2)}")
-        
-        # Get job description (recruiter's requirements) for question matching
-        job_description = data.get('job_description', '') or data.get('description', '') or data.get('jd_text', '')
-        
-        # Get resume text as fallback
-        resume_text = data.get('resume_text', '') or data.get('resumeText', '')
-        
-        # Prioritize job description over resume for question selection
-        if job_description:
-            print(f"Job description provided for question matching ({len(job_description)} chars)")
-            print("Questions will be selected based on recruiter's requirements")
-        elif resume_text:
-            print(f"Resume text provided for question matching ({len(resume_text)} chars)")
-            print("Questions will be selected based on candidate's resume")
-        else:
-            print("No job description or resume provided - questions will be randomly selected")
+        config = body.to_config()
         
-        print("Calling generate_assessment()...")
+        # Job description (recruiter's requirements) for question matching, resume text as fallback
+        job_description = body.job_description_text
+        resume_text = body.resume
+        
+        # Prioritize job description over resume for question selection (logged as question_source)
+        logger.info("Generating assessment", extra={
+            "config": config,
+            "question_source": "job_description" if job_description else "resume" if resume_text else "random",
+            "source_chars": len(job_description or resume_text or "")
+        })
         
         # Generate assessment with job description (recruiter requirements) for skill-based selection
-        result = generate_assessment(config, api_key=api_key, resume_text=resume_text, job_description=job_description)
+        result = run_blocking(
+            "io",
+            generate_assessment,
+            config,
+            api_key=api_key,
+            resume_text=resume_text,
+            job_description=job_description,
+            deadline=g.deadline
+        )
         
-        print(f"Generation successful! Result keys: {list(result.keys()) if result else 'None'}")
-        if result:
-            mcq_count = len(result.get('mcq', []))
-            subj_count = len(result.get('subjective', []))
-            coding_count = len(result.get('coding', []))
-            print(f"Generated: {mcq_count} MCQ, {subj_count} Subjective, {coding_count} Coding questions")
+        if result.get("deadline_exceeded"):
+            logger.warning("Deadline exceeded - returning partial assessment", extra={
+                "incomplete_sections": result['incomplete_sections']
+            })
+            return _deadline_exceeded_response(result)
         
-        print("="*80 + "\n")
+        logger.info("Assessment generated", extra={
+            section: len(result.get(section, [])) for section in ("mcq", "subjective", "coding")
+        })
         
         return jsonify(result), 200
         
+    except RequestValidationError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
     except Exception as e:
         error_msg = str(e)
-        print(f"ERROR in generate_assessment_endpoint: {error_msg}")
-        import traceback
-        traceback.print_exc()
-        print("="*80 + "\n")
-        
+        logger.exception("Error in generate_assessment_endpoint")
         # Check if it's a quota exceeded error
-        if "429" in error_msg or "quota" in error_msg.lower() or "rate limit" in error_msg.lower():
+        if _is_quota_error(error_msg):
             return jsonify({
                 "error": "Gemini API quota exceeded",
                 "message": "Free tier limit: 20 requests/day. Please wait 24 hours or upgrade your API plan.",
@@ -358,6 +1237,69 @@ def generate_assessment_endpoint():
             return jsonify({"error": f"Internal error: {error_msg}"}), 500
 
 
+@app.route('/api/assessment-jobs', methods=['POST'])
+def create_assessment_job():
+    """
+    ASYNC: Start assessment generation in the background.
+    Accepts the same body as /api/generate-assessment.
+    Returns (202): {job_id, status: "queued", status_url}
+    """
+    if not ASSESSMENT_GENERATOR_AVAILABLE:
+        return jsonify({"error": "Assessment generator not available"}), 503
+    
+    try:
+        body = decode_request(AssessmentRequest, request.get_data())
+        
+        api_key = _resolve_gemini_api_key(body.api_key)
+        if not api_key:
+            return jsonify({"error": "GEMINI_API_KEY is required"}), 400
+        
+        job_id = submit_generation_job(
+            generate_assessment,
+            body.to_config(),
+            api_key=api_key,
+            resume_text=body.resume,
+            job_description=body.job_description_text,
+            # Only an explicit client timeout applies; jobs exist to outlive HTTP timeouts
+            deadline=resolve_deadline(
+                request.headers.get(TIMEOUT_HEADER), _body_timeout(), g.request_start, use_default=False
+            )
+        )
+        logger.info("Assessment job queued", extra={"job_id": job_id})
+        
+        return jsonify({
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/api/assessment-jobs/{job_id}"
+        }), 202
+        
+    except RequestValidationError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
+    except JobStoreFull as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "30"}
+    except Exception as e:
+        logger.exception("Error in create_assessment_job")
+        return jsonify({"error": f"Internal error: {str(e)}"}), 500
+
+
+@app.route('/api/assessment-jobs/<job_id>', methods=['GET'])
+def get_assessment_job(job_id):
+    """
+    Poll an assessment generation job.
+    Returns: {job_id, status: queued|running|completed|failed, sections_completed,
+              sections_pending, result: {section: [...]} (partial while running), error}
+    """
+    job = get_job_store().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found (unknown or expired)"}), 404
+    
+    job["sections_pending"] = [s for s in SECTIONS if s not in job["sections_completed"]]
+    if job["status"] == "failed" and _is_quota_error(job["error"] or ""):
+        job["quota_exceeded"] = True
+    
+    return jsonify(job), 200
+
+
 @app.route('/api/parse-pdf', methods=['POST'])
 def parse_pdf():
     """
@@ -368,6 +1310,9 @@ def parse_pdf():
     if not PDF_PARSER_AVAILABLE:
         return jsonify({"error": "PDF parser not available"}), 503
     
+    if request.content_length and request.content_length > MAX_PDF_BYTES:
+        return jsonify({"error": f"PDF exceeds {MAX_PDF_BYTES} bytes"}), 413
+    
     try:
         if 'file' not in request.files:
             return jsonify({"error": "No file provided"}), 400
@@ -376,37 +1321,151 @@ def parse_pdf():
         if file.filename == '':
             return jsonify({"error": "No file selected"}), 400
         
-        # Save temporarily
-        import tempfile
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            file.save(tmp_file.name)
-            tmp_path = tmp_file.name
+        # Parse straight from the in-memory upload (bytes, so it can also be
+        # sent to the CPU process pool; memoryviews do not pickle)
+        pdf_data = file.read()
+        text = run_blocking("cpu", extract_resume_text_from_bytes, pdf_data, deadline=g.deadline)
         
-        try:
-            # Extract text
-            text = extract_resume_text(tmp_path)
-            
-            if not text or len(text.strip()) < 10:
-                return jsonify({"error": "Could not extract text from PDF"}), 400
-            
-            return jsonify({
-                "text": text,
-                "success": True
-            }), 200
-        finally:
-            # Clean up temp file
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
+        if not text or len(text.strip()) < 10:
+            return jsonify({"error": "Could not extract text from PDF"}), 400
+        
+        return jsonify({
+            "text": text,
+            "success": True
+        }), 200
+        
+    except DeadlineExceeded:
+        return _deadline_exceeded_response()
+    except ValueError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
+    except Exception as e:
+        logger.exception("Error in parse_pdf")
+        return jsonify({"error": f"Internal error: {str(e)}"}), 500
+
+
+@app.route('/api/shortlist-pdf', methods=['POST'])
+def shortlist_pdf_endpoint():
+    """
+    PRIMARY (one call): PDF resume -> shortlist decision, replacing
+    /api/parse-pdf followed by /api/match-application.
+    Accepts: multipart/form-data with 'file', 'jd_text' (or 'jd_id' returned by an
+             earlier call), 'min_score_threshold' (0-100 or 0-1) and optional
+             'include_text' (true to return the extracted text)
+    Returns: {shortlisted: bool, score: int, reason: str, threshold: int, jd_id: str, text?: str}
+    """
+    if not SHORTLIST_PIPELINE_AVAILABLE or not RESUME_MATCHER_AVAILABLE:
+        return jsonify({"error": "Shortlist pipeline not available"}), 503
+    
+    if request.content_length and request.content_length > MAX_PDF_BYTES:
+        return jsonify({"error": f"PDF exceeds {MAX_PDF_BYTES} bytes"}), 413
+    
+    try:
+        file = request.files.get('file')
+        if file is None or file.filename == '':
+            return jsonify({"error": "No file provided"}), 400
+        
+        jd_text = request.form.get('jd_text', '').strip()
+        jd_id = request.form.get('jd_id', '').strip()
+        if not jd_text and not jd_id:
+            return jsonify({"error": "jd_text or jd_id is required"}), 400
+        
+        min_score_threshold = _normalize_threshold(float(request.form.get('min_score_threshold', 0.50)))
+        include_text = request.form.get('include_text', '').lower() in ('1', 'true', 'yes')
+        
+        model = get_or_load_model()
+        if model is None:
+            return jsonify({"error": "Failed to load AI model"}), 500
+        
+        result = shortlist_pdf(
+            file.read(),
+            min_score_threshold,
+            model,
+            jd_text=jd_text or None,
+            jd_id=jd_id or None,
+            deadline=g.deadline
+        )
+        
+        # Convert score back to 0-100 scale for backend
+        result['score'] = int(result['score'] * 100)
+        result['threshold'] = int(result['threshold'] * 100)
+        text = result.pop('text')
+        if include_text:
+            result['text'] = text
+        
+        return jsonify(result), 200
         
+    except UnknownJobDescription:
+        return jsonify({
+            "error": "Unknown jd_id (not cached by this service); resend with jd_text",
+            "unknown_jd_id": True
+        }), 404
+    except DeadlineExceeded:
+        return _deadline_exceeded_response()
+    except ValueError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
     except Exception as e:
-        print(f"Error in parse_pdf: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in shortlist_pdf_endpoint")
         return jsonify({"error": f"Internal error: {str(e)}"}), 500
 
 
+def _parse_uploaded_pdfs(uploads: list, summary: dict, deadline: Optional[float]):
+    """
+    Parse (filename, bytes) uploads in order, yielding each file's text as soon
+    as it is extracted. Each upload is dropped from the list once parsed.
+    """
+    for index in range(len(uploads)):
+        check_deadline(deadline, "bulk PDF parsing")
+        filename, pdf_data = uploads[index]
+        uploads[index] = None
+        record = {"index": index, "filename": filename}
+        try:
+            if len(pdf_data) > MAX_PDF_BYTES:
+                raise ValueError(f"PDF exceeds {MAX_PDF_BYTES} bytes")
+            text = run_blocking("cpu", extract_resume_text_from_bytes, pdf_data, deadline=deadline)
+            if not text or len(text.strip()) < 10:
+                raise ValueError("Could not extract text from PDF")
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            summary["errors"] += 1
+            yield {**record, "success": False, "error": str(e)}
+            continue
+        finally:
+            del pdf_data
+        summary["parsed"] += 1
+        yield {**record, "success": True, "text": text}
+
+
+@app.route('/api/parse-pdfs', methods=['POST'])
+def parse_pdfs():
+    """
+    BULK: Extract text from many PDF resumes.
+    Accepts: multipart/form-data with one or more 'files' fields
+    Returns: {total, parsed, errors, results: [{index, filename, success, text | error}]}
+             or an NDJSON stream (Accept: application/x-ndjson or ?stream=1)
+             of result lines followed by that summary
+    """
+    if not PDF_PARSER_AVAILABLE:
+        return jsonify({"error": "PDF parser not available"}), 503
+    
+    if request.content_length and request.content_length > MAX_BULK_PDF_BYTES:
+        return jsonify({"error": f"Request body exceeds {MAX_BULK_PDF_BYTES} bytes"}), 413
+    
+    files = [file for file in request.files.getlist('files') if file.filename]
+    if not files:
+        return jsonify({"error": "No files provided"}), 400
+    
+    if len(files) > MAX_BULK_ITEMS:
+        return jsonify({"error": f"Too many files: {len(files)} (max {MAX_BULK_ITEMS})"}), 413
+    
+    # Read the uploads now: Flask closes request files when the view returns,
+    # before a streamed body is generated
+    uploads = [(file.filename, file.read()) for file in files]
+    
+    summary = {"total": len(uploads), "parsed": 0, "errors": 0}
+    return _batch_response(_parse_uploaded_pdfs(uploads, summary, g.deadline), summary)
+
+
 @app.route('/api/execute-code', methods=['POST'])
 def execute_code_endpoint():
     """Execute code and run test cases"""
@@ -414,38 +1473,29 @@ def execute_code_endpoint():
         return jsonify({"error": "Code executor not available"}), 503
     
     try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "Request body is required"}), 400
-        
-        code = data.get('code')
-        test_cases = data.get('test_cases', [])
-        language = data.get('language', 'python')
+        body = decode_request(ExecuteCodeRequest, request.get_data())
+        code = body.code
+        test_cases = body.test_cases
+        language = body.language
         
-        if not code:
-            return jsonify({"error": "code is required"}), 400
+        result = run_blocking("cpu", evaluate_dsa_solution, code, test_cases, language, deadline=g.deadline)
         
-        if not test_cases:
-            return jsonify({"error": "test_cases are required"}), 400
+        logger.info("Code executed", extra={
+            "language": language,
+            "code_chars": len(code),
+            "passed_tests": result['passed_tests'],
+            "total_tests": result['total_tests']
+        })
         
-        print(f"\n{'='*80}")
-        print(f"EXECUTING CODE")
-        print(f"{'='*80}")
-        print(f"Language: {language}")
-        print(f"Test cases: {len(test_cases)}")
-        print(f"Code length: {len(code)} characters")
-        
-        result = evaluate_dsa_solution(code, test_cases, language)
-        
-        print(f"Result: {result['passed_tests']}/{result['total_tests']} passed")
-        print(f"{'='*80}\n")
+        if result["deadline_exceeded"]:
+            return _deadline_exceeded_response(result)
         
         return jsonify(result), 200
         
+    except RequestValidationError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
     except Exception as e:
-        print(f"Error in execute_code: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in execute_code")
         return jsonify({"error": f"Internal error: {str(e)}"}), 500
 
 
@@ -459,44 +1509,138 @@ def analyze_jd_endpoint():
         return jsonify({"error": "JD analyzer not available"}), 503
     
     try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "Request body is required"}), 400
-        
-        jd_text = data.get('job_description') or data.get('jd_text') or data.get('text')
+        jd_text = decode_request(AnalyzeJDRequest, request.get_data()).jd
         
         if not jd_text:
             return jsonify({"error": "job_description is required"}), 400
         
-        if not isinstance(jd_text, str):
-            return jsonify({"error": "job_description must be a string"}), 400
-        
-        print(f"\n{'='*80}")
-        print(f"ANALYZING JOB DESCRIPTION")
-        print(f"{'='*80}")
-        print(f"JD length: {len(jd_text)} characters")
+        cache = get_response_cache("analyze_jd")
+        cache_key = make_cache_key({"jd_text": jd_text}, DICTIONARY_VERSION)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return jsonify(cached), 200, {"X-Cache": "HIT"}
         
         result = analyze_job_description(jd_text)
         
-        print(f"Extracted:")
-        print(f"  Role: {result.get('role')}")
-        print(f"  Experience: {result.get('experience_level')} ({result.get('experience_years')} years)")
-        print(f"  Skills: {len(result.get('skills', []))} skills")
-        print(f"{'='*80}\n")
+        logger.info("Job description analyzed", extra={
+            "jd_chars": len(jd_text),
+            "role": result.get('role'),
+            "experience_level": result.get('experience_level'),
+            "skills": len(result.get('skills', []))
+        })
         
-        return jsonify(result), 200
+        cache.put(cache_key, result)
+        return jsonify(result), 200, {"X-Cache": "MISS"}
         
+    except RequestValidationError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
+    except Exception as e:
+        logger.exception("Error in analyze_jd")
+        return jsonify({"error": f"Internal error: {str(e)}"}), 500
+
+
+def _resolve_applicant_embeddings(body):
+    """
+    Get applicant embeddings from a clustering request.
+
+    Uses stored embeddings when the caller sends them ("embeddings"), otherwise
+    encodes "resume_texts" with the resume matcher model.
+
+    Returns:
+        Tuple of (embeddings, error_response) - exactly one is None
+    """
+    if body.embeddings:
+        return body.embeddings, None
+
+    resume_texts = body.resume_texts
+    if not resume_texts:
+        return None, (jsonify({"error": "embeddings or resume_texts are required"}), 400)
+
+    if not RESUME_MATCHER_AVAILABLE:
+        return None, (jsonify({"error": "Resume matcher not available to encode resume_texts"}), 503)
+
+    model = get_or_load_model()
+    if model is None:
+        return None, (jsonify({"error": "Failed to load AI model"}), 500)
+
+    from ai_resume_matcher import generate_embeddings
+    return run_blocking("encode", generate_embeddings, model, resume_texts), None
+
+
+@app.route('/api/cluster-applicants', methods=['POST'])
+def cluster_applicants_endpoint():
+    """
+    SECONDARY (Recruiter Analytics): Group an applicant pool into skill-labelled clusters.
+    Accepts: {embeddings?: [[float]], resume_texts?: [str], n_clusters: int, top_skills?: int}
+    Returns: {labels, clusters: [{cluster_id, size, top_skills}], model_state, ...}
+    """
+    if not CLUSTERING_AVAILABLE:
+        return jsonify({"error": "Applicant clustering not available"}), 503
+
+    try:
+        body = decode_request(ClusterApplicantsRequest, request.get_data())
+
+        embeddings, error_response = _resolve_applicant_embeddings(body)
+        if error_response:
+            return error_response
+
+        result = run_blocking(
+            "cpu",
+            cluster_applicants,
+            embeddings,
+            n_clusters=body.n_clusters,
+            resume_texts=body.resume_texts,
+            top_skills=body.top_skills
+        )
+
+        return jsonify(result), 200
+
+    except ValueError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
+    except Exception as e:
+        logger.exception("Error in cluster_applicants")
+        return jsonify({"error": f"Internal error: {str(e)}"}), 500
+
+
+@app.route('/api/assign-applicants', methods=['POST'])
+def assign_applicants_endpoint():
+    """
+    Assign new applicants to clusters from a previous /api/cluster-applicants call.
+    Accepts: {embeddings?: [[float]], resume_texts?: [str], model_state: {...}, update_centroids?: bool}
+    Returns: {labels: [int], model_state: {...}}
+    """
+    if not CLUSTERING_AVAILABLE:
+        return jsonify({"error": "Applicant clustering not available"}), 503
+
+    try:
+        body = decode_request(AssignApplicantsRequest, request.get_data())
+        if not body.model_state:
+            return jsonify({"error": "model_state is required"}), 400
+
+        embeddings, error_response = _resolve_applicant_embeddings(body)
+        if error_response:
+            return error_response
+
+        result = run_blocking(
+            "cpu",
+            assign_applicants,
+            embeddings,
+            body.model_state,
+            update_centroids=body.update_centroids
+        )
+
+        return jsonify(result), 200
+
+    except ValueError as e:
+        return jsonify({"error": f"Invalid input: {str(e)}"}), 400
     except Exception as e:
-        print(f"Error in analyze_jd: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in assign_applicants")
         return jsonify({"error": f"Internal error: {str(e)}"}), 500
 
 
 if __name__ == '__main__':
-    # Load model at startup
-    if RESUME_MATCHER_AVAILABLE:
-        get_or_load_model()
+    # Load model in the background; /health answers while it loads
+    start_warmup()
     
     # Run server
     # Render sets PORT env var, fallback to AI_SERVICE_PORT or 5000
@@ -508,14 +1652,25 @@ if __name__ == '__main__':
     print(f"   - PDF Parser: {PDF_PARSER_AVAILABLE}")
     print(f"   - Code Executor: {CODE_EXECUTOR_AVAILABLE}")
     print(f"   - JD Analyzer: {JD_ANALYZER_AVAILABLE}")
+    print(f"   - Applicant Clustering: {CLUSTERING_AVAILABLE}")
     print(f"\n🔗 Endpoints:")
     print(f"   - GET  /health")
+    print(f"   - GET  /metrics")
+    print(f"   - GET  /api/pool-stats")
     print(f"   - POST /api/match-application")
+    print(f"   - POST /api/match-applications")
     print(f"   - POST /api/generate-assessment")
+    print(f"   - POST /api/assessment-jobs")
+    print(f"   - GET  /api/assessment-jobs/<job_id>")
     print(f"   - POST /api/score-assessment")
+    print(f"   - POST /api/score-assessments")
     print(f"   - POST /api/parse-pdf")
+    print(f"   - POST /api/parse-pdfs")
+    print(f"   - POST /api/shortlist-pdf")
     print(f"   - POST /api/execute-code")
     print(f"   - POST /api/analyze-jd")
+    print(f"   - POST /api/cluster-applicants")
+    print(f"   - POST /api/assign-applicants")
     
     app.run(host='0.0.0.0', port=port, debug=False)
 
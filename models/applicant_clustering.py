@@ -0,0 +1,362 @@
+"""
+Applicant Clustering - Recruiter Analytics
+Groups large applicant pools into skill-labelled clusters using mini-batch k-means
+over stored resume embeddings (NumPy only).
+
+SECONDARY FLOW (Recruiter Analytics):
+    cluster_applicants()
+    - Fits k centroids on the whole pool with mini-batch updates (Sculley, 2010)
+    - Labels each cluster with its most frequent skills.py skills
+    - Returns a model state (centroids + counts) that can be reused later
+
+    assign_applicants()
+    - Assigns new applicants to an existing model state without refitting
+    - Optionally folds them into the centroids (incremental update)
+
+NOT used during candidate apply flow (see ai_resume_matcher.evaluate_application).
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from jd_analyzer import extract_skill_set
+
+# Defaults tuned for pools of ~20k MPNet (768-d) embeddings
+DEFAULT_BATCH_SIZE = 1024
+DEFAULT_MAX_ITER = 100
+DEFAULT_TOL = 1e-4
+# Resumes sampled per cluster for skill labelling (regex work is the slow part)
+DEFAULT_LABEL_SAMPLE_SIZE = 200
+# Rows per chunk when assigning the full pool (bounds the N x K distance matrix)
+ASSIGN_CHUNK_SIZE = 8192
+
+
+def _as_matrix(embeddings) -> np.ndarray:
+    """Convert embeddings (list of lists or array) to a 2-D float32 matrix."""
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2 or matrix.shape[0] == 0:
+        raise ValueError("embeddings must be a non-empty 2-D array of shape (N, dim)")
+    return matrix
+
+
+def _squared_distances(X: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Squared Euclidean distances between rows of X and centroids, shape (N, K)."""
+    x_sq = np.einsum('ij,ij->i', X, X)[:, None]
+    c_sq = np.einsum('ij,ij->i', centroids, centroids)[None, :]
+    distances = x_sq - 2.0 * (X @ centroids.T) + c_sq
+    return np.maximum(distances, 0.0)
+
+
+def _nearest_centroids(X: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid for every row of X (chunked for large N)."""
+    labels = np.empty(X.shape[0], dtype=np.int64)
+    for start in range(0, X.shape[0], ASSIGN_CHUNK_SIZE):
+        chunk = X[start:start + ASSIGN_CHUNK_SIZE]
+        labels[start:start + ASSIGN_CHUNK_SIZE] = _squared_distances(chunk, centroids).argmin(axis=1)
+    return labels
+
+
+def _fold_into_centroids(
+    centroids: np.ndarray,
+    counts: np.ndarray,
+    X: np.ndarray,
+    labels: np.ndarray
+):
+    """
+    Move each centroid to the running mean of every row it has absorbed.
+
+    Equivalent to sequential updates with per-centre learning rate 1/count.
+
+    Returns:
+        Tuple of (centroids, counts) after absorbing X
+    """
+    n_clusters = centroids.shape[0]
+    batch_counts = np.bincount(labels, minlength=n_clusters).astype(np.float64)
+    # One-hot (K x N) @ X sums rows per cluster as a single BLAS call
+    # (np.add.at is unbuffered and orders of magnitude slower here)
+    one_hot = np.zeros((n_clusters, X.shape[0]), dtype=np.float32)
+    one_hot[labels, np.arange(X.shape[0])] = 1.0
+    batch_sums = (one_hot @ X).astype(np.float64)
+
+    touched = batch_counts > 0
+    new_counts = counts + batch_counts
+    centroids = centroids.copy()
+    centroids[touched] = (
+        (centroids[touched] * counts[touched, None] + batch_sums[touched]) / new_counts[touched, None]
+    ).astype(np.float32)
+    return centroids, new_counts
+
+
+def _kmeans_plus_plus(X: np.ndarray, n_clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    k-means++ seeding on X.
+
+    Args:
+        X: Sample matrix of shape (N, dim)
+        n_clusters: Number of centroids to pick
+        rng: NumPy random generator
+
+    Returns:
+        Initial centroids of shape (n_clusters, dim)
+    """
+    centroids = np.empty((n_clusters, X.shape[1]), dtype=np.float32)
+    centroids[0] = X[rng.integers(X.shape[0])]
+    closest = _squared_distances(X, centroids[:1])[:, 0]
+
+    for i in range(1, n_clusters):
+        total = closest.sum()
+        if total <= 0.0:
+            # Fewer distinct points than clusters - duplicate a random point
+            centroids[i] = X[rng.integers(X.shape[0])]
+            continue
+        idx = rng.choice(X.shape[0], p=closest / total)
+        centroids[i] = X[idx]
+        closest = np.minimum(closest, _squared_distances(X, centroids[i:i + 1])[:, 0])
+
+    return centroids
+
+
+def fit_minibatch_kmeans(
+    embeddings,
+    n_clusters: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_iter: int = DEFAULT_MAX_ITER,
+    tol: float = DEFAULT_TOL,
+    seed: Optional[int] = 42
+) -> Dict:
+    """
+    Fit mini-batch k-means centroids.
+
+    Each iteration samples `batch_size` rows, assigns them to their nearest
+    centroid and moves every centroid to the running mean of all rows it has
+    ever been assigned (per-centre learning rate 1/count).
+
+    Args:
+        embeddings: Matrix of shape (N, dim)
+        n_clusters: Number of clusters (K)
+        batch_size: Rows sampled per iteration
+        max_iter: Maximum number of mini-batch iterations
+        tol: Stop when no centroid moves more than this (Euclidean) in an iteration
+        seed: Random seed (None for non-deterministic runs)
+
+    Returns:
+        Dictionary with:
+        - centroids: np.ndarray (K, dim)
+        - counts: np.ndarray (K,) rows absorbed per centroid
+        - labels: np.ndarray (N,) final cluster of every row
+        - inertia: float (sum of squared distances to assigned centroid)
+        - iterations: int
+    """
+    X = _as_matrix(embeddings)
+    n_samples = X.shape[0]
+
+    if not isinstance(n_clusters, int) or n_clusters < 1:
+        raise ValueError("n_clusters must be a positive integer")
+    if n_clusters > n_samples:
+        raise ValueError(f"n_clusters ({n_clusters}) cannot exceed number of applicants ({n_samples})")
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+    rng = np.random.default_rng(seed)
+    batch_size = min(batch_size, n_samples)
+
+    # Seed on a subsample so initialisation stays cheap on large pools
+    init_size = min(n_samples, max(3 * batch_size, 10 * n_clusters))
+    init_idx = rng.choice(n_samples, size=init_size, replace=False)
+    centroids = _kmeans_plus_plus(X[init_idx], n_clusters, rng)
+    counts = np.zeros(n_clusters, dtype=np.float64)
+
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        batch = X[rng.choice(n_samples, size=batch_size, replace=False)]
+        batch_labels = _squared_distances(batch, centroids).argmin(axis=1)
+
+        previous = centroids
+        centroids, counts = _fold_into_centroids(centroids, counts, batch, batch_labels)
+
+        shift = np.sqrt(((centroids - previous) ** 2).sum(axis=1)).max()
+        if iterations > 1 and shift <= tol:
+            break
+
+    labels = _nearest_centroids(X, centroids)
+    inertia = float(((X - centroids[labels]) ** 2).sum())
+
+    return {
+        "centroids": centroids,
+        "counts": counts,
+        "labels": labels,
+        "inertia": inertia,
+        "iterations": iterations
+    }
+
+
+def label_clusters(
+    resume_texts: List[str],
+    labels: np.ndarray,
+    n_clusters: int,
+    top_n: int = 5,
+    sample_size: int = DEFAULT_LABEL_SAMPLE_SIZE,
+    seed: Optional[int] = 42
+) -> List[List[Dict]]:
+    """
+    Label each cluster with its most frequent skills.py skills.
+
+    At most `sample_size` resumes per cluster are scanned (one regex pass each)
+    and shares are reported relative to that sample.
+
+    Args:
+        resume_texts: Resume texts aligned with labels
+        labels: Cluster index per resume
+        n_clusters: Number of clusters
+        top_n: Skills to keep per cluster
+        sample_size: Maximum resumes scanned per cluster
+        seed: Random seed for the per-cluster sample
+
+    Returns:
+        List (one per cluster) of [{"skill": str, "share": float}] where share is
+        the fraction of the cluster's resumes mentioning the skill
+    """
+    if len(resume_texts) != len(labels):
+        raise ValueError("resume_texts must align with embeddings")
+
+    rng = np.random.default_rng(seed)
+    cluster_skills = []
+
+    for cluster_id in range(n_clusters):
+        members = np.flatnonzero(labels == cluster_id)
+        if members.size > sample_size:
+            members = rng.choice(members, size=sample_size, replace=False)
+
+        skill_counter = Counter()
+        for idx in members:
+            skill_counter.update(extract_skill_set(resume_texts[idx]))
+
+        scanned = max(len(members), 1)
+        cluster_skills.append([
+            {"skill": skill, "share": round(count / scanned, 4)}
+            for skill, count in sorted(skill_counter.items(), key=lambda x: (-x[1], x[0]))[:top_n]
+        ])
+
+    return cluster_skills
+
+
+def cluster_applicants(
+    embeddings,
+    n_clusters: int,
+    resume_texts: Optional[List[str]] = None,
+    top_skills: int = 5,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_iter: int = DEFAULT_MAX_ITER,
+    seed: Optional[int] = 42
+) -> Dict:
+    """
+    MAIN FUNCTION: Cluster an applicant pool for recruiter analytics.
+
+    Args:
+        embeddings: Stored resume embeddings, shape (N, dim)
+        n_clusters: Number of groups to produce
+        resume_texts: Optional resume texts (aligned with embeddings) used to
+                      label clusters with skills; clusters are unlabelled without them
+        top_skills: Skills reported per cluster
+        batch_size: Mini-batch size
+        max_iter: Maximum mini-batch iterations
+        seed: Random seed
+
+    Returns:
+        Dictionary (JSON-compatible):
+        {
+            "total_candidates": int,
+            "n_clusters": int,
+            "labels": [int, ...],               # cluster per applicant (input order)
+            "clusters": [
+                {"cluster_id": int, "size": int, "top_skills": [{"skill", "share"}]}
+            ],
+            "model_state": {"centroids": [[float]], "counts": [float]},
+            "inertia": float,
+            "iterations": int
+        }
+    """
+    fit = fit_minibatch_kmeans(
+        embeddings,
+        n_clusters=n_clusters,
+        batch_size=batch_size,
+        max_iter=max_iter,
+        seed=seed
+    )
+    labels = fit["labels"]
+    sizes = np.bincount(labels, minlength=n_clusters)
+
+    if resume_texts:
+        skills_per_cluster = label_clusters(resume_texts, labels, n_clusters, top_n=top_skills, seed=seed)
+    else:
+        skills_per_cluster = [[] for _ in range(n_clusters)]
+
+    clusters = [
+        {
+            "cluster_id": cluster_id,
+            "size": int(sizes[cluster_id]),
+            "top_skills": skills_per_cluster[cluster_id]
+        }
+        for cluster_id in range(n_clusters)
+    ]
+
+    return {
+        "total_candidates": int(labels.shape[0]),
+        "n_clusters": n_clusters,
+        "labels": labels.tolist(),
+        "clusters": clusters,
+        "model_state": {
+            "centroids": fit["centroids"].tolist(),
+            "counts": fit["counts"].tolist()
+        },
+        "inertia": round(fit["inertia"], 4),
+        "iterations": fit["iterations"]
+    }
+
+
+def assign_applicants(
+    embeddings,
+    model_state: Dict,
+    update_centroids: bool = False
+) -> Dict:
+    """
+    Assign new applicants to existing clusters (incremental assignment).
+
+    Args:
+        embeddings: New resume embeddings, shape (M, dim)
+        model_state: {"centroids": [[float]], "counts": [float]} from cluster_applicants()
+        update_centroids: If True, fold the new applicants into the centroids
+                          (same running-mean update as training)
+
+    Returns:
+        Dictionary with:
+        - labels: [int, ...] cluster per new applicant (input order)
+        - model_state: updated state (unchanged unless update_centroids=True)
+    """
+    if not isinstance(model_state, dict) or "centroids" not in model_state:
+        raise ValueError("model_state must contain centroids")
+
+    X = _as_matrix(embeddings)
+    centroids = _as_matrix(model_state["centroids"])
+    counts = model_state.get("counts")
+    counts = np.ones(centroids.shape[0]) if counts is None else np.asarray(counts, dtype=np.float64)
+
+    if X.shape[1] != centroids.shape[1]:
+        raise ValueError(f"Embedding dimension mismatch: expected {centroids.shape[1]}, got {X.shape[1]}")
+    if counts.shape[0] != centroids.shape[0]:
+        raise ValueError("model_state counts must have one entry per centroid")
+
+    labels = _nearest_centroids(X, centroids)
+
+    if update_centroids:
+        centroids, counts = _fold_into_centroids(centroids, counts, X, labels)
+
+    return {
+        "labels": labels.tolist(),
+        "model_state": {
+            "centroids": centroids.tolist(),
+            "counts": counts.tolist()
+        }
+    }
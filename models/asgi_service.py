@@ -0,0 +1,36 @@
+"""
+ASGI Service - Production async serving mode for the AI Service
+
+Wraps the Flask app (ai_service.app) for an ASGI server. Each request is handled
+on a lightweight request thread while its blocking work (PDF parsing, encoding,
+code execution, Gemini calls) runs on the sized pools in service_pools.py, so a
+slow parse or generation no longer stalls cheap requests such as /api/analyze-jd.
+
+Run:
+    uvicorn asgi_service:app --host 0.0.0.0 --port $PORT
+
+Environment:
+    AI_SERVICE_ASGI_THREADS   - concurrent request threads (default: 32)
+    AI_SERVICE_IO_THREADS     - Gemini thread pool size (default: 8)
+    AI_SERVICE_ENCODE_THREADS - encoding thread pool size (default: 1)
+    AI_SERVICE_CPU_PROCESSES  - CPU process pool size (default: CPU count)
+
+Pool queue depths are exposed at GET /api/pool-stats.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Must be set before ai_service is imported so endpoints dispatch to pools
+os.environ.setdefault("AI_SERVICE_OFFLOAD", "1")
+
+from a2wsgi import WSGIMiddleware
+
+from ai_service import app as flask_app, start_warmup
+
+# Load model in the background (same as `python ai_service.py`)
+start_warmup()
+
+app = WSGIMiddleware(flask_app, workers=int(os.getenv("AI_SERVICE_ASGI_THREADS", 32)))
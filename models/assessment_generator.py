@@ -5,10 +5,31 @@ Generates MCQs, Subjective (SQL), and Coding (DSA) questions using Gemini API
 Standalone module - ready for backend integration
 """
 
+from __future__ import annotations
+
+import importlib.util
 import json
+import logging
 import os
-from typing import Dict, List, Optional, Tuple
-import google.generativeai as genai
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from request_deadline import DeadlineExceeded, check_deadline, expired, remaining
+from service_metrics import stage
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+# Fail at import (as the eager import used to) when the SDK is missing
+if importlib.util.find_spec("google.generativeai") is None:
+    raise ImportError("google-generativeai not installed. Run: pip install google-generativeai")
+
+
+def _load_genai():
+    """Import google.generativeai on first use (about a second; only generation needs it)."""
+    import google.generativeai as genai
+    return genai
 
 # Import DSA Engine
 try:
@@ -68,7 +89,7 @@ def configure_gemini(api_key: Optional[str] = None) -> None:
             "Set GEMINI_API_KEY environment variable or pass api_key parameter."
         )
     
-    genai.configure(api_key=api_key)
+    _load_genai().configure(api_key=api_key)
 
 
 def get_available_model() -> Tuple[str, genai.GenerativeModel]:
@@ -81,9 +102,11 @@ def get_available_model() -> Tuple[str, genai.GenerativeModel]:
     Raises:
         RuntimeError: If no suitable model is available
     """
+    genai = _load_genai()
     try:
         # Try Gemini first (prioritize latest/stable versions)
-        models = list(genai.list_models())
+        with stage("gemini_list_models"):
+            models = list(genai.list_models())
         
         # Priority order: flash/pro-latest > flash > pro > others
         gemini_models = [
@@ -133,6 +156,27 @@ def get_available_model() -> Tuple[str, genai.GenerativeModel]:
         raise RuntimeError(f"Failed to get available model: {str(e)}")
 
 
+def _generate_content(model: genai.GenerativeModel, prompt: str, deadline: Optional[float] = None):
+    """
+    Single Gemini round-trip (timed as the "gemini_generate" stage).
+    
+    With a deadline, the call is not started once it has passed and the HTTP
+    request to Gemini is given only the time that is left.
+    """
+    if deadline is None:
+        with stage("gemini_generate"):
+            return model.generate_content(prompt)
+    
+    check_deadline(deadline, "question generation")
+    try:
+        with stage("gemini_generate"):
+            return model.generate_content(prompt, request_options={"timeout": remaining(deadline)})
+    except Exception as e:
+        if expired(deadline):
+            raise DeadlineExceeded("Deadline exceeded during question generation") from e
+        raise
+
+
 def get_gemini_model(model_name: Optional[str] = None) -> genai.GenerativeModel:
     """
     Get model instance (auto-detects if model_name not provided).
@@ -145,7 +189,7 @@ def get_gemini_model(model_name: Optional[str] = None) -> genai.GenerativeModel:
         Configured model instance
     """
     if model_name:
-        return genai.GenerativeModel(model_name)
+        return _load_genai().GenerativeModel(model_name)
     else:
         _, model = get_available_model()
         return model
@@ -388,7 +432,8 @@ IMPORTANT:
 def generate_mcq_questions(
     config: Dict,
     model: genai.GenerativeModel,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    deadline: Optional[float] = None
 ) -> List[Dict]:
     """
     Generate MCQ questions using Gemini API.
@@ -397,6 +442,8 @@ def generate_mcq_questions(
         config: Assessment configuration dictionary
         model: Gemini model instance
         api_key: Optional API key (if not configured globally)
+        deadline: Optional request deadline (time.time()); once it passes the
+                  top-up calls stop and fewer questions may be returned
         
     Returns:
         List of MCQ question dictionaries
@@ -414,7 +461,7 @@ def generate_mcq_questions(
     )
     
     try:
-        response = model.generate_content(prompt)
+        response = _generate_content(model, prompt, deadline)
         response_text = response.text.strip()
         
         # Remove markdown code blocks if present
@@ -458,7 +505,10 @@ def generate_mcq_questions(
                 experience_level=config["experience_level"],
                 experience_years=config["experience_years"]
             )
-            additional_response = model.generate_content(additional_prompt)
+            try:
+                additional_response = _generate_content(model, additional_prompt, deadline)
+            except DeadlineExceeded:
+                break
             additional_text = additional_response.text.strip()
             if additional_text.startswith("```json"):
                 additional_text = additional_text[7:]
@@ -481,6 +531,8 @@ def generate_mcq_questions(
         
         return validated_questions[:mcq_config["question_count"]]
         
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         raise RuntimeError(f"Failed to generate MCQ questions: {str(e)}")
 
@@ -488,7 +540,8 @@ def generate_mcq_questions(
 def generate_subjective_questions(
     config: Dict,
     model: genai.GenerativeModel,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    deadline: Optional[float] = None
 ) -> List[Dict]:
     """
     Generate Subjective (SQL) questions using Gemini API.
@@ -497,6 +550,8 @@ def generate_subjective_questions(
         config: Assessment configuration dictionary
         model: Gemini model instance
         api_key: Optional API key (if not configured globally)
+        deadline: Optional request deadline (time.time()); once it passes the
+                  top-up calls stop and fewer questions may be returned
         
     Returns:
         List of subjective question dictionaries
@@ -515,7 +570,7 @@ def generate_subjective_questions(
     )
     
     try:
-        response = model.generate_content(prompt)
+        response = _generate_content(model, prompt, deadline)
         response_text = response.text.strip()
         
         # Remove markdown code blocks if present
@@ -555,7 +610,10 @@ def generate_subjective_questions(
                 experience_level=config["experience_level"],
                 experience_years=config["experience_years"]
             )
-            additional_response = model.generate_content(additional_prompt)
+            try:
+                additional_response = _generate_content(model, additional_prompt, deadline)
+            except DeadlineExceeded:
+                break
             additional_text = additional_response.text.strip()
             if additional_text.startswith("```json"):
                 additional_text = additional_text[7:]
@@ -578,6 +636,8 @@ def generate_subjective_questions(
         
         return validated_questions[:subjective_config["question_count"]]
         
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         raise RuntimeError(f"Failed to generate subjective questions: {str(e)}")
 
@@ -585,7 +645,8 @@ def generate_subjective_questions(
 def generate_coding_questions(
     config: Dict,
     model: genai.GenerativeModel,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    deadline: Optional[float] = None
 ) -> List[Dict]:
     """
     Generate Coding (DSA) questions using Gemini API.
@@ -594,6 +655,8 @@ def generate_coding_questions(
         config: Assessment configuration dictionary
         model: Gemini model instance
         api_key: Optional API key (if not configured globally)
+        deadline: Optional request deadline (time.time()); once it passes the
+                  top-up calls stop and fewer questions may be returned
         
     Returns:
         List of coding problem dictionaries
@@ -612,7 +675,7 @@ def generate_coding_questions(
     )
     
     try:
-        response = model.generate_content(prompt)
+        response = _generate_content(model, prompt, deadline)
         response_text = response.text.strip()
         
         # Remove markdown code blocks if present
@@ -645,6 +708,9 @@ def generate_coding_questions(
         # Integrate DSA Engine for test case generation
         if DSA_ENGINE_AVAILABLE:
             for problem in validated_problems:
+                if expired(deadline):
+                    # Remaining problems are returned without test cases
+                    break
                 try:
                     # Extract pattern and problem type from problem
                     pattern = problem.get("pattern", "Array + Hashing")
@@ -664,9 +730,9 @@ def generate_coding_questions(
                         # Attach test cases to problem
                         problem["public_tests"] = test_cases.get("public_tests", [])
                         problem["hidden_tests"] = test_cases.get("hidden_tests", [])
-                except Exception as e:
+                except Exception:
                     # If DSA engine fails, continue without test cases
-                    print(f"Warning: Could not generate test cases for problem: {str(e)}")
+                    logger.warning("Could not generate test cases for problem", exc_info=True)
         
         # Ensure exact count
         while len(validated_problems) < coding_config["question_count"]:
@@ -678,7 +744,10 @@ def generate_coding_questions(
                 experience_level=config["experience_level"],
                 experience_years=config["experience_years"]
             )
-            additional_response = model.generate_content(additional_prompt)
+            try:
+                additional_response = _generate_content(model, additional_prompt, deadline)
+            except DeadlineExceeded:
+                break
             additional_text = additional_response.text.strip()
             if additional_text.startswith("```json"):
                 additional_text = additional_text[7:]
@@ -701,6 +770,8 @@ def generate_coding_questions(
         
         return validated_problems[:coding_config["question_count"]]
         
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         raise RuntimeError(f"Failed to generate coding questions: {str(e)}")
 
@@ -712,7 +783,11 @@ def generate_coding_questions(
 def generate_assessment(
     config: Dict,
     api_key: Optional[str] = None,
-    model_name: Optional[str] = None
+    model_name: Optional[str] = None,
+    resume_text: Optional[str] = None,
+    job_description: Optional[str] = None,
+    on_section: Optional[Callable[[str, List[Dict]], None]] = None,
+    deadline: Optional[float] = None
 ) -> Dict:
     """
     Main function: Generate complete assessment with all sections.
@@ -746,6 +821,14 @@ def generate_assessment(
         api_key: Google AI API key (optional, can use GEMINI_API_KEY env var)
         model_name: Model name (e.g., "models/gemini-pro" or "models/text-bison-001")
                     If None, auto-detects available model
+        resume_text: Candidate resume (accepted from the API; not used by the prompts yet)
+        job_description: Recruiter JD (accepted from the API; not used by the prompts yet)
+        on_section: Optional callback(section_name, questions) invoked as soon as
+                    each section ("mcq", "subjective", "coding") is generated
+        deadline: Optional request deadline (time.time()). When it passes,
+                  generation stops and the sections done so far are returned
+                  (later sections empty) with "deadline_exceeded": True and
+                  "incomplete_sections": [names]
         
     Returns:
         Dictionary with generated questions in strict JSON format:
@@ -817,23 +900,39 @@ def generate_assessment(
     
     # Get model (auto-detect if not specified)
     if model_name:
-        model = genai.GenerativeModel(model_name)
+        model = _load_genai().GenerativeModel(model_name)
     else:
         detected_name, model = get_available_model()
         # Model auto-detected and ready to use
     
     # Generate questions for each section
+    section_generators = [
+        ("mcq", generate_mcq_questions),
+        ("subjective", generate_subjective_questions),
+        ("coding", generate_coding_questions)
+    ]
     try:
-        mcq_questions = generate_mcq_questions(config, model, api_key)
-        subjective_questions = generate_subjective_questions(config, model, api_key)
-        coding_problems = generate_coding_questions(config, model, api_key)
-        
-        # Build result
-        result = {
-            "mcq": mcq_questions,
-            "subjective": subjective_questions,
-            "coding": coding_problems
-        }
+        result = {}
+        for section, generate_section in section_generators:
+            if expired(deadline):
+                break
+            try:
+                result[section] = generate_section(config, model, api_key, deadline)
+            except DeadlineExceeded:
+                break
+            if on_section is not None:
+                on_section(section, result[section])
+        
+        incomplete = [
+            section for section, _ in section_generators
+            if len(result.get(section, [])) < config["sections"][section]["question_count"]
+        ]
+        if incomplete and expired(deadline):
+            # Partial result: keep the response shape, flag what is missing
+            for section, _ in section_generators:
+                result.setdefault(section, [])
+            result["deadline_exceeded"] = True
+            result["incomplete_sections"] = incomplete
         
         return result
         
@@ -0,0 +1,241 @@
+"""
+Assessment Jobs - asynchronous assessment generation
+/api/generate-assessment holds an HTTP worker for many sequential Gemini calls
+(often tens of seconds), and backend timeouts trigger retries that double the
+LLM spend. The job API returns a job id immediately, generates on the "io"
+worker pool, and lets the backend poll status with per-section partial results.
+
+Job lifecycle: queued -> running -> completed | failed
+
+Jobs live in a bounded SQLite store (AI_SERVICE_JOB_DB) shared by every
+worker process on the instance, so a poll can land on any gunicorn worker:
+finished jobs are evicted oldest-first beyond AI_SERVICE_JOB_STORE_SIZE or
+after AI_SERVICE_JOB_TTL seconds. A job is run by the process that accepted
+it; if that process exits first, the job is marked failed.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from request_tracing import propagate_span
+from service_pools import get_pool
+
+logger = logging.getLogger(__name__)
+
+MAX_STORED_JOBS = int(os.getenv("AI_SERVICE_JOB_STORE_SIZE", 200))
+MAX_ACTIVE_JOBS = int(os.getenv("AI_SERVICE_MAX_ACTIVE_JOBS", 32))
+JOB_TTL_SECONDS = float(os.getenv("AI_SERVICE_JOB_TTL", 3600))
+# Must be on a filesystem shared by all workers (the default is per instance)
+JOB_DB_PATH = os.getenv("AI_SERVICE_JOB_DB") or os.path.join(tempfile.gettempdir(), "ai-assessment-jobs.sqlite3")
+
+SECTIONS = ["mcq", "subjective", "coding"]
+FINISHED_STATUSES = ("completed", "failed")
+
+
+class JobStoreFull(Exception):
+    """Raised when too many jobs are queued or running."""
+
+
+class JobStore:
+    """
+    Bounded store of generation jobs, shared by every process using the same file.
+
+    Each job is one row holding its JSON snapshot; status, owner and timestamps
+    are columns so eviction and counting don't decode the snapshots.
+
+    Args:
+        max_jobs: Finished jobs kept for polling (oldest evicted first)
+        max_active: Queued + running jobs allowed at once (across all processes)
+        ttl_seconds: How long a finished job stays pollable
+        path: SQLite database file
+    """
+
+    def __init__(self, max_jobs: int = MAX_STORED_JOBS, max_active: int = MAX_ACTIVE_JOBS,
+                 ttl_seconds: float = JOB_TTL_SECONDS, path: str = JOB_DB_PATH):
+        self.max_jobs = max_jobs
+        self.max_active = max_active
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """This process's connection (caller holds the lock; never reused across fork)."""
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "owner_pid INTEGER NOT NULL, created_at REAL NOT NULL, finished_at REAL, job TEXT NOT NULL)"
+            )
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _process_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Fail orphaned jobs, drop expired finished jobs, then the oldest beyond capacity (in a transaction)."""
+        now = time.time()
+        active = conn.execute(
+            "SELECT job_id, owner_pid, job FROM jobs WHERE status NOT IN (?, ?)", FINISHED_STATUSES
+        ).fetchall()
+        for job_id, owner_pid, snapshot in active:
+            if not self._process_alive(owner_pid):
+                job = json.loads(snapshot)
+                job.update(status="failed", error="Worker exited before the job finished", finished_at=now)
+                self._write(conn, job)
+        conn.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?", (*FINISHED_STATUSES, now - self.ttl_seconds)
+        )
+        conn.execute(
+            "DELETE FROM jobs WHERE job_id IN (SELECT job_id FROM jobs WHERE status IN (?, ?) "
+            "ORDER BY created_at DESC LIMIT -1 OFFSET ?)", (*FINISHED_STATUSES, self.max_jobs)
+        )
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, job: Dict) -> None:
+        conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, job = ? WHERE job_id = ?",
+            (job["status"], job["finished_at"], json.dumps(job, default=str), job["job_id"])
+        )
+
+    def _modify(self, job_id: str, change: Callable[[Dict], None]) -> None:
+        """Read-modify-write one job atomically across processes."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT job FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+                if row is not None:
+                    job = json.loads(row[0])
+                    change(job)
+                    self._write(conn, job)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def create(self) -> str:
+        """Register a new queued job and return its id."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._evict(conn)
+                active = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status NOT IN (?, ?)", FINISHED_STATUSES
+                ).fetchone()[0]
+                if active >= self.max_active:
+                    raise JobStoreFull(f"Too many active jobs (max {self.max_active})")
+                job_id = uuid.uuid4().hex
+                job = {
+                    "job_id": job_id,
+                    "status": "queued",
+                    "created_at": time.time(),
+                    "started_at": None,
+                    "finished_at": None,
+                    "sections_completed": [],
+                    "result": {},
+                    "error": None
+                }
+                conn.execute(
+                    "INSERT INTO jobs (job_id, status, owner_pid, created_at, job) VALUES (?, ?, ?, ?, ?)",
+                    (job_id, job["status"], os.getpid(), job["created_at"], json.dumps(job))
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return job_id
+
+    def update(self, job_id: str, **fields) -> None:
+        self._modify(job_id, lambda job: job.update(fields))
+
+    def add_section(self, job_id: str, section: str, questions: List[Dict]) -> None:
+        """Publish one generated section (partial result)."""
+        def add(job):
+            job["result"][section] = questions
+            job["sections_completed"].append(section)
+        self._modify(job_id, add)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Snapshot of a job (safe to serialize while the job keeps running)."""
+        with self._lock:
+            row = self._connection().execute("SELECT job FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in ("queued", "running", "completed", "failed")}
+        counts.update(rows)
+        return counts
+
+
+# Global job store (one connection per service process, one database per instance)
+_job_store: Optional[JobStore] = None
+_job_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    global _job_store
+    with _job_store_lock:
+        if _job_store is None:
+            _job_store = JobStore()
+        return _job_store
+
+
+def _run_generation_job(store: JobStore, job_id: str, generate: Callable, config: Dict, kwargs: Dict) -> None:
+    store.update(job_id, status="running", started_at=time.time())
+    try:
+        result = generate(
+            config,
+            on_section=lambda section, questions: store.add_section(job_id, section, questions),
+            **kwargs
+        )
+        if isinstance(result, dict) and result.get("deadline_exceeded"):
+            # Sections finished before the deadline stay in the job's result
+            store.update(job_id, status="failed", error="Deadline exceeded", finished_at=time.time())
+        else:
+            store.update(job_id, status="completed", finished_at=time.time())
+    except Exception as e:
+        logger.exception("Assessment job failed", extra={"job_id": job_id})
+        store.update(job_id, status="failed", error=str(e), finished_at=time.time())
+
+
+def submit_generation_job(generate: Callable, config: Dict, **kwargs) -> str:
+    """
+    Start generating an assessment in the background.
+
+    Args:
+        generate: generate_assessment (must accept an on_section callback)
+        config: Assessment configuration
+        **kwargs: Extra generate() arguments (api_key, resume_text, job_description, deadline)
+
+    Returns:
+        Job id to poll with get_job_store().get()
+
+    Raises:
+        JobStoreFull: If too many jobs are already queued or running
+    """
+    store = get_job_store()
+    job_id = store.create()
+    # The job's Gemini calls are traced under the request that queued it
+    get_pool("io").submit(propagate_span(_run_generation_job), store, job_id, generate, config, kwargs)
+    return job_id
@@ -6,6 +6,8 @@ Calculates scores for MCQ, SQL, and DSA questions
 import json
 from typing import Dict, List, Optional, Any
 
+from request_deadline import expired
+
 try:
     from sql_verifier import verify_sql_answer
     SQL_VERIFIER_AVAILABLE = True
@@ -21,6 +23,17 @@ except ImportError:
     print("Warning: code_executor not available")
 
 
+def _skipped_detail(q_id: str) -> Dict[str, Any]:
+    """Detail for a question not graded because the request deadline passed."""
+    return {
+        "question_id": q_id,
+        "correct": False,
+        "score": 0.0,
+        "message": "Skipped: deadline exceeded",
+        "skipped": True
+    }
+
+
 def score_mcq_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[str, Any]:
     """
     Score MCQ questions.
@@ -80,13 +93,19 @@ def score_mcq_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[
     }
 
 
-def score_sql_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[str, Any]:
+def score_sql_questions(
+    questions: List[Dict],
+    answers: Dict[str, Any],
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
     """
     Score SQL questions.
     
     Args:
         questions: List of SQL question dictionaries
         answers: Dictionary mapping question ID to SQL query
+        deadline: Optional request deadline (time.time()); questions left when
+                  it passes are skipped and score 0
         
     Returns:
         Dictionary with:
@@ -95,6 +114,7 @@ def score_sql_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[
         - incorrect: int
         - score: float (0.0 to 1.0)
         - details: list of question results
+        - deadline_exceeded: bool
     """
     if not questions or not SQL_VERIFIER_AVAILABLE:
         return {
@@ -102,16 +122,23 @@ def score_sql_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[
             "correct": 0,
             "incorrect": len(questions) if questions else 0,
             "score": 0.0,
-            "details": []
+            "details": [],
+            "deadline_exceeded": False
         }
     
     correct = 0
     details = []
+    deadline_exceeded = False
     
     for q in questions:
         q_id = str(q.get("id", ""))
         user_query = answers.get(q_id, "")
         
+        if deadline_exceeded or expired(deadline):
+            deadline_exceeded = True
+            details.append(_skipped_detail(q_id))
+            continue
+        
         # Extract verification data from question
         schema = q.get("schema")
         test_data = q.get("test_data")
@@ -133,11 +160,14 @@ def score_sql_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[
             expected_query=expected_query,
             schema=schema,
             test_data=test_data,
-            expected_result=expected_result
+            expected_result=expected_result,
+            deadline=deadline
         )
         
         if verification["correct"]:
             correct += 1
+        if verification.get("deadline_exceeded"):
+            deadline_exceeded = True
         
         details.append({
             "question_id": q_id,
@@ -156,17 +186,24 @@ def score_sql_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[
         "correct": correct,
         "incorrect": total - correct,
         "score": score,
-        "details": details
+        "details": details,
+        "deadline_exceeded": deadline_exceeded
     }
 
 
-def score_dsa_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[str, Any]:
+def score_dsa_questions(
+    questions: List[Dict],
+    answers: Dict[str, Any],
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
     """
     Score DSA questions.
     
     Args:
         questions: List of DSA question dictionaries
         answers: Dictionary mapping question ID to code solution
+        deadline: Optional request deadline (time.time()); questions left when
+                  it passes are skipped and score 0
         
     Returns:
         Dictionary with:
@@ -175,6 +212,7 @@ def score_dsa_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[
         - incorrect: int
         - score: float (0.0 to 1.0)
         - details: list of question results
+        - deadline_exceeded: bool
     """
     if not questions or not CODE_EXECUTOR_AVAILABLE:
         return {
@@ -182,16 +220,23 @@ def score_dsa_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[
             "correct": 0,
             "incorrect": len(questions) if questions else 0,
             "score": 0.0,
-            "details": []
+            "details": [],
+            "deadline_exceeded": False
         }
     
     correct = 0
     details = []
+    deadline_exceeded = False
     
     for q in questions:
         q_id = str(q.get("id", ""))
         user_code = answers.get(q_id, "")
         
+        if deadline_exceeded or expired(deadline):
+            deadline_exceeded = True
+            details.append(_skipped_detail(q_id))
+            continue
+        
         if not user_code:
             details.append({
                 "question_id": q_id,
@@ -221,8 +266,11 @@ def score_dsa_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[
         evaluation = evaluate_dsa_solution(
             code=user_code,
             test_cases=all_tests,
-            language=language
+            language=language,
+            deadline=deadline
         )
+        if evaluation.get("deadline_exceeded"):
+            deadline_exceeded = True
         
         # Consider correct if score >= 0.8 (80% of test cases passed)
         is_correct = evaluation["score"] >= 0.8
@@ -248,7 +296,8 @@ def score_dsa_questions(questions: List[Dict], answers: Dict[str, Any]) -> Dict[
         "correct": correct,
         "incorrect": total - correct,
         "score": score,
-        "details": details
+        "details": details,
+        "deadline_exceeded": deadline_exceeded
     }
 
 
@@ -326,13 +375,20 @@ def calculate_overall_score(
     }
 
 
-def score_assessment(questions: List[Dict], answers: Dict[str, Any]) -> Dict[str, Any]:
+def score_assessment(
+    questions: List[Dict],
+    answers: Dict[str, Any],
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
     """
     Score complete assessment.
     
     Args:
         questions: List of all questions (MCQ, SQL, DSA)
         answers: Dictionary mapping question ID to answer
+        deadline: Optional request deadline (time.time()). SQL/DSA grading
+                  stops when it passes; ungraded questions score 0 and the
+                  result is marked deadline_exceeded (a partial score)
         
     Returns:
         Complete scoring result with overall score and breakdown
@@ -344,8 +400,8 @@ def score_assessment(questions: List[Dict], answers: Dict[str, Any]) -> Dict[str
     
     # Score each section
     mcq_result = score_mcq_questions(mcq_questions, answers)
-    sql_result = score_sql_questions(sql_questions, answers)
-    dsa_result = score_dsa_questions(dsa_questions, answers)
+    sql_result = score_sql_questions(sql_questions, answers, deadline=deadline)
+    dsa_result = score_dsa_questions(dsa_questions, answers, deadline=deadline)
     
     # Calculate overall score
     overall = calculate_overall_score(mcq_result, sql_result, dsa_result)
@@ -355,7 +411,8 @@ def score_assessment(questions: List[Dict], answers: Dict[str, Any]) -> Dict[str
         "mcq": mcq_result,
         "sql": sql_result,
         "dsa": dsa_result,
-        "breakdown": overall["breakdown"]
+        "breakdown": overall["breakdown"],
+        "deadline_exceeded": sql_result["deadline_exceeded"] or dsa_result["deadline_exceeded"]
     }
 
 
@@ -10,8 +10,22 @@ import json
 from typing import Dict, List, Optional, Any
 import sys
 
+from request_deadline import clamp_timeout, expired
+from service_metrics import stage
 
-def execute_code(code: str, language: str = "python", timeout: int = 10) -> Dict[str, Any]:
+
+def _run_subprocess(args: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run() timed as the "code_execution_subprocess" stage."""
+    with stage("code_execution_subprocess"):
+        return subprocess.run(args, **kwargs)
+
+
+def execute_code(
+    code: str,
+    language: str = "python",
+    timeout: int = 10,
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
     """
     Execute code and return output.
     
@@ -19,6 +33,8 @@ def execute_code(code: str, language: str = "python", timeout: int = 10) -> Dict
         code: Source code to execute
         language: Programming language (python, javascript, java, cpp)
         timeout: Execution timeout in seconds
+        deadline: Optional request deadline (time.time()); the timeout is
+                  shortened so the child process is killed by then
         
     Returns:
         Dictionary with:
@@ -31,6 +47,16 @@ def execute_code(code: str, language: str = "python", timeout: int = 10) -> Dict
     import time
     
     start_time = time.time()
+    timeout = clamp_timeout(timeout, deadline)
+    if timeout <= 0:
+        return {
+            "success": False,
+            "output": "",
+            "error": "Deadline exceeded before execution",
+            "exit_code": -1,
+            "execution_time": 0.0,
+            "deadline_exceeded": True
+        }
     
     # Create temporary file
     ext_map = {
@@ -50,14 +76,14 @@ def execute_code(code: str, language: str = "python", timeout: int = 10) -> Dict
     try:
         # Execute based on language
         if language.lower() == "python":
-            result = subprocess.run(
+            result = _run_subprocess(
                 [sys.executable, temp_file],
                 capture_output=True,
                 text=True,
                 timeout=timeout
             )
         elif language.lower() == "javascript":
-            result = subprocess.run(
+            result = _run_subprocess(
                 ["node", temp_file],
                 capture_output=True,
                 text=True,
@@ -65,7 +91,7 @@ def execute_code(code: str, language: str = "python", timeout: int = 10) -> Dict
             )
         elif language.lower() == "java":
             # Compile first
-            compile_result = subprocess.run(
+            compile_result = _run_subprocess(
                 ["javac", temp_file],
                 capture_output=True,
                 text=True,
@@ -82,11 +108,11 @@ def execute_code(code: str, language: str = "python", timeout: int = 10) -> Dict
             # Run compiled class
             class_name = os.path.splitext(os.path.basename(temp_file))[0]
             class_dir = os.path.dirname(temp_file)
-            result = subprocess.run(
+            result = _run_subprocess(
                 ["java", "-cp", class_dir, class_name],
                 capture_output=True,
                 text=True,
-                timeout=timeout,
+                timeout=max(0.001, clamp_timeout(timeout, deadline)),
                 cwd=class_dir
             )
         else:
@@ -109,6 +135,16 @@ def execute_code(code: str, language: str = "python", timeout: int = 10) -> Dict
         }
         
     except subprocess.TimeoutExpired:
+        # subprocess.run() kills the child before raising
+        if expired(deadline):
+            return {
+                "success": False,
+                "output": "",
+                "error": "Deadline exceeded during execution",
+                "exit_code": -1,
+                "execution_time": time.time() - start_time,
+                "deadline_exceeded": True
+            }
         return {
             "success": False,
             "output": "",
@@ -137,7 +173,12 @@ def execute_code(code: str, language: str = "python", timeout: int = 10) -> Dict
             pass
 
 
-def run_test_case(code: str, test_case: Dict[str, Any], language: str = "python") -> Dict[str, Any]:
+def run_test_case(
+    code: str,
+    test_case: Dict[str, Any],
+    language: str = "python",
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
     """
     Run a single test case against code.
     
@@ -148,6 +189,7 @@ def run_test_case(code: str, test_case: Dict[str, Any], language: str = "python"
             - expected_output: expected output
             - function_name: function name to call (optional)
         language: Programming language
+        deadline: Optional request deadline (time.time())
         
     Returns:
         Dictionary with:
@@ -191,16 +233,19 @@ except Exception as e:
         # For other languages, use simpler approach
         test_code = code
     
-    execution = execute_code(test_code, language, timeout=5)
+    execution = execute_code(test_code, language, timeout=5, deadline=deadline)
     
     if not execution["success"]:
-        return {
+        result = {
             "passed": False,
             "input": test_case.get("input"),
             "expected": test_case.get("expected_output"),
             "actual": None,
             "error": execution["error"]
         }
+        if execution.get("deadline_exceeded"):
+            result["deadline_exceeded"] = True
+        return result
     
     # Parse output
     try:
@@ -223,15 +268,20 @@ except Exception as e:
 def evaluate_dsa_solution(
     code: str,
     test_cases: List[Dict[str, Any]],
-    language: str = "python"
+    language: str = "python",
+    deadline: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Evaluate a DSA solution against multiple test cases.
     
+    Once the deadline passes, the running test is killed and the remaining
+    ones are reported as skipped (counted as failed); results so far are kept.
+    
     Args:
         code: Source code solution
         test_cases: List of test case dictionaries
         language: Programming language
+        deadline: Optional request deadline (time.time())
         
     Returns:
         Dictionary with:
@@ -240,6 +290,7 @@ def evaluate_dsa_solution(
         - failed_tests: int
         - score: float (0.0 to 1.0)
         - results: list of individual test results
+        - deadline_exceeded: bool (True if some tests were cut short or skipped)
     """
     if not test_cases:
         return {
@@ -247,20 +298,37 @@ def evaluate_dsa_solution(
             "passed_tests": 0,
             "failed_tests": 0,
             "score": 0.0,
-            "results": []
+            "results": [],
+            "deadline_exceeded": False
         }
     
     results = []
     passed = 0
+    deadline_exceeded = False
     
     for i, test_case in enumerate(test_cases):
-        result = run_test_case(code, test_case, language)
+        if deadline_exceeded or expired(deadline):
+            deadline_exceeded = True
+            results.append({
+                "test_case": i + 1,
+                "passed": False,
+                "input": test_case.get("input"),
+                "expected": test_case.get("expected_output"),
+                "actual": None,
+                "error": "Skipped: deadline exceeded",
+                "skipped": True
+            })
+            continue
+        
+        result = run_test_case(code, test_case, language, deadline=deadline)
         results.append({
             "test_case": i + 1,
             **result
         })
         if result.get("passed", False):
             passed += 1
+        if result.get("deadline_exceeded"):
+            deadline_exceeded = True
     
     total = len(test_cases)
     score = passed / total if total > 0 else 0.0
@@ -270,7 +338,8 @@ def evaluate_dsa_solution(
         "passed_tests": passed,
         "failed_tests": total - passed,
         "score": score,
-        "results": results
+        "results": results,
+        "deadline_exceeded": deadline_exceeded
     }
 
 
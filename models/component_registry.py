@@ -0,0 +1,305 @@
+"""
+Component Registry - lazily loaded heavy components with a memory governor
+Heavy in-process components (the MPNet sentence-transformer, ~420 MB resident)
+are registered here with a loader and an unloader instead of being held for
+the life of the process. They are loaded on first use; every use updates
+their last-use time. A governor thread then unloads:
+
+- idle components, unused for AI_SERVICE_COMPONENT_IDLE_SECONDS
+- least recently used components while the process RSS is above
+  AI_SERVICE_MEMORY_BUDGET_MB (also checked before a load: a component whose
+  last measured size would not fit evicts others first). Nothing is evicted
+  unless unloading can actually bring RSS under the budget: when the rest of
+  the process alone is over it, unloading would only make every request
+  reload the model.
+
+so an instance that only serves /api/execute-code gives the model's memory
+back, and the next request that needs it loads it again (model load time).
+
+The governor thread starts on first use (get() or touch()) in each process.
+A gunicorn master that preloads components for its workers calls
+suspend_governor() first: the master never unloads the copy-on-write
+copy that workers forked later share, and each worker starts its own
+governor after fork.
+
+Unloading only drops the registry's reference: a request still using the
+component keeps it alive until it finishes, so unloading is always safe.
+After an unload the garbage collector runs and glibc is asked to return free
+heap pages to the OS (malloc_trim), otherwise RSS would not go down.
+
+Loads, unloads (by reason) and resident sizes are exported at /metrics:
+    ai_service_component_loads_total{component}
+    ai_service_component_unloads_total{component, reason=idle|pressure|manual}
+    ai_service_component_resident_bytes{component}
+    ai_service_component_idle_seconds{component}
+
+Environment:
+    AI_SERVICE_MEMORY_BUDGET_MB          - RSS budget for the process (default: off)
+    AI_SERVICE_COMPONENT_IDLE_SECONDS    - unload after this long unused (default: off)
+    AI_SERVICE_GOVERNOR_INTERVAL         - seconds between governor checks (default: 30)
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from memory_report import read_rss
+from service_metrics import MODEL_LOAD_SECONDS, Counter, Gauge, register_collector
+
+logger = logging.getLogger(__name__)
+
+MEMORY_BUDGET_BYTES = int(float(os.getenv("AI_SERVICE_MEMORY_BUDGET_MB", 0)) * 1024 * 1024)
+IDLE_UNLOAD_SECONDS = float(os.getenv("AI_SERVICE_COMPONENT_IDLE_SECONDS", 0))
+GOVERNOR_INTERVAL_SECONDS = float(os.getenv("AI_SERVICE_GOVERNOR_INTERVAL", 30))
+
+COMPONENT_LOADS_TOTAL = Counter(
+    "ai_service_component_loads_total", "Heavy component loads (first use or reload after unload)",
+    ("component",)
+)
+COMPONENT_UNLOADS_TOTAL = Counter(
+    "ai_service_component_unloads_total", "Heavy component unloads by reason (idle, pressure, manual)",
+    ("component", "reason")
+)
+COMPONENT_RESIDENT_BYTES = Gauge(
+    "ai_service_component_resident_bytes", "Measured size of loaded components (0 when unloaded)",
+    ("component",)
+)
+COMPONENT_IDLE_SECONDS = Gauge(
+    "ai_service_component_idle_seconds", "Seconds since a loaded component was last used",
+    ("component",)
+)
+
+
+def _rss_bytes() -> int:
+    return read_rss().get("rss_kb", 0) * 1024
+
+
+def _release_free_memory() -> None:
+    """Collect garbage and hand free heap pages back to the OS (glibc only)."""
+    gc.collect()
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        return
+    try:
+        ctypes.CDLL(libc_name).malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class Component:
+    """One registered component and its bookkeeping."""
+
+    def __init__(self, name: str, load: Callable[[], Any], unload: Optional[Callable[[Any], None]],
+                 size: Optional[Callable[[Any], Optional[int]]]):
+        self.name = name
+        self.load = load
+        self.unload = unload
+        self.size = size
+        self.instance: Any = None
+        self.size_bytes = 0
+        self.last_used = 0.0
+        self.loads = 0
+        self.unloads = 0
+        self.last_load_seconds: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+class ComponentRegistry:
+    """
+    Lazily loaded components with LRU unloading under a memory budget.
+
+    Args:
+        budget_bytes: Process RSS budget (0 = no budget)
+        idle_seconds: Unload components unused for this long (0 = never)
+        interval: Seconds between governor checks
+    """
+
+    def __init__(self, budget_bytes: int = MEMORY_BUDGET_BYTES, idle_seconds: float = IDLE_UNLOAD_SECONDS,
+                 interval: float = GOVERNOR_INTERVAL_SECONDS):
+        self.budget_bytes = budget_bytes
+        self.idle_seconds = idle_seconds
+        self.interval = interval
+        self._components: Dict[str, Component] = {}
+        self._governor_lock = threading.Lock()
+        self._governor_pid: Optional[int] = None
+        self._governor_suspended_pid: Optional[int] = None
+
+    def register(self, name: str, load: Callable[[], Any], unload: Optional[Callable[[Any], None]] = None,
+                 size: Optional[Callable[[Any], Optional[int]]] = None) -> None:
+        """
+        Register a component (not loaded until first get()).
+
+        Args:
+            name: Component name (metrics label)
+            load: Returns the loaded instance (None if it cannot be loaded)
+            unload: Releases references held outside the registry (optional)
+            size: Bytes held by an instance; None falls back to the RSS growth
+                  measured across the load
+        """
+        self._components[name] = Component(name, load, unload, size)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._components
+
+    # -- use -----------------------------------------------------------------
+
+    def get(self, name: str) -> Any:
+        """The component's instance, loaded on first use (exceptions from the loader propagate)."""
+        component = self._components[name]
+        self.ensure_governor()
+        component.last_used = time.monotonic()
+        instance = component.instance
+        if instance is not None:
+            return instance
+
+        with component.lock:
+            if component.instance is None:
+                self._make_room(component)
+                rss_before = _rss_bytes()
+                start = time.perf_counter()
+                instance = component.load()
+                if instance is None:
+                    return None
+                component.last_load_seconds = time.perf_counter() - start
+                measured = component.size(instance) if component.size is not None else None
+                component.size_bytes = measured if measured is not None else max(0, _rss_bytes() - rss_before)
+                component.instance = instance
+                component.loads += 1
+                component.last_used = time.monotonic()
+                COMPONENT_LOADS_TOTAL.inc(name)
+                MODEL_LOAD_SECONDS.set(component.last_load_seconds, name)
+                COMPONENT_RESIDENT_BYTES.set(component.size_bytes, name)
+            return component.instance
+
+    def touch(self, name: str) -> None:
+        """Record a use of a component obtained without get() (fast paths)."""
+        component = self._components.get(name)
+        if component is not None:
+            component.last_used = time.monotonic()
+            self.ensure_governor()
+
+    def unload(self, name: str, reason: str = "manual") -> bool:
+        """Drop a loaded component; returns whether it was loaded."""
+        component = self._components[name]
+        with component.lock:
+            instance = component.instance
+            if instance is None:
+                return False
+            component.instance = None
+            if component.unload is not None:
+                component.unload(instance)
+            component.unloads += 1
+            COMPONENT_UNLOADS_TOTAL.inc(name, reason)
+            COMPONENT_RESIDENT_BYTES.set(0, name)
+        del instance
+        _release_free_memory()
+        logger.info("Unloaded component", extra={"component": name, "reason": reason})
+        return True
+
+    # -- governor ------------------------------------------------------------
+
+    def _loaded_lru(self) -> List[Component]:
+        loaded = [c for c in self._components.values() if c.instance is not None]
+        return sorted(loaded, key=lambda c: c.last_used)
+
+    def _pressure_victims(self, excess: int, incoming: Optional[Component] = None) -> List[Component]:
+        """
+        Least recently used components whose sizes add up to at least excess
+        bytes, or [] when unloading all of them would still leave RSS over budget.
+        """
+        victims, freed = [], 0
+        for component in self._loaded_lru():
+            if freed >= excess:
+                break
+            if component is not incoming:
+                victims.append(component)
+                freed += component.size_bytes
+        return victims if freed >= excess else []
+
+    def _make_room(self, incoming: Component) -> None:
+        """Before a load: evict LRU components if the incoming one's last size would break the budget."""
+        if not self.budget_bytes or not incoming.size_bytes:
+            return
+        excess = _rss_bytes() + incoming.size_bytes - self.budget_bytes
+        if excess > 0:
+            for component in self._pressure_victims(excess, incoming):
+                self.unload(component.name, "pressure")
+
+    def enforce(self) -> List[str]:
+        """One governor pass (idle, then memory pressure); returns the unloaded names."""
+        unloaded = []
+        now = time.monotonic()
+        if self.idle_seconds:
+            for component in self._loaded_lru():
+                if now - component.last_used >= self.idle_seconds and self.unload(component.name, "idle"):
+                    unloaded.append(component.name)
+        if self.budget_bytes:
+            excess = _rss_bytes() - self.budget_bytes
+            if excess > 0:
+                for component in self._pressure_victims(excess):
+                    if self.unload(component.name, "pressure"):
+                        unloaded.append(component.name)
+        return unloaded
+
+    def suspend_governor(self) -> None:
+        """Never start a governor in this process (a pre-fork master; forked children are unaffected)."""
+        self._governor_suspended_pid = os.getpid()
+
+    def ensure_governor(self) -> None:
+        """Start the governor thread once per process (gunicorn workers start their own after fork)."""
+        pid = os.getpid()
+        if self._governor_pid == pid or (not self.budget_bytes and not self.idle_seconds):
+            return
+        with self._governor_lock:
+            if self._governor_pid != pid and self._governor_suspended_pid != pid:
+                self._governor_pid = pid
+                threading.Thread(target=self._govern, name="memory-governor", daemon=True).start()
+
+    def _govern(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.enforce()
+            except Exception:
+                logger.exception("Memory governor error")
+
+    # -- reporting -----------------------------------------------------------
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        return {
+            name: {
+                "loaded": c.instance is not None,
+                "size_kb": round(c.size_bytes / 1024, 1),
+                "idle_seconds": round(now - c.last_used, 1) if c.last_used else None,
+                "loads": c.loads,
+                "unloads": c.unloads,
+                "last_load_seconds": round(c.last_load_seconds, 2) if c.last_load_seconds is not None else None
+            }
+            for name, c in self._components.items()
+        }
+
+    def refresh_metrics(self) -> None:
+        now = time.monotonic()
+        for component in self._components.values():
+            if component.instance is not None:
+                COMPONENT_IDLE_SECONDS.set(now - component.last_used, component.name)
+
+
+# Global registry (one per service process)
+_registry: Optional[ComponentRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_component_registry() -> ComponentRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ComponentRegistry()
+            register_collector(_registry.refresh_metrics)
+        return _registry
@@ -8,6 +8,8 @@ import os
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
+from service_metrics import stage
+
 # Import reference solvers
 from .reference_solvers import get_reference_solver
 
@@ -114,7 +116,8 @@ Return ONLY valid JSON, no explanations.
 """
     
     try:
-        response = model.generate_content(prompt)
+        with stage("gemini_generate"):
+            response = model.generate_content(prompt)
         response_text = response.text.strip()
         
         # Clean JSON (remove markdown code blocks if present)
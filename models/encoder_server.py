@@ -0,0 +1,368 @@
+"""
+Shared Encoder Server - one MPNet copy for all service workers
+Owns the sentence-transformers model in a single process and serves embeddings
+to every ai_service worker over a Unix domain socket.
+
+Requests from all connected workers are queued and encoded together (cross-worker
+batching): the batcher waits up to AI_ENCODER_BATCH_WINDOW_MS after the first
+request for more texts, up to AI_ENCODER_MAX_BATCH texts per model.encode call.
+
+Wire protocol (every frame is a 4-byte big-endian length followed by the payload):
+    request:  JSON {"texts": [str], "normalize": bool}
+    response: JSON header {"count": int, "dim": int, "dtype": "float32"} or {"error": str},
+              then (on success) a second frame with count * dim little-endian float32 values
+
+Run:
+    python encoder_server.py --socket /tmp/ai-encoder.sock
+
+Workers use it when AI_ENCODER_SOCKET is set (see ai_service.get_or_load_model).
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+_LENGTH = struct.Struct(">I")
+# Refuse absurd frames (a corrupt length prefix must not trigger a huge allocation)
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+# Clients split larger encode() calls so request and response frames stay under the limit
+MAX_TEXTS_PER_REQUEST = 4096
+
+DEFAULT_SOCKET_PATH = "/tmp/ai-encoder.sock"
+DEFAULT_MAX_BATCH = int(os.getenv("AI_ENCODER_MAX_BATCH", 64))
+DEFAULT_BATCH_WINDOW_MS = float(os.getenv("AI_ENCODER_BATCH_WINDOW_MS", 5))
+
+
+# ============================================================================
+# FRAMING
+# ============================================================================
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """Read exactly `size` bytes or raise ConnectionError."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("Encoder socket closed")
+        received += n
+    return bytes(buffer)
+
+
+def send_frame(sock: socket.socket, payload: bytes) -> None:
+    """Send one length-prefixed frame."""
+    sock.sendall(_LENGTH.pack(len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> bytes:
+    """Receive one length-prefixed frame."""
+    (size,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    if size > MAX_FRAME_BYTES:
+        raise ConnectionError(f"Frame too large: {size} bytes")
+    return _recv_exact(sock, size)
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class _PendingRequest:
+    """One worker request waiting for the batcher."""
+
+    def __init__(self, texts: List[str], normalize: bool):
+        self.texts = texts
+        self.normalize = normalize
+        self.result: Optional[np.ndarray] = None
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+
+
+class EncoderServer:
+    """
+    Unix-socket encoder server with cross-connection batching.
+
+    Args:
+        model: Object with a SentenceTransformer-compatible encode() method
+        socket_path: Filesystem path of the Unix domain socket
+        max_batch: Maximum texts per model.encode call
+        batch_window_ms: How long to wait for more requests after the first one
+    """
+
+    def __init__(
+        self,
+        model,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        batch_window_ms: float = DEFAULT_BATCH_WINDOW_MS
+    ):
+        self.model = model
+        self.socket_path = socket_path
+        self.max_batch = max_batch
+        self.batch_window = batch_window_ms / 1000.0
+        self._queue: "queue.Queue[_PendingRequest]" = queue.Queue()
+        self._stop = threading.Event()
+        self._listener: Optional[socket.socket] = None
+        self.batches_encoded = 0
+        self.texts_encoded = 0
+
+    def _collect_batch(self) -> List[_PendingRequest]:
+        """Block for the first request, then gather more within the batch window."""
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        total = len(first.texts)
+        # The window bounds the whole batch, not the gap between arrivals
+        deadline = time.monotonic() + self.batch_window
+        while total < self.max_batch:
+            wait = deadline - time.monotonic()
+            if wait <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+            total += len(item.texts)
+        return batch
+
+    def _encode_batch(self, batch: List[_PendingRequest]) -> None:
+        """Encode all texts of a batch (one encode call per normalize flag)."""
+        for normalize in (True, False):
+            group = [req for req in batch if req.normalize == normalize]
+            if not group:
+                continue
+            texts = [text for req in group for text in req.texts]
+            try:
+                vectors = np.asarray(
+                    self.model.encode(
+                        texts,
+                        batch_size=self.max_batch,
+                        show_progress_bar=False,
+                        normalize_embeddings=normalize
+                    ),
+                    dtype=np.float32
+                )
+                offset = 0
+                for req in group:
+                    req.result = vectors[offset:offset + len(req.texts)]
+                    offset += len(req.texts)
+                self.batches_encoded += 1
+                self.texts_encoded += len(texts)
+            except Exception as e:
+                for req in group:
+                    req.error = f"Encoding failed: {str(e)}"
+            for req in group:
+                req.done.set()
+
+    def _batch_loop(self) -> None:
+        while not self._stop.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                break
+            self._encode_batch(batch)
+
+    def _handle_connection(self, conn: socket.socket) -> None:
+        """Serve requests from one worker until it disconnects."""
+        with conn:
+            while not self._stop.is_set():
+                try:
+                    request = json.loads(recv_frame(conn))
+                except (ConnectionError, OSError):
+                    return
+                except ValueError:
+                    send_frame(conn, json.dumps({"error": "Invalid request"}).encode())
+                    continue
+                if not isinstance(request, dict):
+                    send_frame(conn, json.dumps({"error": "Request must be a JSON object"}).encode())
+                    continue
+
+                texts = request.get("texts")
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    send_frame(conn, json.dumps({"error": "texts must be a list of strings"}).encode())
+                    continue
+
+                pending = _PendingRequest(texts, bool(request.get("normalize", False)))
+                if texts:
+                    self._queue.put(pending)
+                    pending.done.wait()
+                else:
+                    pending.result = np.zeros((0, 0), dtype=np.float32)
+
+                try:
+                    if pending.error:
+                        send_frame(conn, json.dumps({"error": pending.error}).encode())
+                        continue
+                    vectors = np.ascontiguousarray(pending.result, dtype="<f4")
+                    header = {"count": vectors.shape[0], "dim": vectors.shape[1], "dtype": "float32"}
+                    send_frame(conn, json.dumps(header).encode())
+                    send_frame(conn, vectors.tobytes())
+                except OSError:
+                    return
+
+    def serve_forever(self) -> None:
+        """Bind the socket and serve until shutdown() is called."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(self.socket_path)
+        self._listener.listen(128)
+
+        threading.Thread(target=self._batch_loop, name="encoder-batcher", daemon=True).start()
+
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+
+    def shutdown(self) -> None:
+        """Stop accepting connections and stop the batcher."""
+        self._stop.set()
+        self._queue.put(None)
+        if self._listener is not None:
+            self._listener.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+class RemoteEncoder:
+    """
+    Drop-in stand-in for SentenceTransformer.encode() backed by the encoder server.
+
+    One persistent connection is kept per calling thread.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 60.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conn.settimeout(self.timeout)
+            conn.connect(self.socket_path)
+            self._local.conn = conn
+        return conn
+
+    def _reset_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+        self._local.conn = None
+
+    @staticmethod
+    def _requests(texts: List[str], normalize: bool):
+        """Request payloads for texts, split so each frame stays under MAX_FRAME_BYTES."""
+        tail = b'], "normalize": ' + json.dumps(normalize).encode() + b"}"
+        head = b'{"texts": ['
+        budget = MAX_FRAME_BYTES - len(head) - len(tail)
+        batch, size = [], 0
+        for text in texts:
+            encoded = json.dumps(text).encode()
+            if len(encoded) + 2 > budget:
+                raise ValueError(f"Text of {len(text)} characters exceeds the encoder frame limit")
+            if batch and (size + len(encoded) + 2 > budget or len(batch) == MAX_TEXTS_PER_REQUEST):
+                yield head + b", ".join(batch) + tail
+                batch, size = [], 0
+            batch.append(encoded)
+            size += len(encoded) + 2
+        yield head + b", ".join(batch) + tail
+
+    def _request(self, payload: bytes) -> np.ndarray:
+        conn = self._connection()
+        send_frame(conn, payload)
+        header = json.loads(recv_frame(conn))
+        if "error" in header:
+            raise RuntimeError(f"Encoder server error: {header['error']}")
+        data = recv_frame(conn)
+        return np.frombuffer(data, dtype="<f4").reshape(header["count"], header["dim"])
+
+    def encode(
+        self,
+        sentences,
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        normalize_embeddings: bool = False,
+        **kwargs
+    ) -> np.ndarray:
+        """
+        Encode texts on the shared encoder server.
+
+        Accepts the SentenceTransformer.encode() arguments used in this service;
+        batching is decided by the server (large calls are sent as several requests).
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        parts = [self._request_with_retry(payload) for payload in self._requests(texts, normalize_embeddings)]
+        vectors = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        return vectors[0] if single else vectors
+
+    def _request_with_retry(self, payload: bytes) -> np.ndarray:
+        try:
+            return self._request(payload)
+        except TimeoutError:
+            self._reset_connection()
+            raise RuntimeError(f"Encoder server timed out after {self.timeout}s")
+        except (ConnectionError, OSError):
+            # Stale connection (e.g. server restarted) - reconnect once
+            self._reset_connection()
+            try:
+                return self._request(payload)
+            except (ConnectionError, OSError) as e:
+                self._reset_connection()
+                raise RuntimeError(f"Encoder server unavailable at {self.socket_path}: {str(e)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared encoder server for ai_service workers")
+    parser.add_argument("--socket", default=os.getenv("AI_ENCODER_SOCKET", DEFAULT_SOCKET_PATH),
+                        help="Unix domain socket path")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help="Maximum texts per encode call")
+    parser.add_argument("--batch-window-ms", type=float, default=DEFAULT_BATCH_WINDOW_MS,
+                        help="Time to wait for more requests after the first one")
+    args = parser.parse_args()
+
+    from ai_resume_matcher import load_model
+
+    print("Loading AI model...")
+    model = load_model()
+    print("✅ Model loaded successfully!")
+
+    server = EncoderServer(model, args.socket, args.max_batch, args.batch_window_ms)
+    print(f"🚀 Encoder server listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Idempotency Keys - deduplicate retried generation and scoring requests
+When the backend times out it retries. Without deduplication every retry
+starts over: another multi-minute /api/generate-assessment run burning Gemini
+quota, or another /api/score-assessment run re-executing all candidate code.
+
+Clients send `Idempotency-Key: <unique id>` (e.g. a UUID per logical
+operation) and reuse it on retries. For a given endpoint and key:
+- first request:        runs normally; its response is recorded
+- retry while running:  waits for that run and gets the same response
+                        (no second computation, no admission slot taken)
+- retry after it ended: gets the recorded response immediately
+- same key, other body: 422 (keys must not be reused for different requests)
+
+Replayed responses carry `Idempotent-Replayed: true`. Transient failures
+(5xx, 408, 429) are handed to requests already waiting on the run but are not
+recorded, so a later retry runs again.
+
+Records live in a bounded in-memory store per service process: finished
+entries are evicted oldest-first beyond AI_SERVICE_IDEMPOTENCY_STORE_SIZE or
+after AI_SERVICE_IDEMPOTENCY_TTL seconds; in-flight entries are never evicted
+(their number is bounded by admission control). As with assessment jobs,
+retries must reach the same process (ASGI mode runs a single process; use
+sticky routing with several gunicorn workers).
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+from request_deadline import DeadlineExceeded, remaining
+from service_metrics import Counter
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+MAX_STORED_RESPONSES = int(os.getenv("AI_SERVICE_IDEMPOTENCY_STORE_SIZE", 256))
+RESPONSE_TTL_SECONDS = float(os.getenv("AI_SERVICE_IDEMPOTENCY_TTL", 3600))
+
+# POST endpoints that honour Idempotency-Key (expensive, not naturally idempotent)
+IDEMPOTENT_ENDPOINTS = {
+    "/api/generate-assessment",
+    "/api/score-assessment",
+    "/api/assessment-jobs",
+}
+
+# Statuses a retry should recompute instead of replaying
+TRANSIENT_STATUSES = (408, 429)
+
+IDEMPOTENT_REQUESTS_TOTAL = Counter(
+    "ai_service_idempotent_requests_total",
+    "Requests carrying an Idempotency-Key by outcome (executed, attached, replayed, conflict)",
+    ("endpoint", "outcome")
+)
+
+
+class IdempotencyConflict(Exception):
+    """Raised when a key is reused with a different request body."""
+
+
+class StoredResponse(NamedTuple):
+    status: int
+    body: bytes
+    content_type: str
+
+
+class IdempotencyEntry:
+    """One key's run: in flight until finish(), then holds the response."""
+
+    def __init__(self, store_key: str, fingerprint: str):
+        self.store_key = store_key
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.response: Optional[StoredResponse] = None
+        self.finished_at: Optional[float] = None
+
+
+def fingerprint_body(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def validate_key(key: str) -> str:
+    """Strip and check a client key; raises ValueError for empty or oversized keys."""
+    key = key.strip()
+    if not key:
+        raise ValueError(f"{IDEMPOTENCY_HEADER} must not be empty")
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValueError(f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters")
+    return key
+
+
+def is_transient(status: int) -> bool:
+    return status >= 500 or status in TRANSIENT_STATUSES
+
+
+class IdempotencyStore:
+    """
+    Bounded, thread-safe store of in-flight and finished keyed requests.
+
+    Args:
+        max_entries: Finished responses kept for replay (oldest evicted first)
+        ttl_seconds: How long a finished response stays replayable
+    """
+
+    def __init__(self, max_entries: int = MAX_STORED_RESPONSES, ttl_seconds: float = RESPONSE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, IdempotencyEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self) -> None:
+        """Drop expired finished entries, then the oldest beyond capacity (caller holds the lock)."""
+        now = time.time()
+        finished = [k for k, entry in self._entries.items() if entry.finished_at is not None]
+        for store_key in finished:
+            if now - self._entries[store_key].finished_at > self.ttl_seconds:
+                del self._entries[store_key]
+        finished = [k for k in finished if k in self._entries]
+        for store_key in finished[:max(0, len(finished) - self.max_entries)]:
+            del self._entries[store_key]
+
+    def begin(self, scope: str, key: str, fingerprint: str):
+        """
+        Look up a key, registering a new in-flight entry if there is none.
+
+        Args:
+            scope: Endpoint the key belongs to (keys are per endpoint)
+            key: Client Idempotency-Key
+            fingerprint: Hash of the request body
+
+        Returns:
+            (entry, owner) - owner is True if the caller must run the request
+            and finish() the entry; otherwise the entry is in flight or done
+
+        Raises:
+            IdempotencyConflict: If the key was used with a different body
+        """
+        store_key = f"{scope}\0{key}"
+        with self._lock:
+            self._evict()
+            entry = self._entries.get(store_key)
+            if entry is not None:
+                if entry.fingerprint != fingerprint:
+                    raise IdempotencyConflict(
+                        f"{IDEMPOTENCY_HEADER} was already used with a different request body"
+                    )
+                return entry, False
+            entry = IdempotencyEntry(store_key, fingerprint)
+            self._entries[store_key] = entry
+            return entry, True
+
+    def finish(self, entry: IdempotencyEntry, response: Optional[StoredResponse]) -> None:
+        """
+        End an entry's run and wake requests waiting on it.
+
+        Args:
+            entry: Entry returned to the owner by begin()
+            response: The run's response (None if it produced none, e.g. the
+                      handler raised); only non-transient responses are kept
+        """
+        with self._lock:
+            entry.response = response
+            if response is not None and not is_transient(response.status):
+                entry.finished_at = time.time()
+            elif self._entries.get(entry.store_key) is entry:
+                del self._entries[entry.store_key]
+        entry.done.set()
+
+    def memory_bytes(self) -> int:
+        """Bytes of stored response bodies."""
+        with self._lock:
+            return sum(len(entry.response.body) for entry in self._entries.values() if entry.response is not None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            in_flight = sum(1 for entry in self._entries.values() if entry.finished_at is None)
+            return {
+                "in_flight": in_flight,
+                "stored": len(self._entries) - in_flight,
+                "max_entries": self.max_entries
+            }
+
+
+# Global store (one per service process)
+_store: Optional[IdempotencyStore] = None
+_store_lock = threading.Lock()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = IdempotencyStore()
+        return _store
+
+
+def claim_key(scope: str, key: str, body: bytes, deadline: Optional[float] = None):
+    """
+    Claim an Idempotency-Key for a request.
+
+    Args:
+        scope: Endpoint (metric label and key namespace)
+        key: Client Idempotency-Key header value
+        body: Raw request body
+        deadline: Request deadline bounding the wait for an in-flight run
+
+    Returns:
+        (entry, None) if this request should run (finish the entry afterwards),
+        or (None, StoredResponse) to answer with the earlier run's response
+
+    Raises:
+        ValueError: Invalid key
+        IdempotencyConflict: Key reused with a different body
+        DeadlineExceeded: The deadline passed while waiting for the in-flight run
+    """
+    key = validate_key(key)
+    fingerprint = fingerprint_body(body)
+    store = get_idempotency_store()
+    while True:
+        try:
+            entry, owner = store.begin(scope, key, fingerprint)
+        except IdempotencyConflict:
+            IDEMPOTENT_REQUESTS_TOTAL.inc(scope, "conflict")
+            raise
+        if owner:
+            IDEMPOTENT_REQUESTS_TOTAL.inc(scope, "executed")
+            return entry, None
+        outcome = "replayed" if entry.done.is_set() else "attached"
+        if not entry.done.wait(remaining(deadline)):
+            raise DeadlineExceeded("Deadline exceeded waiting for in-flight request")
+        if entry.response is not None:
+            IDEMPOTENT_REQUESTS_TOTAL.inc(scope, outcome)
+            return None, entry.response
+        # The run ended without a response: claim the key again (or attach to whoever did)
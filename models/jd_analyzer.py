@@ -1,21 +1,37 @@
 """
 Job Description Analyzer Module
-Fully local, deterministic, offline JD analysis using spaCy and regex.
+Fully local, deterministic, offline JD analysis using regex.
 No API keys or paid services required.
 """
 
+import hashlib
+import json
 import re
 from typing import Dict, List, Optional, Tuple
 from collections import Counter
 
-try:
-    import spacy
-    SPACY_AVAILABLE = True
-except ImportError:
-    SPACY_AVAILABLE = False
-
 from skills import SKILLS, ROLE_MAP, SKILL_NORMALIZATION
 
+# Changes whenever the skill/role dictionaries change (part of response cache keys)
+DICTIONARY_VERSION = hashlib.sha256(
+    json.dumps([SKILLS, ROLE_MAP, SKILL_NORMALIZATION], sort_keys=True).encode()
+).hexdigest()[:12]
+
+# Word-boundary patterns for every dictionary skill, compiled once at import
+# so repeated extraction (every /api/analyze-jd call) skips re's pattern cache
+SKILL_PATTERNS = [
+    (skill, re.compile(r'\b' + re.escape(skill.lower()) + r'\b', re.IGNORECASE))
+    for skill in SKILLS
+]
+
+# Single alternation over all skills (longest first) for presence-only scans.
+# Matched against lowered text without IGNORECASE: Unicode case folding could
+# otherwise match text (e.g. "ſ" for "s") whose .lower() is not a key.
+_SKILL_BY_LOWER = {skill.lower(): skill for skill in SKILLS}
+SKILL_ALTERNATION = re.compile(
+    r'\b(?:' + '|'.join(re.escape(s.lower()) for s in sorted(set(SKILLS), key=len, reverse=True)) + r')\b'
+)
+
 
 def normalize_skill(skill: str) -> str:
     """
@@ -47,12 +63,9 @@ def extract_skills(jd_text: str) -> List[str]:
     jd_lower = jd_text.lower()
     found_skills = []
     
-    # Match skills case-insensitively
-    for skill in SKILLS:
-        skill_lower = skill.lower()
-        # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(skill_lower) + r'\b'
-        matches = re.findall(pattern, jd_lower, re.IGNORECASE)
+    # Match skills case-insensitively (word boundaries avoid partial matches)
+    for skill, pattern in SKILL_PATTERNS:
+        matches = pattern.findall(jd_lower)
         if matches:
             # Count occurrences for relevance ranking
             found_skills.extend([skill] * len(matches))
@@ -77,6 +90,29 @@ def extract_skills(jd_text: str) -> List[str]:
     return [skill for skill, _ in sorted_skills]
 
 
+def extract_skill_set(text: str) -> List[str]:
+    """
+    Fast presence-only skill extraction (one regex pass over the text).
+
+    Unlike extract_skills(), overlapping mentions are resolved longest-first
+    (e.g. "Spring Boot" does not also count as "Spring") and no frequency
+    ranking is done. Intended for bulk scans such as labelling applicant clusters.
+
+    Args:
+        text: Raw resume or job description text
+
+    Returns:
+        Sorted list of unique normalized skills
+    """
+    if not text or not isinstance(text, str):
+        return []
+
+    return sorted({
+        normalize_skill(_SKILL_BY_LOWER[match])
+        for match in SKILL_ALTERNATION.findall(text.lower())
+    })
+
+
 def extract_experience(jd_text: str) -> Tuple[Optional[str], Optional[int]]:
     """
     Extract experience level and years from job description.
@@ -0,0 +1,290 @@
+"""
+Memory Report - where this service process's memory goes, on demand
+Answers "what got us OOM-killed" from a running instance:
+
+    GET    /api/admin/memory            - RSS (current, peak, anon vs file-backed),
+                                          RSS per mapped library, known cache sizes,
+                                          per-endpoint peak Python allocation
+    POST   /api/admin/memory/snapshot   - tracemalloc snapshot; diffs against the
+                                          previous one (top allocators by growth)
+    DELETE /api/admin/memory/snapshot   - stop tracing
+
+Python heap tracing (tracemalloc) slows allocation-heavy code noticeably, so it
+is off until the first snapshot request (or AI_SERVICE_TRACEMALLOC=1 at
+startup). Per-endpoint peaks are only collected while tracing: each request
+records the traced-memory peak above its starting point. The peak counter is
+process-wide, so with concurrent requests the figure is an upper bound.
+
+RSS numbers come from /proc/self (Linux); elsewhere only the peak RSS from
+getrusage is reported.
+
+Environment:
+    AI_SERVICE_TRACEMALLOC=1           - trace from startup (default: off)
+    AI_SERVICE_TRACEMALLOC_FRAMES      - frames kept per allocation (default: 1)
+    AI_SERVICE_MEMORY_TOP              - allocators listed per snapshot (default: 25)
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+TRACEMALLOC_FRAMES = int(os.getenv("AI_SERVICE_TRACEMALLOC_FRAMES", 1))
+TOP_ALLOCATORS = int(os.getenv("AI_SERVICE_MEMORY_TOP", 25))
+TOP_MAPPINGS = 20
+
+# Allocations made by the tracing machinery itself
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>")
+]
+
+
+def tracemalloc_requested() -> bool:
+    return os.getenv("AI_SERVICE_TRACEMALLOC", "0").lower() in ("1", "true", "yes")
+
+
+# ============================================================================
+# RSS
+# ============================================================================
+
+def read_rss() -> Dict[str, int]:
+    """
+    Resident memory of this process in kB.
+
+    Returns:
+        Dictionary with rss_kb, peak_rss_kb and (Linux) anon_kb, file_kb, shmem_kb
+    """
+    fields = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].isdigit():
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        import resource
+        # ru_maxrss is in kB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"peak_rss_kb": peak // 1024 if sys.platform == "darwin" else peak}
+
+    return {
+        "rss_kb": fields.get("VmRSS", 0),
+        "peak_rss_kb": fields.get("VmHWM", 0),
+        "anon_kb": fields.get("RssAnon", 0),
+        "file_kb": fields.get("RssFile", 0),
+        "shmem_kb": fields.get("RssShmem", 0)
+    }
+
+
+def rss_by_mapping(limit: int = TOP_MAPPINGS) -> List[Dict[str, Any]]:
+    """
+    Resident memory per mapped file (shared libraries, model weights) and per
+    anonymous region kind ([heap], [anon], [stack]), largest first.
+
+    Anonymous memory is where Python objects, numpy arrays and torch tensors
+    live; the per-library figures show what e.g. torch or PyMuPDF cost by
+    being loaded at all.
+    """
+    totals: Dict[str, int] = {}
+    current = None
+    try:
+        with open("/proc/self/smaps") as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                if "-" in parts[0] and not parts[0].endswith(":"):
+                    # Mapping header: address perms offset dev inode [path]
+                    path = parts[5] if len(parts) > 5 else "[anon]"
+                    current = path if path.startswith("[") else os.path.basename(path)
+                elif parts[0] == "Rss:" and current is not None:
+                    totals[current] = totals.get(current, 0) + int(parts[1])
+    except OSError:
+        return []
+
+    mappings = [{"mapping": name, "rss_kb": kb} for name, kb in totals.items() if kb]
+    mappings.sort(key=lambda m: m["rss_kb"], reverse=True)
+    return mappings[:limit]
+
+
+def deep_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate bytes held by obj and the containers/arrays it references."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        # numpy array (getsizeof misses views' base buffers)
+        return nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def model_parameter_bytes(model: Any) -> Optional[int]:
+    """Bytes of a torch model's parameters and buffers (None if not a torch model)."""
+    parameters = getattr(model, "parameters", None)
+    if parameters is None:
+        return None
+    tensors = list(parameters()) + list(getattr(model, "buffers", lambda: [])())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+# ============================================================================
+# TRACEMALLOC SNAPSHOTS
+# ============================================================================
+
+def _format_stat(stat) -> Dict[str, Any]:
+    frame = stat.traceback[0]
+    entry = {
+        "location": f"{frame.filename}:{frame.lineno}",
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count
+    }
+    if hasattr(stat, "size_diff"):
+        entry["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+        entry["count_diff"] = stat.count_diff
+    if len(stat.traceback) > 1:
+        entry["traceback"] = [f"{f.filename}:{f.lineno}" for f in stat.traceback]
+    return entry
+
+
+class HeapSnapshots:
+    """
+    On-demand tracemalloc snapshots, each diffed against the one before.
+
+    Args:
+        frames: Stack frames stored per traced allocation
+        top: Allocators reported per snapshot
+    """
+
+    def __init__(self, frames: int = TRACEMALLOC_FRAMES, top: int = TOP_ALLOCATORS):
+        self.frames = frames
+        self.top = top
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._previous_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._previous = None
+            self._previous_at = None
+        tracemalloc.stop()
+
+    def take(self) -> Dict[str, Any]:
+        """
+        Take a snapshot (starting tracing if needed).
+
+        Returns:
+            Dictionary with traced_kb, top (largest allocators now) and, when a
+            previous snapshot exists, growth (allocators by size change since it)
+        """
+        started = not tracemalloc.is_tracing()
+        self.start()
+        key = "traceback" if self.frames > 1 else "lineno"
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        now = time.time()
+
+        with self._lock:
+            previous, previous_at = self._previous, self._previous_at
+            self._previous, self._previous_at = snapshot, now
+
+        current, peak = tracemalloc.get_traced_memory()
+        report = {
+            "tracing_started": started,
+            "traced_kb": round(current / 1024, 1),
+            "traced_peak_kb": round(peak / 1024, 1),
+            "top": [_format_stat(stat) for stat in snapshot.statistics(key)[:self.top]]
+        }
+        if previous is not None:
+            report["seconds_since_previous"] = round(now - previous_at, 1)
+            report["growth"] = [
+                _format_stat(stat) for stat in snapshot.compare_to(previous, key)[:self.top]
+            ]
+        return report
+
+
+# ============================================================================
+# PER-ENDPOINT PEAK ALLOCATION
+# ============================================================================
+
+class AllocationPeaks:
+    """
+    Peak traced Python allocation per endpoint (only while tracemalloc is on).
+
+    begin() on the request thread when the request starts, end() when it
+    finishes. The process-wide peak is reset when a request starts alone, so
+    single requests are measured exactly and overlapping ones get an upper bound.
+    """
+
+    def __init__(self):
+        self._peaks: Dict[str, Dict[str, Any]] = {}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def begin(self) -> Optional[int]:
+        """Traced bytes at request start (None when not tracing)."""
+        if not tracemalloc.is_tracing():
+            return None
+        with self._lock:
+            self._in_flight += 1
+            if self._in_flight == 1:
+                tracemalloc.reset_peak()
+            return tracemalloc.get_traced_memory()[0]
+
+    def end(self, endpoint: str, start: Optional[int]) -> None:
+        if start is None:
+            return
+        with self._lock:
+            self._in_flight -= 1
+            if not tracemalloc.is_tracing():
+                return
+            peak = max(0, tracemalloc.get_traced_memory()[1] - start)
+            entry = self._peaks.setdefault(endpoint, {"requests": 0, "max_peak_kb": 0.0, "last_peak_kb": 0.0})
+            entry["requests"] += 1
+            entry["last_peak_kb"] = round(peak / 1024, 1)
+            entry["max_peak_kb"] = max(entry["max_peak_kb"], entry["last_peak_kb"])
+
+    def reset(self) -> None:
+        with self._lock:
+            self._peaks = {}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {endpoint: dict(entry) for endpoint, entry in self._peaks.items()}
+
+
+# Global snapshot state and peak tracker (one per service process)
+_snapshots: Optional[HeapSnapshots] = None
+_peaks: Optional[AllocationPeaks] = None
+_memory_lock = threading.Lock()
+
+
+def get_heap_snapshots() -> HeapSnapshots:
+    global _snapshots
+    with _memory_lock:
+        if _snapshots is None:
+            _snapshots = HeapSnapshots()
+        return _snapshots
+
+
+def get_allocation_peaks() -> AllocationPeaks:
+    global _peaks
+    with _memory_lock:
+        if _peaks is None:
+            _peaks = AllocationPeaks()
+        return _peaks
@@ -3,9 +3,12 @@ Multi-API Key Support with Automatic Rotation
 Supports multiple Gemini API keys and rotates when quota is exceeded
 """
 
+import logging
 import os
 from typing import List, Optional
 
+logger = logging.getLogger(__name__)
+
 class APIKeyManager:
     """
     Manages multiple Gemini API keys with automatic rotation on quota exceeded.
@@ -86,12 +89,12 @@ class APIKeyManager:
         if key and key in self.keys:
             index = self.keys.index(key)
             self.failed_keys.add(index)
-            print(f"⚠️  Marked API key {index + 1} as quota exceeded")
+            logger.warning("Marked API key as quota exceeded", extra={"key_index": index + 1})
     
     def reset_failed_keys(self):
         """Reset all failed keys (useful after 24 hours)."""
         self.failed_keys.clear()
-        print("✓ Reset failed keys - all keys available again")
+        logger.info("Reset failed keys - all keys available again")
     
     def get_available_keys_count(self) -> int:
         """Get count of available (non-failed) keys."""
@@ -0,0 +1,77 @@
+"""
+NDJSON Streaming - line-delimited JSON responses for batch endpoints
+A batch endpoint normally builds one JSON document with every result, so the
+service holds all results (and the backend waits for the last one) before a
+single byte is sent. In streaming mode each result is written as its own line
+as soon as it is ready, followed by one summary line:
+
+    {"type": "result", "index": 0, ...}
+    {"type": "result", "index": 1, ...}
+    {"type": "summary", "complete": true, "emitted": 2, "total": 2, ...}
+
+Clients opt in with `Accept: application/x-ndjson` or `?stream=1`. Results
+are written in input order. An error after the response has started is
+reported as a {"type": "error"} line, and the summary then says
+"complete": false. The summary line is always last, so a missing summary
+means the connection was cut.
+
+Streamed bodies are not compressed by response_encoding (there is no full
+body to compress); each line is serialized with its orjson dumps().
+"""
+
+import logging
+from typing import Dict, Iterable
+
+from flask import Request, Response, stream_with_context
+
+from request_deadline import DeadlineExceeded
+from response_encoding import dumps
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def wants_ndjson(req: Request) -> bool:
+    """Whether the client asked for a streamed NDJSON response."""
+    if req.args.get("stream", "").lower() in ("1", "true", "yes"):
+        return True
+    return req.accept_mimetypes.best_match([NDJSON_MIMETYPE, "application/json"]) == NDJSON_MIMETYPE
+
+
+def ndjson_response(records: Iterable[Dict], summary: Dict) -> Response:
+    """
+    Stream records as NDJSON followed by a summary line.
+
+    Args:
+        records: Lazily produced result dicts (each should carry its "index").
+                 Work happens while the response is being sent, inside the
+                 request context (g, deadlines and admission slots still apply)
+        summary: Dict the records generator updates as it goes; written as the
+                 final line once records are exhausted
+
+    Returns:
+        Streaming Flask response (application/x-ndjson)
+    """
+    def generate():
+        emitted = 0
+        complete = True
+        try:
+            for record in records:
+                emitted += 1
+                yield dumps({"type": "result", **record}) + b"\n"
+        except DeadlineExceeded:
+            complete = False
+            summary["deadline_exceeded"] = True
+        except Exception as e:
+            logger.exception("Error while streaming batch response")
+            complete = False
+            yield dumps({"type": "error", "error": f"Internal error: {str(e)}"}) + b"\n"
+        if summary.get("deadline_exceeded"):
+            complete = False
+        yield dumps({"type": "summary", "complete": complete, "emitted": emitted, **summary}) + b"\n"
+
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    # Ask reverse proxies not to buffer the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
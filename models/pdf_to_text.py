@@ -5,25 +5,45 @@ Extracts text from PDF resumes for AI matching
 Supports:
 - pdfplumber (primary, best for resumes)
 - PyMuPDF (fallback, faster)
+
+Input can be a file path (extract_resume_text) or the PDF bytes themselves
+(extract_resume_text_from_bytes), e.g. an upload buffer - no temp file needed.
+
+Both accept an optional request deadline (time.time()); extraction checks it
+between pages and raises DeadlineExceeded instead of finishing or falling back.
 """
 
+import io
+import logging
 import os
-from typing import Optional
+from typing import Callable, Optional, Union
+
+from request_deadline import DeadlineExceeded, check_deadline
+from service_metrics import stage
+
+logger = logging.getLogger(__name__)
+
+BytesLike = Union[bytes, bytearray, memoryview]
 
+# PDF header must appear within the first 1024 bytes (PDF 1.7, Annex H)
+PDF_MAGIC = b"%PDF-"
 
-def extract_text_with_pdfplumber(pdf_path: str) -> str:
+
+def extract_text_with_pdfplumber(pdf_path: str, deadline: Optional[float] = None) -> str:
     """
     Extract text using pdfplumber (primary method).
     Best for resumes with good layout handling.
     
     Args:
         pdf_path: Path to PDF file
+        deadline: Optional request deadline (checked between pages)
         
     Returns:
         Extracted text as string
         
     Raises:
         FileNotFoundError: If PDF file doesn't exist
+        DeadlineExceeded: If the deadline passes mid-document
         Exception: If pdfplumber extraction fails
     """
     try:
@@ -34,29 +54,45 @@ def extract_text_with_pdfplumber(pdf_path: str) -> str:
     if not os.path.exists(pdf_path):
         raise FileNotFoundError(f"PDF file not found: {pdf_path}")
     
+    with stage("pdf_extraction_pdfplumber"), pdfplumber.open(pdf_path) as pdf:
+        return _pdfplumber_pages_text(pdf, deadline)
+
+
+def _pdfplumber_pages_text(pdf, deadline: Optional[float] = None) -> str:
     text_parts = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text.strip())
-    
+    for page in pdf.pages:
+        check_deadline(deadline, "pdf extraction")
+        page_text = page.extract_text()
+        if page_text:
+            text_parts.append(page_text.strip())
+    return "\n".join(text_parts)
+
+
+def _pymupdf_pages_text(doc, deadline: Optional[float] = None) -> str:
+    text_parts = []
+    for page in doc:
+        check_deadline(deadline, "pdf extraction")
+        page_text = page.get_text()
+        if page_text:
+            text_parts.append(page_text.strip())
     return "\n".join(text_parts)
 
 
-def extract_text_with_pymupdf(pdf_path: str) -> str:
+def extract_text_with_pymupdf(pdf_path: str, deadline: Optional[float] = None) -> str:
     """
     Fallback extraction using PyMuPDF (fitz).
     Faster alternative when pdfplumber fails.
     
     Args:
         pdf_path: Path to PDF file
+        deadline: Optional request deadline (checked between pages)
         
     Returns:
         Extracted text as string
         
     Raises:
         FileNotFoundError: If PDF file doesn't exist
+        DeadlineExceeded: If the deadline passes mid-document
         Exception: If PyMuPDF extraction fails
     """
     try:
@@ -67,18 +103,65 @@ def extract_text_with_pymupdf(pdf_path: str) -> str:
     if not os.path.exists(pdf_path):
         raise FileNotFoundError(f"PDF file not found: {pdf_path}")
     
-    text_parts = []
-    doc = fitz.open(pdf_path)
-    for page in doc:
-        page_text = page.get_text()
-        if page_text:
-            text_parts.append(page_text.strip())
-    doc.close()
+    with stage("pdf_extraction_pymupdf"):
+        doc = fitz.open(pdf_path)
+        try:
+            return _pymupdf_pages_text(doc, deadline)
+        finally:
+            doc.close()
+
+
+def extract_text_with_pdfplumber_bytes(pdf_data: BytesLike, deadline: Optional[float] = None) -> str:
+    """
+    pdfplumber extraction from in-memory PDF data.
     
-    return "\n".join(text_parts)
+    Args:
+        pdf_data: PDF file contents (bytes are wrapped without copying;
+                  other buffers are copied once, pdfminer needs a file object)
+        deadline: Optional request deadline (checked between pages)
+        
+    Returns:
+        Extracted text as string
+    """
+    try:
+        import pdfplumber
+    except ImportError:
+        raise ImportError("pdfplumber not installed. Run: pip install pdfplumber")
+    
+    stream = io.BytesIO(pdf_data if isinstance(pdf_data, bytes) else bytes(pdf_data))
+    with stage("pdf_extraction_pdfplumber"), pdfplumber.open(stream) as pdf:
+        return _pdfplumber_pages_text(pdf, deadline)
+
+
+def extract_text_with_pymupdf_bytes(pdf_data: BytesLike, deadline: Optional[float] = None) -> str:
+    """
+    PyMuPDF extraction from in-memory PDF data (buffer is read in place, no copy).
+    
+    Args:
+        pdf_data: PDF file contents
+        deadline: Optional request deadline (checked between pages)
+        
+    Returns:
+        Extracted text as string
+    """
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        raise ImportError("PyMuPDF not installed. Run: pip install pymupdf")
+    
+    with stage("pdf_extraction_pymupdf"):
+        doc = fitz.open(stream=pdf_data, filetype="pdf")
+        try:
+            return _pymupdf_pages_text(doc, deadline)
+        finally:
+            doc.close()
 
 
-def extract_resume_text(pdf_path: str, prefer_pdfplumber: bool = True) -> str:
+def extract_resume_text(
+    pdf_path: str,
+    prefer_pdfplumber: bool = True,
+    deadline: Optional[float] = None
+) -> str:
     """
     Main PDF → text extraction function.
     
@@ -88,6 +171,7 @@ def extract_resume_text(pdf_path: str, prefer_pdfplumber: bool = True) -> str:
     Args:
         pdf_path: Path to PDF resume file
         prefer_pdfplumber: If True, try pdfplumber first (default: True)
+        deadline: Optional request deadline (time.time())
         
     Returns:
         Extracted text as string
@@ -96,6 +180,7 @@ def extract_resume_text(pdf_path: str, prefer_pdfplumber: bool = True) -> str:
         FileNotFoundError: If PDF file doesn't exist
         ValueError: If extracted text is too short (< 50 chars)
         RuntimeError: If both extraction methods fail
+        DeadlineExceeded: If the deadline passes before extraction finishes
         
     Example:
         text = extract_resume_text("resume.pdf")
@@ -107,29 +192,89 @@ def extract_resume_text(pdf_path: str, prefer_pdfplumber: bool = True) -> str:
     if not pdf_path.lower().endswith('.pdf'):
         raise ValueError(f"File is not a PDF: {pdf_path}")
     
+    return _extract_with_fallback(
+        lambda: extract_text_with_pdfplumber(pdf_path, deadline),
+        lambda: extract_text_with_pymupdf(pdf_path, deadline),
+        prefer_pdfplumber,
+        pdf_path,
+        deadline
+    )
+
+
+def extract_resume_text_from_bytes(
+    pdf_data: BytesLike,
+    prefer_pdfplumber: bool = True,
+    deadline: Optional[float] = None
+) -> str:
+    """
+    extract_resume_text() for in-memory PDF data (e.g. an uploaded file's bytes).
+    
+    Both backends read the buffer directly; nothing is written to disk.
+    
+    Args:
+        pdf_data: PDF file contents (bytes, bytearray or memoryview)
+        prefer_pdfplumber: If True, try pdfplumber first (default: True)
+        deadline: Optional request deadline (time.time())
+        
+    Returns:
+        Extracted text as string
+        
+    Raises:
+        ValueError: If the data is not a PDF
+        RuntimeError: If both extraction methods fail or text is too short
+        DeadlineExceeded: If the deadline passes before extraction finishes
+    """
+    if not isinstance(pdf_data, (bytes, bytearray, memoryview)):
+        raise ValueError("pdf_data must be bytes, bytearray or memoryview")
+    
+    if PDF_MAGIC not in bytes(memoryview(pdf_data)[:1024]):
+        raise ValueError("Data is not a PDF (missing %PDF- header)")
+    
+    return _extract_with_fallback(
+        lambda: extract_text_with_pdfplumber_bytes(pdf_data, deadline),
+        lambda: extract_text_with_pymupdf_bytes(pdf_data, deadline),
+        prefer_pdfplumber,
+        f"<{len(pdf_data)} bytes>",
+        deadline
+    )
+
+
+def _extract_with_fallback(
+    extract_pdfplumber: Callable[[], str],
+    extract_pymupdf: Callable[[], str],
+    prefer_pdfplumber: bool,
+    source: str,
+    deadline: Optional[float] = None
+) -> str:
+    """pdfplumber first (optionally), PyMuPDF as fallback; enforce minimum text length."""
     text = None
     last_error = None
     
     # Try primary method (pdfplumber)
     if prefer_pdfplumber:
         try:
-            text = extract_text_with_pdfplumber(pdf_path)
+            text = extract_pdfplumber()
             if text and len(text.strip()) > 50:  # Minimum valid text length
                 return text.strip()
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             last_error = e
     
-    # Fallback to PyMuPDF
+    # Fallback to PyMuPDF (not worth starting once the deadline has passed)
+    check_deadline(deadline, "pdf extraction")
     try:
-        text = extract_text_with_pymupdf(pdf_path)
+        text = extract_pymupdf()
         if text and len(text.strip()) > 50:
             return text.strip()
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         last_error = e
     
     # If both methods failed or text too short
     if not text or len(text.strip()) < 50:
-        error_msg = f"Failed to extract sufficient text from PDF: {pdf_path}"
+        error_msg = f"Failed to extract sufficient text from PDF: {source}"
         if last_error:
             error_msg += f" (Last error: {str(last_error)})"
         raise RuntimeError(error_msg)
@@ -158,7 +303,7 @@ def extract_resume_texts(pdf_paths: list) -> list:
             results.append(text)
         except Exception as e:
             # Log error but continue with other PDFs
-            print(f"Warning: Failed to extract {pdf_path}: {str(e)}")
+            logger.warning("Failed to extract PDF", extra={"path": pdf_path, "error": str(e)})
             results.append("")  # Empty string for failed extraction
     
     return results
@@ -0,0 +1,208 @@
+"""
+Pre-fork Preloading - copy-on-write sharing for gunicorn workers
+Loads the resume matcher model, question bank and skill index once in the
+gunicorn master, then freezes them with gc.freeze() so forked workers share
+those pages copy-on-write instead of each loading its own copy after fork.
+
+Run (gunicorn config module):
+    gunicorn --config python:prefork --bind 0.0.0.0:$PORT ai_service:app
+    (start.sh does this when AI_SERVICE_PREFORK=1)
+
+    AI_SERVICE_PREFORK_MODE=master  - preload in the master (default)
+    AI_SERVICE_PREFORK_MODE=worker  - load in every worker after fork (previous
+                                      behaviour, for before/after comparison)
+
+Report per-worker unique memory (USS = private clean + private dirty pages):
+    python prefork.py report --pid <gunicorn master pid>
+"""
+
+import argparse
+import gc
+import json
+import os
+import time
+from typing import Dict, List
+
+# ============================================================================
+# GUNICORN SETTINGS
+# ============================================================================
+
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+timeout = 120
+preload_app = True
+
+# Tokenizer thread pools must not be created before fork
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+
+def _prefork_mode() -> str:
+    return os.getenv("AI_SERVICE_PREFORK_MODE", "master").lower()
+
+
+def preload_shared_state() -> Dict[str, float]:
+    """
+    Load heavy, read-mostly state: model, lazily imported libraries, question
+    bank and skill index.
+
+    Returns:
+        Dictionary of load times in seconds per component
+    """
+    timings = {}
+
+    start = time.perf_counter()
+    import ai_service
+    if ai_service.RESUME_MATCHER_AVAILABLE:
+        ai_service.get_or_load_model()
+    timings["model"] = time.perf_counter() - start
+
+    # Lazily imported by the service; import here so workers share the modules
+    start = time.perf_counter()
+    if ai_service.RESUME_MATCHER_AVAILABLE:
+        import sklearn.metrics.pairwise  # noqa: F401
+    if ai_service.ASSESSMENT_GENERATOR_AVAILABLE:
+        import google.generativeai  # noqa: F401
+    timings["libraries"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    import question_bank
+    question_count = (
+        len(question_bank.MCQ_QUESTIONS)
+        + len(question_bank.SUBJECTIVE_QUESTIONS)
+        + len(question_bank.DSA_QUESTIONS)
+    )
+    timings["question_bank"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    import jd_analyzer
+    # Skill patterns are compiled at import time, so importing here is enough
+    skill_index_size = len(jd_analyzer.SKILL_PATTERNS)
+    timings["skill_index"] = time.perf_counter() - start
+
+    print(f"Preloaded {question_count} bank questions and {skill_index_size} skill patterns")
+    return timings
+
+
+def freeze_shared_state() -> int:
+    """
+    Move every object allocated so far into the GC's permanent generation.
+
+    Frozen objects are never scanned by the cyclic collector, so workers do not
+    write to (and un-share) the GC headers of the preloaded state.
+
+    Returns:
+        Number of frozen objects
+    """
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def on_starting(server):
+    """gunicorn hook (master, before workers are forked)."""
+    if _prefork_mode() != "master":
+        return
+    # Unloading is left to the workers: the master keeps the copy they share
+    from component_registry import get_component_registry
+    get_component_registry().suspend_governor()
+    timings = preload_shared_state()
+    frozen = freeze_shared_state()
+    print(f"✅ Pre-fork preload done in master ({', '.join(f'{k}={v:.2f}s' for k, v in timings.items())}); "
+          f"{frozen} objects frozen")
+
+
+def post_worker_init(worker):
+    """gunicorn hook (worker, after fork)."""
+    if _prefork_mode() == "worker":
+        preload_shared_state()
+    # Workers that never serve a model request still unload it when idle
+    from component_registry import get_component_registry
+    get_component_registry().ensure_governor()
+
+
+# ============================================================================
+# MEMORY REPORT
+# ============================================================================
+
+def read_process_memory(pid: int) -> Dict[str, int]:
+    """
+    Read memory counters (kB) for a process from /proc/<pid>/smaps_rollup.
+
+    Returns:
+        Dictionary with rss_kb, pss_kb, shared_kb and uss_kb
+        (uss = Private_Clean + Private_Dirty, memory only this process holds)
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "shared_kb": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "uss_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    }
+
+
+def find_worker_pids(master_pid: int) -> List[int]:
+    """Direct children of the gunicorn master."""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Field 4 is the parent pid; split after the ")" ending the command name
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == master_pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def memory_report(master_pid: int) -> Dict:
+    """
+    Per-process memory report for a gunicorn master and its workers.
+
+    Returns:
+        {"master": {...}, "workers": {pid: {...}}, "total_worker_uss_kb": int, "total_pss_kb": int}
+    """
+    workers_memory = {pid: read_process_memory(pid) for pid in find_worker_pids(master_pid)}
+    master_memory = read_process_memory(master_pid)
+
+    return {
+        "master": {"pid": master_pid, **master_memory},
+        "workers": workers_memory,
+        "total_worker_uss_kb": sum(m["uss_kb"] for m in workers_memory.values()),
+        "total_pss_kb": master_memory["pss_kb"] + sum(m["pss_kb"] for m in workers_memory.values())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-fork memory report for ai_service workers")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    report_parser = subparsers.add_parser("report", help="Per-worker unique RSS (USS) report")
+    report_parser.add_argument("--pid", type=int, required=True, help="gunicorn master pid")
+    report_parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    report = memory_report(args.pid)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'role':<8} {'pid':>8} {'rss MB':>10} {'pss MB':>10} {'shared MB':>10} {'uss MB':>10}")
+    rows = [("master", report["master"]["pid"], report["master"])]
+    rows += [("worker", pid, m) for pid, m in report["workers"].items()]
+    for role, pid, m in rows:
+        print(f"{role:<8} {pid:>8} {m['rss_kb'] / 1024:>10.1f} {m['pss_kb'] / 1024:>10.1f} "
+              f"{m['shared_kb'] / 1024:>10.1f} {m['uss_kb'] / 1024:>10.1f}")
+    print(f"\nTotal worker USS: {report['total_worker_uss_kb'] / 1024:.1f} MB")
+    print(f"Total PSS (master + workers): {report['total_pss_kb'] / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
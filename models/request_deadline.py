@@ -0,0 +1,135 @@
+"""
+Request Deadlines - per-request time budgets and cooperative cancellation
+The backend gives up on a request after its own timeout; without a deadline the
+service keeps generating questions, running test cases or parsing pages for a
+response nobody will read. A deadline lets that work stop early.
+
+A deadline is an absolute wall-clock time (time.time() seconds). It is a plain
+float so it can be passed as an argument to worker threads and to the CPU
+process pool unchanged. None means "no deadline".
+
+Clients set the budget per request with either:
+- header  X-Request-Timeout: <seconds>   (e.g. "30" or "2.5")
+- body    "timeout_seconds": <seconds>   (JSON requests)
+The budget is measured from when the request arrived, so time spent waiting for
+admission counts against it. AI_SERVICE_DEFAULT_TIMEOUT (seconds, unset = none)
+applies when the client sets nothing; AI_SERVICE_MAX_TIMEOUT caps client values.
+
+Long-running functions accept `deadline=` and call check_deadline() between
+units of work (sections, test cases, pages), so they stop at the next boundary
+and return or raise with whatever is done.
+"""
+
+import os
+import time
+from typing import Any, Optional
+
+from service_metrics import Counter
+
+TIMEOUT_HEADER = "X-Request-Timeout"
+TIMEOUT_BODY_FIELD = "timeout_seconds"
+
+
+def _env_seconds(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+DEFAULT_TIMEOUT = _env_seconds("AI_SERVICE_DEFAULT_TIMEOUT")
+MAX_TIMEOUT = _env_seconds("AI_SERVICE_MAX_TIMEOUT")
+
+# Counted by the endpoint (in the web process: work may run in the CPU pool)
+DEADLINE_EXCEEDED_TOTAL = Counter(
+    "ai_service_deadline_exceeded_total",
+    "Requests whose deadline passed before their work finished",
+    ("endpoint",)
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request's deadline passes before its work is done."""
+
+
+def parse_timeout(value: Any) -> Optional[float]:
+    """
+    Parse a client-supplied timeout in seconds.
+
+    Args:
+        value: Header string or JSON number (None/empty = not set)
+
+    Returns:
+        Positive number of seconds, or None if not set
+
+    Raises:
+        ValueError: If the value is not a positive number
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid timeout: {value!r}")
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid timeout: {value!r}")
+    if not seconds > 0:
+        raise ValueError(f"Timeout must be positive, got {value!r}")
+    return seconds
+
+
+def resolve_deadline(header_value: Any, body_value: Any = None,
+                     start: Optional[float] = None, use_default: bool = True) -> Optional[float]:
+    """
+    Deadline for a request from its header/body timeout (header wins).
+
+    Args:
+        header_value: X-Request-Timeout header value
+        body_value: "timeout_seconds" body field value
+        start: When the request arrived (time.time(); default now)
+        use_default: Fall back to AI_SERVICE_DEFAULT_TIMEOUT when the client
+                     sets nothing (False for background jobs)
+
+    Returns:
+        Absolute deadline (time.time() seconds), or None for no deadline
+
+    Raises:
+        ValueError: If a supplied timeout is invalid
+    """
+    timeout = parse_timeout(header_value)
+    if timeout is None:
+        timeout = parse_timeout(body_value)
+    if timeout is None and use_default:
+        timeout = DEFAULT_TIMEOUT
+    if timeout is None:
+        return None
+    if MAX_TIMEOUT is not None:
+        timeout = min(timeout, MAX_TIMEOUT)
+    return (start if start is not None else time.time()) + timeout
+
+
+def remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left until the deadline (never negative), or None for no deadline."""
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.time())
+
+
+def expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.time() >= deadline
+
+
+def check_deadline(deadline: Optional[float], stage_name: str) -> None:
+    """
+    Raise DeadlineExceeded if the deadline has passed.
+
+    Args:
+        deadline: Absolute deadline or None
+        stage_name: Work being abandoned (for the error message)
+    """
+    if expired(deadline):
+        raise DeadlineExceeded(f"Deadline exceeded during {stage_name}")
+
+
+def clamp_timeout(timeout: float, deadline: Optional[float]) -> float:
+    """A per-call timeout shortened so the call cannot outlive the deadline."""
+    left = remaining(deadline)
+    return timeout if left is None else min(timeout, left)
@@ -0,0 +1,125 @@
+"""
+Request Profiler - run a single request under cProfile on demand
+When one /api/score-assessment or /api/match-application call is slow, send it
+again with:
+
+    X-Profile: 1
+    X-Admin-Token: <AI_SERVICE_ADMIN_TOKEN>
+
+The request runs under cProfile (its blocking work runs inline on the request
+thread instead of the worker pools, so the profile sees it) and the response
+carries an X-Profile-Id header. Fetch the artifact from the admin endpoint:
+
+    GET /api/admin/profiles/<id>              - pstats file (snakeviz, pstats.Stats)
+    GET /api/admin/profiles/<id>?format=text  - top functions by cumulative time
+    GET /api/admin/profiles                   - recent profiles
+
+Requests without the header only pay for one header lookup. Without an admin
+token the header is ignored.
+
+Artifacts are written to AI_SERVICE_PROFILE_DIR (default: <tmp>/ai-service-profiles);
+the newest AI_SERVICE_PROFILE_KEEP profiles are kept.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from service_pools import set_inline
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+PROFILE_DIR = os.getenv("AI_SERVICE_PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "ai-service-profiles")
+MAX_STORED_PROFILES = int(os.getenv("AI_SERVICE_PROFILE_KEEP", 50))
+TOP_FUNCTIONS = 40
+
+_PROFILE_ID = re.compile(r"^[0-9a-f]{16}$")
+
+
+def wants_profile(header_value: Optional[str]) -> bool:
+    return bool(header_value) and header_value.lower() in ("1", "true", "yes")
+
+
+class RequestProfile:
+    """
+    cProfile session for one request (start and stop on the request thread).
+
+    Args:
+        endpoint: Route pattern (stored with the artifact)
+    """
+
+    def __init__(self, endpoint: str):
+        self.profile_id = uuid.uuid4().hex[:16]
+        self.endpoint = endpoint
+        self._profiler = cProfile.Profile()
+        self._start = 0.0
+
+    def start(self) -> None:
+        set_inline(True)
+        self._start = time.perf_counter()
+        self._profiler.enable()
+
+    def stop(self, status: Optional[int] = None) -> str:
+        """Stop profiling and write the artifacts; returns the .prof path."""
+        self._profiler.disable()
+        set_inline(False)
+        elapsed = time.perf_counter() - self._start
+
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{self.profile_id}.prof")
+        self._profiler.dump_stats(path)
+
+        report = io.StringIO()
+        report.write(f"{self.endpoint} status={status} wall={elapsed * 1000:.1f}ms\n\n")
+        stats = pstats.Stats(self._profiler, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+        with open(os.path.join(PROFILE_DIR, f"{self.profile_id}.txt"), "w") as f:
+            f.write(report.getvalue())
+
+        _prune()
+        return path
+
+
+def _prune() -> None:
+    """Keep only the newest MAX_STORED_PROFILES profiles."""
+    profiles = sorted(
+        (os.path.join(PROFILE_DIR, name) for name in os.listdir(PROFILE_DIR) if name.endswith(".prof")),
+        key=os.path.getmtime
+    )
+    for path in profiles[:max(0, len(profiles) - MAX_STORED_PROFILES)]:
+        for artifact in (path, path[:-len(".prof")] + ".txt"):
+            try:
+                os.remove(artifact)
+            except FileNotFoundError:
+                pass
+
+
+def profile_artifact(profile_id: str, fmt: str = "pstats") -> Optional[str]:
+    """Path of a stored artifact ("pstats" or "text"), or None if unknown."""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.{'txt' if fmt == 'text' else 'prof'}")
+    return path if os.path.exists(path) else None
+
+
+def list_profiles() -> List[Dict]:
+    """Stored profiles, newest first: [{profile_id, created_at, summary}]."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(PROFILE_DIR):
+        if not name.endswith(".txt"):
+            continue
+        path = os.path.join(PROFILE_DIR, name)
+        with open(path) as f:
+            summary = f.readline().strip()
+        profiles.append({"profile_id": name[:-4], "created_at": os.path.getmtime(path), "summary": summary})
+    profiles.sort(key=lambda p: p["created_at"], reverse=True)
+    return profiles
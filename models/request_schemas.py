@@ -0,0 +1,232 @@
+"""
+Request Schemas - typed, precompiled request bodies for ai_service endpoints
+Each endpoint's JSON body is described once as a msgspec Struct and decoded
+straight from the request bytes by a decoder built at import time. Decoding
+and validation (types, required fields, enums, ranges) happen in one pass in
+C, without building an intermediate dict and digging through it with
+data.get(...) chains. Unknown fields are ignored, so clients may send more
+than an endpoint reads.
+
+Per-item fields of bulk requests (items, submissions) stay loosely typed on
+purpose: a bad item gets its own error result instead of failing the batch.
+
+Benchmark: python tests/benchmark_request_schemas.py
+"""
+
+from typing import Annotated, Any, Dict, List, Literal, Optional, Type, TypeVar, Union
+
+import msgspec
+from msgspec import Meta, Struct, field
+
+T = TypeVar("T", bound=Struct)
+
+NonEmptyStr = Annotated[str, Meta(min_length=1)]
+Count = Annotated[int, Meta(ge=0, le=100)]
+Minutes = Annotated[int, Meta(ge=1, le=600)]
+# 0-1 or the backend's 0-100 scale (normalized by the endpoint)
+Threshold = Annotated[float, Meta(ge=0, le=100)]
+
+
+class RequestValidationError(ValueError):
+    """Request body missing, malformed or failing schema validation."""
+
+
+# ============================================================================
+# RESUME MATCHING
+# ============================================================================
+
+class MatchApplicationRequest(Struct):
+    jd_text: NonEmptyStr
+    resume_text: NonEmptyStr
+    min_score_threshold: Threshold = 0.50
+
+
+class MatchApplicationsRequest(Struct):
+    """Either items=[{jd_text, resume_text, min_score_threshold?}] or jd_text + resume_texts."""
+    items: Optional[List[Any]] = None
+    jd_text: Optional[str] = None
+    resume_texts: Optional[List[str]] = None
+    min_score_threshold: Threshold = 0.50
+
+
+class EmbeddingsRequest(Struct):
+    """texts=[str] (or a single text) to encode; format/dtype select the wire encoding."""
+    texts: Optional[List[NonEmptyStr]] = None
+    text: Optional[NonEmptyStr] = None
+    format: Literal["raw", "msgpack", "json"] = "raw"
+    dtype: Literal["float32", "float16"] = "float32"
+
+
+# ============================================================================
+# ASSESSMENTS
+# ============================================================================
+
+class SectionSpec(Struct):
+    """One section of the nested "sections" format (unset fields use the flat values)."""
+    total_time_minutes: Optional[Minutes] = None
+    question_count: Optional[Count] = None
+    topic: Optional[str] = None
+
+
+class SectionsSpec(Struct):
+    mcq: SectionSpec = field(default_factory=SectionSpec)
+    subjective: SectionSpec = field(default_factory=SectionSpec)
+    coding: SectionSpec = field(default_factory=SectionSpec)
+
+
+class AssessmentRequest(Struct):
+    """Body of /api/generate-assessment and /api/assessment-jobs (sections or flat format)."""
+    api_key: Optional[str] = None
+    experience_years: Union[int, float] = 2
+    experience_level: Literal["Junior", "Mid", "Senior"] = "Mid"
+    difficulty: Literal["Easy", "Medium", "Hard"] = "Medium"
+    sections: Optional[SectionsSpec] = None
+    # Flat format
+    mcq_count: Count = 15
+    mcq_time_minutes: Minutes = 20
+    descriptive_count: Count = 10
+    descriptive_time_minutes: Minutes = 30
+    dsa_count: Count = 2
+    dsa_time_minutes: Minutes = 120
+    # Question matching context (aliases accepted from older clients; null = not sent)
+    job_description: Optional[str] = None
+    description: Optional[str] = None
+    jd_text: Optional[str] = None
+    resume_text: Optional[str] = None
+    resumeText: Optional[str] = None
+
+    @property
+    def job_description_text(self) -> str:
+        return self.job_description or self.description or self.jd_text or ""
+
+    @property
+    def resume(self) -> str:
+        return self.resume_text or self.resumeText or ""
+
+    def to_config(self) -> Dict[str, Any]:
+        """generate_assessment() config; nested section values win over flat ones."""
+        sections = self.sections or SectionsSpec()
+
+        def section(spec: SectionSpec, minutes: int, count: int, topic: Optional[str] = None) -> Dict[str, Any]:
+            config = {
+                "total_time_minutes": spec.total_time_minutes if spec.total_time_minutes is not None else minutes,
+                "question_count": spec.question_count if spec.question_count is not None else count
+            }
+            if topic is not None:
+                # Topics are only configurable in the sections format
+                config["topic"] = (spec.topic or topic) if self.sections else topic
+            return config
+
+        return {
+            "experience_years": self.experience_years,
+            "experience_level": self.experience_level,
+            "difficulty": self.difficulty,
+            "sections": {
+                "mcq": section(sections.mcq, self.mcq_time_minutes, self.mcq_count),
+                "subjective": section(
+                    sections.subjective, self.descriptive_time_minutes, self.descriptive_count, "SQL"
+                ),
+                "coding": section(sections.coding, self.dsa_time_minutes, self.dsa_count, "DSA")
+            }
+        }
+
+
+class ScoreAssessmentRequest(Struct):
+    questions: Annotated[List[Dict[str, Any]], Meta(min_length=1)]
+    answers: Optional[Dict[str, Any]] = None
+
+
+class ScoreAssessmentsRequest(Struct):
+    """Bulk scoring: shared questions, or questions per submission."""
+    submissions: Annotated[List[Any], Meta(min_length=1)]
+    questions: Optional[List[Dict[str, Any]]] = None
+
+
+class ExecuteCodeRequest(Struct):
+    code: NonEmptyStr
+    test_cases: Annotated[List[Dict[str, Any]], Meta(min_length=1)]
+    language: str = "python"
+
+
+# ============================================================================
+# JOB DESCRIPTIONS AND CLUSTERING
+# ============================================================================
+
+class AnalyzeJDRequest(Struct):
+    job_description: Optional[str] = None
+    jd_text: Optional[str] = None
+    text: Optional[str] = None
+
+    @property
+    def jd(self) -> Optional[str]:
+        return self.job_description or self.jd_text or self.text
+
+
+class ClusterApplicantsRequest(Struct):
+    embeddings: Optional[List[List[float]]] = None
+    resume_texts: Optional[List[str]] = None
+    n_clusters: Annotated[int, Meta(ge=1)] = 8
+    top_skills: Annotated[int, Meta(ge=0)] = 5
+
+
+class AssignApplicantsRequest(Struct):
+    model_state: Dict[str, Any]
+    embeddings: Optional[List[List[float]]] = None
+    resume_texts: Optional[List[str]] = None
+    update_centroids: bool = False
+
+
+class _TimeoutField(Struct):
+    timeout_seconds: Any = None
+
+
+# Decoders are built once; msgspec compiles the validation plan per type
+_DECODERS = {
+    schema: msgspec.json.Decoder(schema)
+    for schema in (
+        MatchApplicationRequest, MatchApplicationsRequest, EmbeddingsRequest, AssessmentRequest, ScoreAssessmentRequest,
+        ScoreAssessmentsRequest, ExecuteCodeRequest, AnalyzeJDRequest, ClusterApplicantsRequest,
+        AssignApplicantsRequest, _TimeoutField
+    )
+}
+
+
+def decode_request(schema: Type[T], body: bytes) -> T:
+    """
+    Decode and validate a JSON request body.
+
+    Args:
+        schema: Request Struct type
+        body: Raw request bytes (request.get_data())
+
+    Returns:
+        Schema instance
+
+    Raises:
+        RequestValidationError: Empty body, invalid JSON or schema mismatch
+                                (message names the offending field path)
+    """
+    if not body:
+        raise RequestValidationError("Request body is required")
+    decoder = _DECODERS.get(schema)
+    if decoder is None:
+        decoder = _DECODERS.setdefault(schema, msgspec.json.Decoder(schema))
+    try:
+        return decoder.decode(body)
+    except msgspec.ValidationError as e:
+        raise RequestValidationError(str(e))
+    except msgspec.DecodeError as e:
+        raise RequestValidationError(f"Malformed JSON: {e}")
+
+
+def peek_timeout(body: bytes) -> Any:
+    """
+    The "timeout_seconds" field of a JSON object body, or None.
+
+    Other fields are skipped without being materialized, so this is cheap to
+    run before the endpoint decodes the full body.
+    """
+    try:
+        return _DECODERS[_TimeoutField].decode(body).timeout_seconds
+    except msgspec.MsgspecError:
+        return None
@@ -0,0 +1,358 @@
+"""
+Request Tracing - per-request spans in the OpenTelemetry data model
+Every request gets a SERVER span named after its endpoint, and every
+service_metrics.stage() that runs while the request is being served becomes a
+child span (pdf_extraction_pdfplumber, encoding, gemini_generate,
+code_execution_subprocess, sql_verification, ...). Stages inside stages nest.
+Stages that ran in a process-pool worker are replayed as spans with their
+real start times, and work handed to pool threads or background assessment
+jobs keeps the request's span as its parent.
+
+Trace and request ids come from the caller, so the backend's logs, the
+service's logs and the spans can be joined offline:
+
+    traceparent: 00-<trace_id>-<parent_span_id>-01   (W3C; continues the caller's trace)
+    X-Request-Id: <id>                               (a UUID is used as the trace id)
+
+Without either header, ids are generated. X-Request-Id is echoed on every
+response and added to log lines as "request_id".
+
+Spans are exported by a writer thread as OTLP/JSON lines (one
+ExportTraceServiceRequest per line, the format of the OpenTelemetry
+Collector's otlpjsonfile receiver and file exporter), to stdout or a file.
+Export never blocks a request: spans that do not fit in the queue are
+dropped and counted in ai_service_trace_spans_dropped_total.
+
+Environment:
+    AI_SERVICE_TRACE_EXPORT       - "stdout" or a file path (default: off)
+    AI_SERVICE_TRACE_SAMPLE       - fraction of requests traced without a sampled
+                                    traceparent (default: 1.0)
+    AI_SERVICE_TRACE_QUEUE_SIZE   - spans buffered for the writer (default: 10000)
+"""
+
+import atexit
+import contextvars
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import g, has_request_context
+
+from response_encoding import dumps
+from service_metrics import Counter, set_stage_tracer
+
+TRACE_EXPORT = os.getenv("AI_SERVICE_TRACE_EXPORT")
+TRACE_SAMPLE_RATE = float(os.getenv("AI_SERVICE_TRACE_SAMPLE", 1.0))
+TRACE_QUEUE_SIZE = int(os.getenv("AI_SERVICE_TRACE_QUEUE_SIZE", 10000))
+
+REQUEST_ID_HEADER = "X-Request-Id"
+TRACEPARENT_HEADER = "traceparent"
+SERVICE_NAME = "ai-service"
+SCOPE_NAME = "ai_service.request_tracing"
+
+# OTLP enum values
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+# Spans written per OTLP line
+EXPORT_BATCH = 512
+
+SPANS_DROPPED_TOTAL = Counter(
+    "ai_service_trace_spans_dropped_total", "Trace spans dropped because the export queue was full"
+)
+
+_TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_HEX_ID = re.compile(r"^[0-9a-f]{32}$")
+
+# Innermost open span on this thread (the request's span is found through g)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """W3C traceparent -> (trace_id, parent_span_id, sampled), or None if absent/invalid."""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if match is None or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+
+
+def resolve_request_id(header: Optional[str]) -> str:
+    """The caller's X-Request-Id, or a new one."""
+    header = (header or "").strip()
+    return header[:128] if header else uuid.uuid4().hex
+
+
+def trace_id_for_request(request_id: str) -> str:
+    """A UUID request id doubles as the trace id; anything else gets a random one."""
+    candidate = request_id.replace("-", "").lower()
+    return candidate if _HEX_ID.match(candidate) and candidate != "0" * 32 else _new_id(16)
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    """OTLP/JSON KeyValue (int64 values are strings in proto3 JSON)."""
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Span:
+    """One timed operation (OpenTelemetry span fields)."""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_span_id", "name", "kind",
+        "start_ns", "end_ns", "attributes", "status_code", "status_message", "_token"
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str] = None,
+                 kind: int = SPAN_KIND_INTERNAL, start_ns: Optional[int] = None):
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = {}
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = message
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status_code}
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+def current_span() -> Optional[Span]:
+    """Innermost open span: a stage on this thread, else the request's span."""
+    span = _current_span.get()
+    if span is None and has_request_context():
+        span = g.get('trace_span')
+    return span
+
+
+def propagate_span(fn: Callable) -> Callable:
+    """
+    fn wrapped to run under the caller's current span, for work handed to
+    another thread (pool threads and background jobs have no request context).
+    """
+    span = current_span()
+    if span is None:
+        return fn
+
+    def run(*args, **kwargs):
+        token = _current_span.set(span)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+    return run
+
+
+class SpanExporter:
+    """
+    Writes finished spans as OTLP/JSON lines from a background thread.
+
+    Args:
+        target: "stdout" or a file path (appended to)
+        queue_size: Spans buffered for the writer
+    """
+
+    def __init__(self, target: str, queue_size: int = TRACE_QUEUE_SIZE):
+        self.target = target
+        self.queue_size = queue_size
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._resource: Dict[str, Any] = {}
+
+    def start(self) -> None:
+        # process.pid tells gunicorn workers apart
+        self._resource = {"attributes": [
+            _attribute("service.name", SERVICE_NAME), _attribute("process.pid", os.getpid())
+        ]}
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            SPANS_DROPPED_TOTAL.inc()
+
+    def encode(self, spans: List[Span]) -> bytes:
+        """One ExportTraceServiceRequest."""
+        return dumps({"resourceSpans": [{
+            "resource": self._resource,
+            "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": [span.to_otlp() for span in spans]}]
+        }]})
+
+    def _write(self, line: bytes) -> None:
+        if self.target == "stdout":
+            sys.stdout.write(line.decode("utf-8") + "\n")
+            sys.stdout.flush()
+        else:
+            with open(self.target, "ab") as f:
+                f.write(line + b"\n")
+
+    def _run(self) -> None:
+        while True:
+            span = self._queue.get()
+            stopping = span is None
+            batch = [] if stopping else [span]
+            while len(batch) < EXPORT_BATCH:
+                try:
+                    span = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if span is None:
+                    stopping = True
+                    break
+                batch.append(span)
+            if batch:
+                try:
+                    self._write(self.encode(batch))
+                except (OSError, ValueError) as e:
+                    sys.stderr.write(f"Trace export failed: {e}\n")
+            if stopping:
+                return
+
+    def stop(self) -> None:
+        """Write out queued spans and stop the writer thread."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    def restart_after_fork(self) -> None:
+        # The writer thread does not survive fork(); gunicorn workers need their own
+        self._queue = queue.Queue(self.queue_size)
+        self.start()
+
+
+class Tracer:
+    """
+    Creates request and stage spans and hands finished ones to the exporter.
+
+    Args:
+        exporter: Receives every finished span
+        sample_rate: Fraction of requests traced when the caller did not decide
+    """
+
+    def __init__(self, exporter: SpanExporter, sample_rate: float = TRACE_SAMPLE_RATE):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def start_request(self, name: str, request_id: str, traceparent: Optional[str] = None,
+                      attributes: Optional[Dict[str, Any]] = None) -> Optional[Span]:
+        """The request's SERVER span, or None when the request is not sampled."""
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_span_id, sampled = parent
+        else:
+            trace_id, parent_span_id = trace_id_for_request(request_id), None
+            sampled = random.random() < self.sample_rate
+        if not sampled:
+            return None
+        span = Span(name, trace_id, parent_span_id, SPAN_KIND_SERVER)
+        span.set_attribute("request.id", request_id)
+        for key, value in (attributes or {}).items():
+            span.set_attribute(key, value)
+        return span
+
+    def end_request(self, span: Span, status: Optional[int], error: Optional[BaseException] = None) -> None:
+        if status is not None:
+            span.set_attribute("http.response.status_code", status)
+        if error is not None:
+            span.set_error(f"{type(error).__name__}: {error}")
+        elif status is None or status >= 500:
+            span.set_error(f"HTTP {status or 500}")
+        self._finish(span)
+
+    # -- stage hooks (service_metrics.stage) -----------------------------------
+
+    def start_span(self, name: str) -> Optional[Span]:
+        """Child of the current span (None outside a traced request: no orphan traces)."""
+        parent = current_span()
+        if parent is None:
+            return None
+        span = Span(name, parent.trace_id, parent.span_id)
+        span._token = _current_span.set(span)
+        return span
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None) -> None:
+        _current_span.reset(span._token)
+        span._token = None
+        if error is not None:
+            span.set_error(f"{type(error).__name__}: {error}")
+        self._finish(span)
+
+    def record_span(self, name: str, start_ns: int, seconds: float, failed: bool) -> None:
+        """A stage measured elsewhere (process-pool worker), as a child of the current span."""
+        parent = current_span()
+        if parent is None:
+            return
+        span = Span(name, parent.trace_id, parent.span_id, start_ns=start_ns)
+        if failed:
+            span.set_error("stage failed")
+        span.end_ns = start_ns + int(seconds * 1e9)
+        self.exporter.export(span)
+
+    def _finish(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        self.exporter.export(span)
+
+
+# Global tracer (one per service process)
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Optional[Tracer]:
+    """The tracer, or None when AI_SERVICE_TRACE_EXPORT is not set."""
+    global _tracer
+    if _tracer is not None or not TRACE_EXPORT:
+        return _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            exporter = SpanExporter(TRACE_EXPORT)
+            exporter.start()
+            atexit.register(exporter.stop)
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=exporter.restart_after_fork)
+            _tracer = Tracer(exporter)
+            set_stage_tracer(_tracer)
+        return _tracer
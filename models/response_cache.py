@@ -0,0 +1,212 @@
+"""
+Response Cache - LRU + TTL cache for deterministic endpoints
+/api/analyze-jd and /api/match-application are pure functions of their inputs,
+and the backend often re-sends identical payloads (retries, page reloads,
+re-evaluation). Cached responses skip model loading, encoding and regex work.
+
+Keys are a SHA-256 of the canonicalized request (sorted-key compact JSON) plus
+a version string (model name / skill dictionary version), so a model or
+dictionary change never serves stale results.
+
+Tiers:
+- memory: bounded OrderedDict LRU (AI_SERVICE_CACHE_SIZE entries per endpoint)
+- disk:   optional JSON files under AI_SERVICE_CACHE_DIR (shared by all workers
+          on the instance, survives restarts)
+
+Hits and misses are exported at /metrics (ai_service_cache_requests_total).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from memory_report import deep_sizeof
+from service_metrics import record_cache_lookup
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("AI_SERVICE_CACHE_SIZE", 1024))
+DEFAULT_TTL_SECONDS = float(os.getenv("AI_SERVICE_CACHE_TTL", 3600))
+
+
+def make_cache_key(payload: Any, version: str) -> str:
+    """
+    Canonical cache key for a request payload.
+
+    Args:
+        payload: JSON-serializable request fields that determine the response
+        version: Model / dictionary version the response depends on
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(f"{version}\0{canonical}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Bounded in-memory LRU with per-entry TTL and an optional on-disk tier.
+
+    Args:
+        name: Cache name (metric label)
+        max_entries: Memory tier capacity (0 disables the cache)
+        ttl_seconds: Entry lifetime
+        disk_dir: Directory for the disk tier (None = memory only)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        disk_dir: Optional[str] = None
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = os.path.join(disk_dir, name) if disk_dir else None
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[tuple]:
+        path = self._disk_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+        return entry["expires_at"], entry["value"]
+
+    def _write_disk(self, key: str, expires_at: float, value: Any) -> None:
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"expires_at": expires_at, "value": value}, f)
+            # Atomic rename: concurrent readers never see a half-written entry
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _store(self, key: str, expires_at: float, value: Any) -> None:
+        """Insert into the memory tier (caller holds the lock)."""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for key, or None on a miss (or expired entry)."""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    record_cache_lookup(self.name, True)
+                    return entry[1]
+                del self._entries[key]
+
+        entry = self._read_disk(key) if self.disk_dir else None
+        with self._lock:
+            if entry is not None:
+                self._store(key, *entry)
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+        record_cache_lookup(self.name, entry is not None)
+        return entry[1] if entry is not None else None
+
+    def put(self, key: str, value: Any) -> None:
+        """Cache a JSON-serializable response value."""
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._store(key, expires_at, value)
+        if self.disk_dir:
+            self._write_disk(key, expires_at, value)
+
+    def clear(self) -> None:
+        """Drop every memory-tier entry (disk entries expire by TTL)."""
+        with self._lock:
+            self._entries.clear()
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the memory tier."""
+        with self._lock:
+            return deep_sizeof(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "disk_tier": self.disk_dir is not None,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+            }
+
+
+# Global caches (one per endpoint, created lazily)
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(name: str) -> ResponseCache:
+    """Get (or create) the named response cache, configured from the environment."""
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = ResponseCache(name, disk_dir=os.getenv("AI_SERVICE_CACHE_DIR") or None)
+        return _caches[name]
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics for every response cache created so far."""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+def get_cache_memory() -> Dict[str, int]:
+    """Approximate memory-tier bytes for every response cache created so far."""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {name: cache.memory_bytes() for name, cache in caches.items()}
@@ -0,0 +1,143 @@
+"""
+Response Encoding - fast JSON serialization and negotiated compression
+Scoring responses embed every test's input, expected and actual value (DSA test
+cases carry 10,000-element arrays), so serialization and bytes on the wire
+dominate /api/score-assessment once scoring itself is done.
+
+- JSON: orjson-backed Flask JSON provider (every jsonify() call uses it);
+  falls back to the stdlib encoder when orjson is missing or cannot encode a
+  value (e.g. integers beyond 64 bits)
+- Compression: gzip or zstd (when the zstandard package is installed),
+  negotiated from Accept-Encoding, for JSON/text bodies above
+  AI_SERVICE_COMPRESS_MIN_BYTES
+
+Benchmark: python tests/benchmark_serialization.py
+"""
+
+import gzip
+import json
+import os
+from typing import Any, Optional
+
+from flask import Flask, Response, request
+from flask.json.provider import DefaultJSONProvider
+
+from service_metrics import stage
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+COMPRESS_MIN_BYTES = int(os.getenv("AI_SERVICE_COMPRESS_MIN_BYTES", 2048))
+GZIP_LEVEL = int(os.getenv("AI_SERVICE_GZIP_LEVEL", 5))
+ZSTD_LEVEL = int(os.getenv("AI_SERVICE_ZSTD_LEVEL", 3))
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/plain"}
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize obj to compact UTF-8 JSON.
+
+    Uses orjson when available (numpy scalars/arrays included); values orjson
+    rejects fall back to the stdlib encoder with Flask's default conversions.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=DefaultJSONProvider.default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # orjson.JSONEncodeError subclasses TypeError
+            pass
+    return json.dumps(
+        obj, default=DefaultJSONProvider.default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with dumps() above."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if ORJSON_AVAILABLE and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        with stage("json_serialization"):
+            body = dumps(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """
+    Pick a content encoding from the request's Accept-Encoding.
+
+    Args:
+        accept_encodings: werkzeug Accept object (request.accept_encodings)
+
+    Returns:
+        "zstd", "gzip" or None (identity)
+    """
+    candidates = ["zstd", "gzip"] if ZSTD_AVAILABLE else ["gzip"]
+    best, best_quality = None, 0
+    for encoding in candidates:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a response body with "zstd" or "gzip"."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def compress_response(response: Response) -> Response:
+    """after_request hook: compress large JSON/text bodies the client accepts."""
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    with stage(f"response_compression_{encoding}"):
+        response.set_data(compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_app(app: Flask) -> None:
+    """Install the fast JSON provider and response compression on a Flask app."""
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
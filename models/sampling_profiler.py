@@ -0,0 +1,205 @@
+"""
+Sampling Profiler - continuous, low-overhead CPU profile per endpoint
+A background thread wakes AI_SERVICE_SAMPLER_HZ times a second (default 100),
+reads the current Python stack of every thread that is serving a request
+(sys._current_frames) and counts it under that request's endpoint. Nothing
+runs on the request threads themselves apart from registering the thread at
+the start and end of a request, so the cost stays flat however hot the code
+is. The sampler's own CPU time is reported so the overhead can be checked.
+
+Stacks are kept in collapsed form ("file:function;file:function <count>"),
+which flamegraph.pl, speedscope and inferno read directly:
+
+    GET    /api/admin/flamegraph                  - all endpoints (endpoint is the root frame)
+    GET    /api/admin/flamegraph?endpoint=/api/x  - one endpoint
+    GET    /api/admin/sampler                     - sample counts, memory use, overhead
+    DELETE /api/admin/flamegraph                  - start a new window
+
+Memory is bounded by AI_SERVICE_SAMPLER_MAX_BYTES (estimated size of the
+distinct stacks kept): once the budget is spent, samples with stacks not
+seen before are counted under "[truncated]" for their endpoint.
+
+Work offloaded to the worker pools (ASGI mode) runs on pool threads or
+processes and is not attributed to an endpoint; only the request thread's
+time (including time spent waiting for the pool) is.
+
+Environment:
+    AI_SERVICE_SAMPLER=1              - enable (default: off)
+    AI_SERVICE_SAMPLER_HZ             - samples per second (default: 100)
+    AI_SERVICE_SAMPLER_MAX_BYTES      - stack memory budget (default: 8 MB)
+    AI_SERVICE_SAMPLER_MAX_DEPTH      - frames kept per stack, leaf side (default: 96)
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+SAMPLE_RATE_HZ = float(os.getenv("AI_SERVICE_SAMPLER_HZ", 100))
+MAX_STACK_BYTES = int(os.getenv("AI_SERVICE_SAMPLER_MAX_BYTES", 8 * 1024 * 1024))
+MAX_STACK_DEPTH = int(os.getenv("AI_SERVICE_SAMPLER_MAX_DEPTH", 96))
+
+TRUNCATED_STACK = "[truncated]"
+# Rough per-entry cost of a dict slot, int and str header beyond the characters
+STACK_OVERHEAD_BYTES = 120
+
+
+def sampler_enabled() -> bool:
+    return os.getenv("AI_SERVICE_SAMPLER", "0").lower() in ("1", "true", "yes")
+
+
+def collapse_stack(frame, max_depth: int = MAX_STACK_DEPTH) -> str:
+    """Root-to-leaf "file:function;..." for a frame (deepest max_depth frames)."""
+    names = []
+    while frame is not None and len(names) < max_depth:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+class SamplingProfiler:
+    """
+    Thread-based stack sampler attributing samples to request endpoints.
+
+    Args:
+        rate_hz: Samples per second
+        max_bytes: Budget for distinct stacks kept (estimated)
+    """
+
+    def __init__(self, rate_hz: float = SAMPLE_RATE_HZ, max_bytes: int = MAX_STACK_BYTES):
+        self.interval = 1.0 / max(1.0, rate_hz)
+        self.max_bytes = max_bytes
+        self._threads: Dict[int, str] = {}
+        self._stacks: Dict[str, Dict[str, int]] = {}
+        self._bytes = 0
+        self.samples = 0
+        self.truncated = 0
+        self.cpu_seconds = 0.0
+        self.window_start = time.time()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- request threads -----------------------------------------------------
+
+    def bind(self, endpoint: str) -> int:
+        """Attribute the calling thread's samples to endpoint until unbind(); returns the thread id."""
+        thread_id = threading.get_ident()
+        self._threads[thread_id] = endpoint
+        return thread_id
+
+    def unbind(self, thread_id: int) -> None:
+        self._threads.pop(thread_id, None)
+
+    # -- sampling ------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            start = time.thread_time()
+            self.sample_once()
+            self.cpu_seconds += time.thread_time() - start
+
+    def sample_once(self) -> None:
+        """Take one sample of every bound thread."""
+        frames = sys._current_frames()
+        for thread_id, endpoint in list(self._threads.items()):
+            frame = frames.get(thread_id)
+            if frame is not None:
+                self._add(endpoint, collapse_stack(frame))
+
+    def _add(self, endpoint: str, stack: str) -> None:
+        with self._lock:
+            counts = self._stacks.setdefault(endpoint, {})
+            if stack not in counts:
+                cost = len(stack) + STACK_OVERHEAD_BYTES
+                if self._bytes + cost > self.max_bytes:
+                    self.truncated += 1
+                    stack = TRUNCATED_STACK
+                    cost = 0 if stack in counts else len(stack) + STACK_OVERHEAD_BYTES
+                self._bytes += cost
+            counts[stack] = counts.get(stack, 0) + 1
+            self.samples += 1
+
+    # -- export --------------------------------------------------------------
+
+    def collapsed(self, endpoint: Optional[str] = None) -> str:
+        """
+        Collapsed stacks, one "frames count" line each.
+
+        Args:
+            endpoint: Only this endpoint's stacks; otherwise every endpoint,
+                      with the endpoint as the root frame
+        """
+        with self._lock:
+            if endpoint is not None:
+                lines = [f"{stack} {count}" for stack, count in self._stacks.get(endpoint, {}).items()]
+            else:
+                lines = [
+                    f"{name};{stack} {count}"
+                    for name, counts in self._stacks.items()
+                    for stack, count in counts.items()
+                ]
+        lines.sort()
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks = {}
+            self._bytes = 0
+            self.samples = 0
+            self.truncated = 0
+            self.cpu_seconds = 0.0
+            self.window_start = time.time()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            elapsed = max(1e-9, time.time() - self.window_start)
+            return {
+                "rate_hz": round(1.0 / self.interval, 1),
+                "window_seconds": round(elapsed, 1),
+                "samples": self.samples,
+                "samples_by_endpoint": {
+                    name: sum(counts.values()) for name, counts in self._stacks.items()
+                },
+                "distinct_stacks": sum(len(counts) for counts in self._stacks.values()),
+                "stack_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "truncated_samples": self.truncated,
+                "sampler_cpu_seconds": round(self.cpu_seconds, 3),
+                "overhead_ratio": round(self.cpu_seconds / elapsed, 5)
+            }
+
+
+# Global sampler (one per service process; started on first use so gunicorn
+# workers each start their own thread after fork)
+_sampler: Optional[SamplingProfiler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampling_profiler() -> Optional[SamplingProfiler]:
+    """The running sampler, or None when AI_SERVICE_SAMPLER is off."""
+    global _sampler
+    if _sampler is not None:
+        return _sampler
+    if not sampler_enabled():
+        return None
+    with _sampler_lock:
+        if _sampler is None:
+            sampler = SamplingProfiler()
+            sampler.start()
+            _sampler = sampler
+        return _sampler
@@ -0,0 +1,245 @@
+"""
+Service Logging - structured, non-blocking logging for the AI service
+Request handlers used to print() banners, whole assessment configs and
+tracebacks straight to stdout; under load those writes block the request
+thread whenever the pipe to the log collector is slow. Instead, every module
+logs through the standard logging module and the root logger has a single
+QueueHandler: the request thread only filters the record and puts it on a
+bounded in-memory queue, and a background writer thread formats it (JSON
+serialization, traceback rendering) and writes it out.
+
+If the writer falls behind and the queue fills, records are dropped rather
+than blocking requests; drops are counted in ai_service_log_records_dropped_total.
+
+Output is one JSON object per line:
+    {"ts": ..., "level": "INFO", "logger": "ai_service", "msg": "...",
+     "endpoint": "/api/score-assessment", "request_id": "<X-Request-Id>",
+     <extra fields>, "exc": "<traceback>"}
+
+Level control and sampling, per endpoint (records logged outside a request
+use the global settings; WARNING and above are never sampled out):
+
+    AI_SERVICE_LOG_LEVEL=INFO
+    AI_SERVICE_LOG_LEVELS=/api/execute-code=DEBUG,/api/score-assessment=WARNING
+    AI_SERVICE_LOG_SAMPLE=/api/match-application=0.1,*=1.0
+
+Sampling is decided once per request, so a sampled request keeps all its lines.
+
+Environment:
+    AI_SERVICE_LOG_LEVEL        - default level (default: INFO)
+    AI_SERVICE_LOG_LEVELS       - per-endpoint levels, endpoint=LEVEL,...
+    AI_SERVICE_LOG_SAMPLE       - per-endpoint sample rates for INFO/DEBUG (* = default, 1.0)
+    AI_SERVICE_LOG_FORMAT       - json (default) or text
+    AI_SERVICE_LOG_QUEUE_SIZE   - records buffered for the writer (default: 10000)
+
+Benchmark: python tests/benchmark_logging.py
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from typing import Dict, Optional
+
+from flask import g, has_request_context
+
+from response_encoding import dumps
+from service_metrics import Counter, Gauge, register_collector
+
+LOG_QUEUE_SIZE = int(os.getenv("AI_SERVICE_LOG_QUEUE_SIZE", 10000))
+
+LOG_RECORDS_DROPPED_TOTAL = Counter(
+    "ai_service_log_records_dropped_total", "Log records dropped because the writer queue was full"
+)
+LOG_QUEUE_DEPTH = Gauge(
+    "ai_service_log_queue_depth", "Log records waiting for the writer thread"
+)
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "endpoint", "request_id"
+}
+
+
+def _parse_mapping(spec: Optional[str]) -> Dict[str, str]:
+    """"a=1,b=2" -> {"a": "1", "b": "2"} (blank entries ignored)."""
+    mapping = {}
+    for entry in (spec or "").split(","):
+        if "=" in entry:
+            key, value = entry.rsplit("=", 1)
+            mapping[key.strip()] = value.strip()
+    return mapping
+
+
+def _level(name: str) -> int:
+    level = logging.getLevelName(name.upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level: {name}")
+    return level
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, extra={...} fields included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        for key in ("endpoint", "request_id"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        try:
+            return dumps(entry).decode("utf-8")
+        except TypeError:
+            return dumps({key: value if isinstance(value, (str, int, float)) else str(value)
+                          for key, value in entry.items()}).decode("utf-8")
+
+
+class EndpointFilter(logging.Filter):
+    """
+    Per-endpoint level and sampling, evaluated on the thread that logs.
+
+    Args:
+        default_level: Level outside requests and for unlisted endpoints
+        levels: endpoint -> level
+        sample_rates: endpoint -> fraction of requests whose INFO/DEBUG lines are kept ("*" = default)
+    """
+
+    def __init__(self, default_level: int = logging.INFO, levels: Optional[Dict[str, int]] = None,
+                 sample_rates: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.default_level = default_level
+        self.levels = levels or {}
+        self.sample_rates = dict(sample_rates or {})
+        self.default_rate = self.sample_rates.pop("*", 1.0)
+
+    @property
+    def min_level(self) -> int:
+        """Lowest level any endpoint accepts (the root logger's level)."""
+        return min([self.default_level, *self.levels.values()])
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        endpoint = request_id = None
+        if has_request_context():
+            endpoint = g.get('metrics_endpoint')
+            request_id = g.get('request_id')
+        record.endpoint = endpoint
+        record.request_id = request_id
+        if record.levelno < self.levels.get(endpoint, self.default_level):
+            return False
+        if record.levelno >= logging.WARNING or endpoint is None:
+            return True
+        sampled = g.get('log_sampled')
+        if sampled is None:
+            g.log_sampled = sampled = random.random() < self.sample_rates.get(endpoint, self.default_rate)
+        return sampled
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks and leaves formatting to the writer thread.
+
+    The message is interpolated here (so later changes to its arguments do not
+    show up), but JSON serialization and traceback rendering happen in the writer.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED_TOTAL.inc()
+
+
+class ServiceLogging:
+    """
+    Root-logger setup: filter + non-blocking queue handler + writer thread.
+
+    Args:
+        stream: Where the writer thread writes (default: stdout)
+        log_format: "json" or "text"
+        queue_size: Records buffered for the writer
+    """
+
+    def __init__(self, stream=None, log_format: Optional[str] = None, queue_size: int = LOG_QUEUE_SIZE):
+        self.stream = stream or sys.stdout
+        self.log_format = (log_format or os.getenv("AI_SERVICE_LOG_FORMAT", "json")).lower()
+        self.queue_size = queue_size
+        self.filter = EndpointFilter(
+            _level(os.getenv("AI_SERVICE_LOG_LEVEL", "INFO")),
+            {endpoint: _level(level) for endpoint, level in _parse_mapping(os.getenv("AI_SERVICE_LOG_LEVELS")).items()},
+            {endpoint: float(rate) for endpoint, rate in _parse_mapping(os.getenv("AI_SERVICE_LOG_SAMPLE")).items()}
+        )
+        self.handler: Optional[NonBlockingQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def _output_handler(self) -> logging.Handler:
+        output = logging.StreamHandler(self.stream)
+        if self.log_format == "text":
+            output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(endpoint)s] %(message)s"))
+        else:
+            output.setFormatter(JSONFormatter())
+        return output
+
+    def start(self) -> None:
+        root = logging.getLogger()
+        if self.handler is not None:
+            root.removeHandler(self.handler)
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(self.queue_size)
+        self.handler = NonBlockingQueueHandler(log_queue)
+        self.handler.addFilter(self.filter)
+        self.listener = logging.handlers.QueueListener(log_queue, self._output_handler())
+        self.listener.start()
+        root.addHandler(self.handler)
+        root.setLevel(self.filter.min_level)
+
+    def stop(self) -> None:
+        """Flush the queue and stop the writer thread."""
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+        if self.handler is not None:
+            logging.getLogger().removeHandler(self.handler)
+
+    def restart_after_fork(self) -> None:
+        # The writer thread does not survive fork(); gunicorn workers need their own
+        self.listener = None
+        self.start()
+
+    def queue_depth(self) -> int:
+        return self.handler.queue.qsize() if self.handler is not None else 0
+
+
+# Global logging setup (one per service process)
+_service_logging: Optional[ServiceLogging] = None
+_service_logging_lock = threading.Lock()
+
+
+def configure_logging() -> ServiceLogging:
+    """Install the queue handler on the root logger once per process (idempotent)."""
+    global _service_logging
+    with _service_logging_lock:
+        if _service_logging is None:
+            _service_logging = ServiceLogging()
+            _service_logging.start()
+            atexit.register(_service_logging.stop)
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=_service_logging.restart_after_fork)
+            register_collector(lambda: LOG_QUEUE_DEPTH.set(_service_logging.queue_depth()))
+        return _service_logging
@@ -0,0 +1,317 @@
+"""
+Service Metrics - Prometheus-compatible instrumentation for the AI Service
+Dependency-free counters, gauges and histograms rendered in the Prometheus text
+exposition format (served at GET /metrics by ai_service).
+
+Hot-path cost is one perf_counter() pair, a dict lookup and a short lock per
+observation; rendering happens only when /metrics is scraped.
+
+Stage timings:
+    with stage("encoding"):
+        ...
+
+Metrics are per process: with several gunicorn workers each worker exports its
+own series (scrape each worker, or use ASGI mode with a single worker).
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds: sub-millisecond regex work up to minute-long Gemini runs
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class: a named metric family with fixed label names."""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+        REGISTRY.append(self)
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}"
+        ]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        for labelvalues, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    metric_type = "counter"
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def get(self, *labelvalues: str) -> float:
+        with self._lock:
+            return self._values.get(labelvalues, 0.0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    metric_type = "gauge"
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def get(self, *labelvalues: str) -> float:
+        with self._lock:
+            return self._values.get(labelvalues, 0.0)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (per label set: bucket counts, sum, count)."""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def get_count(self, *labelvalues: str) -> int:
+        with self._lock:
+            state = self._values.get(labelvalues)
+            return state[2] if state else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._values.items())
+        lines = self._header()
+        for labelvalues, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+# Callbacks run at scrape time to refresh gauges derived from other state (pools, caches)
+_COLLECTORS: List[Callable[[], None]] = []
+
+
+def register_collector(callback: Callable[[], None]) -> None:
+    """Register a function that refreshes gauges right before /metrics renders."""
+    _COLLECTORS.append(callback)
+
+
+# ============================================================================
+# SERVICE METRICS
+# ============================================================================
+
+REQUESTS_TOTAL = Counter(
+    "ai_service_requests_total", "HTTP requests by endpoint, method and status",
+    ("endpoint", "method", "status")
+)
+REQUEST_ERRORS_TOTAL = Counter(
+    "ai_service_request_errors_total", "HTTP requests that returned a 5xx status",
+    ("endpoint",)
+)
+REQUEST_DURATION = Histogram(
+    "ai_service_request_duration_seconds", "HTTP request latency by endpoint",
+    ("endpoint",)
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "ai_service_requests_in_flight", "HTTP requests currently being handled",
+    ("endpoint",)
+)
+STAGE_DURATION = Histogram(
+    "ai_service_stage_duration_seconds",
+    "Time spent in processing stages (pdf extraction, tokenization, encoding, gemini, ...)",
+    ("stage",)
+)
+STAGE_ERRORS_TOTAL = Counter(
+    "ai_service_stage_errors_total", "Processing stages that raised an exception",
+    ("stage",)
+)
+MODEL_LOAD_SECONDS = Gauge(
+    "ai_service_model_load_seconds", "Time taken by the last model load",
+    ("model",)
+)
+CACHE_REQUESTS_TOTAL = Counter(
+    "ai_service_cache_requests_total", "Cache lookups by cache and result (hit/miss)",
+    ("cache", "result")
+)
+CACHE_HIT_RATIO = Gauge(
+    "ai_service_cache_hit_ratio", "Cache hits / lookups since start",
+    ("cache",)
+)
+POOL_IN_FLIGHT = Gauge(
+    "ai_service_pool_in_flight", "Tasks submitted to a worker pool and not yet finished",
+    ("pool",)
+)
+POOL_QUEUE_DEPTH = Gauge(
+    "ai_service_pool_queue_depth", "Tasks waiting for a free worker in a pool",
+    ("pool",)
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache hit or miss (hit ratio is derived at scrape time)."""
+    CACHE_REQUESTS_TOTAL.inc(cache, "hit" if hit else "miss")
+
+
+def _refresh_cache_ratios() -> None:
+    caches = {labels[0] for labels in list(CACHE_REQUESTS_TOTAL._values)}
+    for cache in caches:
+        hits = CACHE_REQUESTS_TOTAL.get(cache, "hit")
+        total = hits + CACHE_REQUESTS_TOTAL.get(cache, "miss")
+        CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache)
+
+
+register_collector(_refresh_cache_ratios)
+
+
+# ============================================================================
+# STAGE TIMING
+# ============================================================================
+
+# Set inside process-pool workers: observations are shipped back to the parent
+_captured_stages: Optional[List[Tuple[str, float, bool, int]]] = None
+
+# Set by request_tracing when tracing is enabled: stages also become spans
+_stage_tracer = None
+
+
+def set_stage_tracer(tracer) -> None:
+    """Install the tracer whose start_span()/end_span()/record_span() stages report to."""
+    global _stage_tracer
+    _stage_tracer = tracer
+
+
+class stage:
+    """
+    Time a processing stage (context manager).
+
+    Example:
+        with stage("pdf_extraction_pdfplumber"):
+            text = ...
+    """
+
+    __slots__ = ("name", "_start", "_span")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        tracer = _stage_tracer
+        self._span = tracer.start_span(self.name) if tracer is not None else None
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe_stage(self.name, time.perf_counter() - self._start, failed=exc_type is not None)
+        if self._span is not None:
+            _stage_tracer.end_span(self._span, exc)
+        return False
+
+
+def observe_stage(name: str, seconds: float, failed: bool = False) -> None:
+    """Record a stage duration (and failure) measured elsewhere."""
+    if _captured_stages is not None:
+        # Wall-clock start, so the parent can place the stage on the request's trace
+        _captured_stages.append((name, seconds, failed, time.time_ns() - int(seconds * 1e9)))
+        return
+    STAGE_DURATION.observe(seconds, name)
+    if failed:
+        STAGE_ERRORS_TOTAL.inc(name)
+
+
+def call_capturing_stages(fn: Callable, *args, **kwargs):
+    """
+    Run fn (in a process-pool worker) and return (result, stage observations).
+
+    The parent replays the observations with replay_stages(), so stages timed in
+    child processes still show up in this process's /metrics.
+    """
+    global _captured_stages
+    _captured_stages = []
+    try:
+        return fn(*args, **kwargs), _captured_stages
+    finally:
+        _captured_stages = None
+
+
+def replay_stages(observations: List[Tuple[str, float, bool, int]]) -> None:
+    """Record stage observations captured in another process (and trace them)."""
+    tracer = _stage_tracer
+    for name, seconds, failed, start_ns in observations:
+        observe_stage(name, seconds, failed)
+        if tracer is not None:
+            tracer.record_span(name, start_ns, seconds, failed)
+
+
+def render_metrics() -> str:
+    """Render every registered metric in Prometheus text format."""
+    for collector in _COLLECTORS:
+        collector()
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
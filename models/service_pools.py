@@ -0,0 +1,210 @@
+"""
+Service Worker Pools
+Sized executors that take blocking endpoint work off the request threads
+
+Pools:
+- io:     threads   - Gemini API calls (network bound, GIL released while waiting)
+- encode: threads   - sentence-transformers encoding (one shared model copy;
+                      torch parallelises each batch internally and releases the GIL)
+- cpu:    processes - PDF parsing, assessment scoring and code execution
+                      (pure-Python CPU work that would otherwise hold the GIL)
+
+Offloading is enabled in ASGI mode (asgi_service.py sets AI_SERVICE_OFFLOAD=1).
+With offloading disabled, run_blocking() simply calls the function inline, so the
+Flask development server and gunicorn sync workers behave exactly as before.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from request_tracing import propagate_span
+from service_metrics import (
+    POOL_IN_FLIGHT, POOL_QUEUE_DEPTH, call_capturing_stages, register_collector, replay_stages
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment."""
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except ValueError:
+        return default
+
+
+POOL_SIZES = {
+    "io": _env_int("AI_SERVICE_IO_THREADS", 8),
+    "encode": _env_int("AI_SERVICE_ENCODE_THREADS", 1),
+    "cpu": _env_int("AI_SERVICE_CPU_PROCESSES", os.cpu_count() or 2),
+}
+
+POOL_KINDS = {
+    "io": "thread",
+    "encode": "thread",
+    "cpu": "process",
+}
+
+
+def offload_enabled() -> bool:
+    """Whether blocking work is dispatched to pools (ASGI mode) or run inline."""
+    return os.getenv("AI_SERVICE_OFFLOAD", "0").lower() in ("1", "true", "yes")
+
+
+class TrackedPool:
+    """
+    Executor wrapper that tracks queue depth.
+
+    in_flight counts submitted-but-unfinished tasks; anything above max_workers
+    is waiting in the executor queue.
+    """
+
+    def __init__(self, name: str, kind: str, max_workers: int):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self._executor: Executor = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _get_executor(self) -> Executor:
+        """Create the executor on first use (no idle processes when unused)."""
+        if self._executor is None:
+            if self.kind == "process":
+                # spawn: children must not inherit torch/tokenizer threads from a fork
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"pool-{self.name}"
+                )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.max_workers)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        with self._lock:
+            executor = self._get_executor()
+            self.in_flight += 1
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        future = executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "started": self._executor is not None,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# Global pools (created lazily, one set per service worker)
+_pools: Dict[str, TrackedPool] = {}
+_pools_lock = threading.Lock()
+_inline = threading.local()
+
+
+def set_inline(enabled: bool) -> None:
+    """
+    Run this thread's run_blocking() calls inline even when offloading is on
+    (profiled requests: the profiler only sees work done on the request thread).
+    """
+    _inline.enabled = enabled
+
+
+def get_pool(name: str) -> TrackedPool:
+    """Get (or create) a named pool: "io", "encode" or "cpu"."""
+    if name not in POOL_SIZES:
+        raise ValueError(f"Unknown pool: {name}")
+
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = TrackedPool(name, POOL_KINDS[name], POOL_SIZES[name])
+        return _pools[name]
+
+
+def run_blocking(pool_name: str, fn: Callable, *args, **kwargs) -> Any:
+    """
+    Run blocking work on a pool and wait for the result.
+
+    Functions sent to the "cpu" pool must be picklable (module-level functions
+    with picklable arguments).
+
+    Args:
+        pool_name: "io", "encode" or "cpu"
+        fn: Function to call
+        *args, **kwargs: Arguments for fn
+
+    Returns:
+        fn's return value (exceptions are re-raised in the caller)
+    """
+    if not offload_enabled() or getattr(_inline, "enabled", False):
+        return fn(*args, **kwargs)
+    pool = get_pool(pool_name)
+    if pool.kind == "process":
+        # Stage timings recorded in the child are replayed into this process's metrics
+        result, observations = pool.submit(call_capturing_stages, fn, *args, **kwargs).result()
+        replay_stages(observations)
+        return result
+    # Stages on the pool thread become children of the request's trace span
+    return pool.submit(propagate_span(fn), *args, **kwargs).result()
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Queue-depth statistics for every pool."""
+    return {name: get_pool(name).stats() for name in POOL_SIZES}
+
+
+def _collect_pool_metrics() -> None:
+    """Refresh pool gauges for /metrics (only pools that have been created)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        stats = pool.stats()
+        POOL_IN_FLIGHT.set(stats["in_flight"], pool.name)
+        POOL_QUEUE_DEPTH.set(stats["queue_depth"], pool.name)
+
+
+register_collector(_collect_pool_metrics)
+
+
+def shutdown_pools(wait: bool = True) -> None:
+    """Shut down all pool executors (called on service shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.shutdown(wait=wait)
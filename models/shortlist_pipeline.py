@@ -0,0 +1,164 @@
+"""
+Shortlist Pipeline - PDF resume to shortlist decision in one call
+The apply flow used to upload the PDF to /api/parse-pdf, receive the full
+text in the backend, and send it straight back to /api/match-application:
+two round-trips with the resume text crossing the wire twice. This module
+runs extraction, cleaning, encoding and the threshold decision in one call.
+
+Stages overlap where they can: the job description is encoded on the
+"encode" pool while the PDF is being parsed, and a job description already
+seen by this process is not encoded again. Its embedding is cached under a
+content-addressed jd_id (returned with every result), so callers may send the
+jd_id instead of the job description text on later applications.
+
+JD embeddings live in a bounded LRU per service process
+(AI_SERVICE_JD_CACHE_SIZE entries, ~3 KB each).
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+from ai_resume_matcher import (
+    MODEL_NAME, clean_text, encode_job_description, evaluate_application_with_jd_embedding
+)
+from pdf_to_text import extract_resume_text_from_bytes
+from request_deadline import check_deadline
+from service_metrics import record_cache_lookup
+from service_pools import get_pool, run_blocking
+
+MAX_CACHED_JDS = int(os.getenv("AI_SERVICE_JD_CACHE_SIZE", 256))
+
+# Shortest extracted text treated as a readable resume (same rule as /api/parse-pdf)
+MIN_RESUME_CHARS = 10
+
+
+class UnknownJobDescription(KeyError):
+    """Raised when a jd_id is not cached in this process and no jd_text was sent."""
+
+
+def make_jd_id(jd_text: str) -> str:
+    """Content-addressed id of a job description (whitespace-insensitive)."""
+    return hashlib.sha256(clean_text(jd_text).encode("utf-8")).hexdigest()[:32]
+
+
+class JDEmbeddingCache:
+    """
+    Bounded, thread-safe LRU of job description embeddings.
+
+    Args:
+        max_entries: Embeddings kept (least recently used evicted first)
+        version: Model name the embeddings were produced with
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_JDS, version: str = MODEL_NAME):
+        self.max_entries = max_entries
+        self.version = version
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, jd_id: str) -> Optional[np.ndarray]:
+        with self._lock:
+            embedding = self._entries.get(jd_id)
+            if embedding is not None:
+                self._entries.move_to_end(jd_id)
+        record_cache_lookup("jd_embedding", embedding is not None)
+        return embedding
+
+    def put(self, jd_id: str, embedding: np.ndarray) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[jd_id] = embedding
+            self._entries.move_to_end(jd_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return sum(embedding.nbytes for embedding in self._entries.values())
+
+
+# Global JD embedding cache (one per service process)
+_jd_cache: Optional[JDEmbeddingCache] = None
+_jd_cache_lock = threading.Lock()
+
+
+def get_jd_cache() -> JDEmbeddingCache:
+    global _jd_cache
+    with _jd_cache_lock:
+        if _jd_cache is None:
+            _jd_cache = JDEmbeddingCache()
+        return _jd_cache
+
+
+def shortlist_pdf(
+    pdf_data: bytes,
+    min_score_threshold: float,
+    model,
+    jd_text: Optional[str] = None,
+    jd_id: Optional[str] = None,
+    deadline: Optional[float] = None
+) -> Dict:
+    """
+    Extract a PDF resume and decide the shortlist in one pass.
+
+    Args:
+        pdf_data: PDF file contents
+        min_score_threshold: Recruiter's minimum score (0.0 to 1.0)
+        model: Loaded model (or RemoteEncoder)
+        jd_text: Job description text (required unless jd_id is cached)
+        jd_id: Id of a job description this process has already encoded
+        deadline: Absolute time.time() deadline (None = no deadline)
+
+    Returns:
+        evaluate_application() result (0-1 scale) plus
+        {"jd_id": str, "text": extracted resume text}
+
+    Raises:
+        UnknownJobDescription: jd_id not cached here and no jd_text given
+        ValueError: Missing job description or unreadable PDF
+        DeadlineExceeded: The deadline passed between stages
+    """
+    if jd_text:
+        jd_id = make_jd_id(jd_text)
+    elif not jd_id:
+        raise ValueError("jd_text or jd_id is required")
+
+    cache = get_jd_cache()
+    jd_embedding = cache.get(jd_id)
+    jd_future = None
+    if jd_embedding is None:
+        if not jd_text:
+            raise UnknownJobDescription(jd_id)
+        # Encode the JD while the PDF is parsed
+        jd_future = get_pool("encode").submit(encode_job_description, jd_text, model)
+
+    try:
+        text = run_blocking("cpu", extract_resume_text_from_bytes, pdf_data, deadline=deadline)
+    except BaseException:
+        if jd_future is not None:
+            jd_future.cancel()
+        raise
+    if not text or len(text.strip()) < MIN_RESUME_CHARS:
+        raise ValueError("Could not extract text from PDF")
+
+    if jd_future is not None:
+        jd_embedding = jd_future.result()
+        cache.put(jd_id, jd_embedding)
+
+    check_deadline(deadline, "resume encoding")
+    result = run_blocking(
+        "encode", evaluate_application_with_jd_embedding, jd_embedding, text, min_score_threshold, model
+    )
+    result["jd_id"] = jd_id
+    result["text"] = text
+    return result
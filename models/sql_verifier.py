@@ -8,6 +8,12 @@ import json
 from typing import Dict, List, Optional, Any
 import re
 
+from request_deadline import expired
+from service_metrics import stage
+
+# SQLite VM instructions between deadline checks while a query runs
+PROGRESS_CHECK_INTERVAL = 10000
+
 
 def create_test_database(schema: str, test_data: Optional[List[Dict]] = None) -> sqlite3.Connection:
     """
@@ -225,11 +231,15 @@ def verify_sql_answer(
     test_data: Optional[List[Dict]] = None,
     expected_result: Optional[List[Dict]] = None,
     ignore_order: bool = True,
-    ignore_case: bool = True
+    ignore_case: bool = True,
+    deadline: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Verify a SQL query answer.
     
+    With a deadline, a running query is interrupted (SQLite progress handler)
+    once it passes, and the answer is reported with deadline_exceeded=True.
+    
     Args:
         user_query: The SQL query submitted by the user
         expected_query: Optional expected SQL query (for exact match)
@@ -238,6 +248,7 @@ def verify_sql_answer(
         expected_result: Expected query result
         ignore_order: Ignore row order when comparing
         ignore_case: Ignore case for string comparisons
+        deadline: Optional request deadline (time.time())
         
     Returns:
         Dictionary with:
@@ -277,9 +288,25 @@ def verify_sql_answer(
     # Execute user query if schema is provided
     if schema:
         try:
-            conn = create_test_database(schema, test_data)
-            user_execution = execute_sql_query(conn, user_query)
-            conn.close()
+            with stage("sql_verification"):
+                conn = create_test_database(schema, test_data)
+                try:
+                    if deadline is not None:
+                        conn.set_progress_handler(lambda: expired(deadline), PROGRESS_CHECK_INTERVAL)
+                    user_execution = execute_sql_query(conn, user_query)
+                finally:
+                    conn.close()
+            
+            if not user_execution["success"] and expired(deadline):
+                return {
+                    "correct": False,
+                    "score": 0.0,
+                    "message": "Deadline exceeded during query execution",
+                    "user_result": None,
+                    "expected_result": expected_result,
+                    "comparison": None,
+                    "deadline_exceeded": True
+                }
             
             if not user_execution["success"]:
                 return {
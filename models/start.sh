@@ -2,5 +2,26 @@
 # Start script for Render deployment
 cd /opt/render/project/src/models || cd "$(dirname "$0")"
 export PYTHONPATH="${PWD}:${PYTHONPATH}"
-exec gunicorn --bind 0.0.0.0:$PORT --workers 2 --timeout 120 ai_service:app
 
+# AI_ENCODER_SOCKET: one shared encoder process owns the model for all workers
+if [ -n "${AI_ENCODER_SOCKET}" ]; then
+    python encoder_server.py --socket "${AI_ENCODER_SOCKET}" &
+    for _ in $(seq 1 120); do
+        [ -S "${AI_ENCODER_SOCKET}" ] && break
+        sleep 1
+    done
+fi
+
+# AI_SERVICE_MODE=asgi: async serving with blocking work offloaded to worker pools
+if [ "${AI_SERVICE_MODE}" = "asgi" ]; then
+    exec uvicorn asgi_service:app --host 0.0.0.0 --port $PORT --timeout-keep-alive 120
+fi
+
+# Assessment jobs are stored in AI_SERVICE_JOB_DB (SQLite), so any of the workers
+# below can answer a job poll
+# AI_SERVICE_PREFORK=1: load model/question bank/skill index once in the master (copy-on-write)
+if [ "${AI_SERVICE_PREFORK}" = "1" ]; then
+    exec gunicorn --config python:prefork --bind 0.0.0.0:$PORT --workers 2 --timeout 120 ai_service:app
+fi
+
+exec gunicorn --bind 0.0.0.0:$PORT --workers 2 --timeout 120 ai_service:app
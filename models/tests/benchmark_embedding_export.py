@@ -0,0 +1,89 @@
+"""
+Benchmark: Embedding Export Formats
+Compares bytes on the wire and encode + decode time of the /api/embeddings
+formats (raw float32/float16, MessagePack) against JSON float arrays (orjson
+and stdlib, identity and gzip) for 1, 32 and 500 normalized 768-d vectors.
+Decode is what the backend pays to get the vectors back into an array.
+
+Run:
+    python tests/benchmark_embedding_export.py
+    python tests/benchmark_embedding_export.py --counts 1 100 --dim 384
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import gzip
+import json
+import time
+
+import numpy as np
+
+from embedding_export import decode_msgpack, decode_raw, encode_json, encode_msgpack, encode_raw
+
+ROUNDS = 20
+MODEL_ID = "all-mpnet-base-v2"
+
+
+def time_call(fn, *args) -> float:
+    """Best-of-ROUNDS wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _stdlib_json(vectors: np.ndarray) -> bytes:
+    count, dim = vectors.shape
+    return json.dumps({"model": MODEL_ID, "dim": dim, "count": count, "embeddings": vectors.tolist()}).encode()
+
+
+def _decode_json(data: bytes) -> np.ndarray:
+    return np.asarray(json.loads(data)["embeddings"], dtype=np.float32)
+
+
+def formats(vectors: np.ndarray):
+    """(label, encode() -> bytes, decode(bytes) -> array) for every compared format."""
+    return [
+        ("json (stdlib)", lambda: _stdlib_json(vectors), _decode_json),
+        ("json (orjson)", lambda: encode_json(vectors, MODEL_ID), _decode_json),
+        ("json (orjson) + gzip", lambda: gzip.compress(encode_json(vectors, MODEL_ID), 5),
+         lambda data: _decode_json(gzip.decompress(data))),
+        ("msgpack float32", lambda: encode_msgpack(vectors, MODEL_ID), lambda data: decode_msgpack(data)[1]),
+        ("msgpack float16", lambda: encode_msgpack(vectors, MODEL_ID, "float16"),
+         lambda data: decode_msgpack(data)[1]),
+        ("raw float32", lambda: encode_raw(vectors, MODEL_ID), lambda data: decode_raw(data)[1]),
+        ("raw float16", lambda: encode_raw(vectors, MODEL_ID, "float16"), lambda data: decode_raw(data)[1])
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare embedding export formats")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 32, 500], help="Vectors per response")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for count in args.counts:
+        vectors = rng.standard_normal((count, args.dim)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        print(f"\n{count} x {args.dim} vectors")
+        print(f"{'format':<22} {'bytes':>10} {'vs json':>8} {'encode ms':>10} {'decode ms':>10} {'max cos err':>12}")
+        json_bytes = None
+        for label, encode, decode in formats(vectors):
+            data = encode()
+            json_bytes = json_bytes or len(data)
+            decoded = decode(data).astype(np.float32)
+            # Largest change in a pairwise score caused by the format's precision
+            error = float(np.max(np.abs(decoded @ vectors.T - vectors @ vectors.T)))
+            print(f"{label:<22} {len(data):>10} {json_bytes / len(data):>7.1f}x "
+                  f"{time_call(encode):>10.3f} {time_call(decode, data):>10.3f} {error:>12.1e}")
+
+
+if __name__ == "__main__":
+    main()
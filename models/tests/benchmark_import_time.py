@@ -0,0 +1,77 @@
+"""
+Benchmark: Service Import Time
+Runs `python -X importtime` on `import ai_service` in a fresh interpreter and
+prints a breakdown: total import time, time until /health answers, the slowest
+top-level imports (cumulative) and the heaviest packages (summed self time).
+
+Heavy dependencies (sentence-transformers/torch, sklearn, google-generativeai,
+PDF libraries) should not appear here; they load on first use or on the
+warm-up thread.
+
+Run:
+    python tests/benchmark_import_time.py [--top 15]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+_PROBE = """
+import time
+start = time.perf_counter()
+import ai_service
+imported = time.perf_counter()
+ai_service.app.test_client().get('/health')
+print(f"{imported - start:.4f} {time.perf_counter() - start:.4f}")
+"""
+
+
+def run_probe():
+    """Import ai_service in a fresh interpreter; return (importtime rows, import s, health s)."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=MODELS_DIR, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in process.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    import_s, health_s = (float(v) for v in process.stdout.split()[-2:])
+    return rows, import_s, health_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile of ai_service")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table")
+    args = parser.parse_args()
+
+    rows, import_s, health_s = run_probe()
+
+    print(f"import ai_service:        {import_s * 1000:8.1f} ms")
+    print(f"first /health response:   {health_s * 1000:8.1f} ms\n")
+
+    # Depth 1 = imported directly by ai_service (or by the probe itself)
+    top_level = sorted((r for r in rows if r[3] <= 1), key=lambda r: r[2], reverse=True)
+    print(f"{'slowest direct imports':<40} {'cumulative ms':>14}")
+    for name, _, cumulative_us, _ in top_level[:args.top]:
+        print(f"{name:<40} {cumulative_us / 1000:>14.1f}")
+
+    packages = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        packages[name.split(".")[0]] += self_us
+    print(f"\n{'heaviest packages':<40} {'self ms':>14}")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{package:<40} {self_us / 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
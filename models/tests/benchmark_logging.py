@@ -0,0 +1,110 @@
+"""
+Benchmark: Per-Request Logging Overhead
+Times requests through the Flask test client to endpoints that log on every
+call (/api/score-assessment, /api/analyze-jd, /api/generate-assessment with a
+stubbed Gemini), with stdout going to:
+
+- devnull:    an instantly drained sink
+- slow-pipe:  a pipe drained by a subprocess reading 4 KB every 10 ms (a log
+              collector that cannot keep up); writes block once the pipe fills
+
+Run the same script before and after a logging change to compare; the
+"null" baseline runs the requests with logging output disabled entirely
+(AI_SERVICE_LOG_LEVEL=CRITICAL) to isolate the cost of the log calls.
+
+Run:
+    python tests/benchmark_logging.py [--requests 300] [--sink slow-pipe]
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import subprocess
+import time
+
+SLOW_READER = (
+    "import sys, time\n"
+    "while sys.stdin.buffer.read1(4096):\n"
+    "    time.sleep(0.01)\n"
+)
+
+PAYLOADS = {
+    "/api/score-assessment": {
+        "questions": [
+            {"id": str(i), "type": "mcq", "options": ["3", "4"], "correctAnswer": "4"} for i in range(20)
+        ],
+        "answers": {str(i): "4" for i in range(20)}
+    },
+    "/api/analyze-jd": {
+        "jd_text": "Senior backend engineer, 5+ years of Python, Django, PostgreSQL, Docker and AWS. "
+                   "Experience with Kubernetes and CI/CD pipelines is a plus."
+    },
+    "/api/generate-assessment": {
+        "api_key": "benchmark-stub-key", "experience_years": 3, "difficulty": "Medium",
+        "mcq_count": 5, "descriptive_count": 2, "dsa_count": 1,
+        "job_description": "Backend developer with Python and SQL"
+    }
+}
+
+
+def redirect_stdout(sink: str):
+    """Point fd 1 (and sys.stdout) at the sink; returns the reader process, if any."""
+    reader = None
+    if sink == "devnull":
+        target = os.open(os.devnull, os.O_WRONLY)
+    else:
+        reader = subprocess.Popen([sys.executable, "-c", SLOW_READER], stdin=subprocess.PIPE)
+        target = reader.stdin.fileno()
+    os.dup2(target, 1)
+    sys.stdout = open(1, "w", buffering=1, closefd=False)
+    return reader
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-request logging overhead")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per endpoint")
+    parser.add_argument("--sink", choices=["devnull", "slow-pipe"], default="slow-pipe")
+    parser.add_argument("--null", action="store_true", help="Disable log output (baseline)")
+    args = parser.parse_args()
+
+    report = os.fdopen(os.dup(1), "w")
+    if args.null:
+        os.environ["AI_SERVICE_LOG_LEVEL"] = "CRITICAL"
+    reader = redirect_stdout(args.sink)
+
+    from traffic_replay import stub_gemini
+    stub_gemini(0.0)
+    import logging
+    from ai_service import app
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    client = app.test_client()
+
+    report.write(f"sink={args.sink}{' (log output disabled)' if args.null else ''}, "
+                 f"{args.requests} requests per endpoint\n")
+    report.write(f"{'endpoint':<28} {'mean us':>10} {'p99 us':>10}\n")
+    for endpoint, payload in PAYLOADS.items():
+        for _ in range(10):
+            client.post(endpoint, json=payload)
+        timings = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            response = client.post(endpoint, json=payload)
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200, (endpoint, response.status_code)
+        timings.sort()
+        mean_us = sum(timings) / len(timings) * 1e6
+        p99_us = timings[int(len(timings) * 0.99) - 1] * 1e6
+        report.write(f"{endpoint:<28} {mean_us:>10.0f} {p99_us:>10.0f}\n")
+    report.flush()
+
+    if reader is not None:
+        sys.stdout.close()
+        os.close(1)
+        reader.stdin.close()
+        reader.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Benchmark: Request Decoding and Validation
+Compares, per typical payload, the previous approach (json.loads of the body,
+then data.get(...) chains and hand-written checks, as the endpoints did) with
+decoding the raw bytes into the typed request_schemas Structs.
+
+Payloads:
+- match-application: JD + resume text
+- generate-assessment: nested sections config
+- score-assessment: 30 questions (DSA test cases with 1,000-element arrays)
+- cluster-applicants: 200 stored 768-d embeddings
+
+Run:
+    python tests/benchmark_request_schemas.py [--repeat 7]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from request_schemas import (
+    AssessmentRequest, ClusterApplicantsRequest, MatchApplicationRequest, ScoreAssessmentRequest, decode_request
+)
+
+
+def build_payloads():
+    rng = random.Random(7)
+    words = ["python", "django", "kubernetes", "postgres", "react", "aws", "microservices", "team", "built"]
+    text = lambda n: " ".join(rng.choice(words) for _ in range(n))
+
+    questions = []
+    answers = {}
+    for i in range(30):
+        kind = ("mcq", "sql", "coding")[i % 3]
+        question = {"id": str(i), "type": kind, "question": text(30)}
+        if kind == "mcq":
+            question.update(options=[text(3) for _ in range(4)], correctAnswer="a")
+            answers[str(i)] = "a"
+        elif kind == "sql":
+            question.update(schema="CREATE TABLE t (id INTEGER, name TEXT);", expected_result=[{"id": 1}])
+            answers[str(i)] = "SELECT id FROM t"
+        else:
+            question["public_tests"] = [
+                {"input": [[rng.randint(0, 999) for _ in range(1000)], 42], "expected_output": [0, 1],
+                 "function_name": "two_sum"}
+                for _ in range(3)
+            ]
+            answers[str(i)] = "def two_sum(nums, target):\n    return [0, 1]\n"
+        questions.append(question)
+
+    return {
+        "match-application": {"jd_text": text(300), "resume_text": text(900), "min_score_threshold": 60},
+        "generate-assessment": {
+            "experience_years": 3, "experience_level": "Mid", "difficulty": "Medium",
+            "job_description": text(300),
+            "sections": {
+                "mcq": {"total_time_minutes": 20, "question_count": 15},
+                "subjective": {"topic": "SQL", "total_time_minutes": 30, "question_count": 10},
+                "coding": {"topic": "DSA", "total_time_minutes": 120, "question_count": 2}
+            }
+        },
+        "score-assessment": {"questions": questions, "answers": answers},
+        "cluster-applicants": {
+            "embeddings": [[rng.uniform(-1, 1) for _ in range(768)] for _ in range(200)],
+            "n_clusters": 8
+        }
+    }
+
+
+# ---------------------------------------------------------------------------
+# Previous approach: json.loads + data.get chains (as in the endpoints before)
+# ---------------------------------------------------------------------------
+
+def legacy_match_application(body: bytes):
+    data = json.loads(body)
+    if not data:
+        raise ValueError("Request body is required")
+    jd_text = data.get('jd_text')
+    resume_text = data.get('resume_text')
+    threshold = data.get('min_score_threshold', 0.50)
+    if not jd_text or not resume_text:
+        raise ValueError("jd_text and resume_text are required")
+    if not isinstance(threshold, (int, float)):
+        raise ValueError("min_score_threshold must be a number")
+    return jd_text, resume_text, threshold
+
+
+def legacy_generate_assessment(body: bytes):
+    data = json.loads(body)
+    sections_data = data.get('sections', {})
+    mcq_section = sections_data.get('mcq', {})
+    subj_section = sections_data.get('subjective', {})
+    coding_section = sections_data.get('coding', {})
+    config = {
+        "experience_years": data.get('experience_years', 2),
+        "experience_level": data.get('experience_level', 'Mid'),
+        "difficulty": data.get('difficulty', 'Medium'),
+        "sections": {
+            "mcq": {
+                "total_time_minutes": mcq_section.get('total_time_minutes', data.get('mcq_time_minutes', 20)),
+                "question_count": mcq_section.get('question_count', data.get('mcq_count', 15))
+            },
+            "subjective": {
+                "topic": subj_section.get('topic', 'SQL'),
+                "total_time_minutes": subj_section.get('total_time_minutes', data.get('descriptive_time_minutes', 30)),
+                "question_count": subj_section.get('question_count', data.get('descriptive_count', 10))
+            },
+            "coding": {
+                "topic": coding_section.get('topic', 'DSA'),
+                "total_time_minutes": coding_section.get('total_time_minutes', data.get('dsa_time_minutes', 120)),
+                "question_count": coding_section.get('question_count', data.get('dsa_count', 2))
+            }
+        }
+    }
+    job_description = data.get('job_description', '') or data.get('description', '') or data.get('jd_text', '')
+    return config, job_description
+
+
+def legacy_score_assessment(body: bytes):
+    data = json.loads(body)
+    questions = data.get('questions', [])
+    answers = data.get('answers', {})
+    if not questions:
+        raise ValueError("Questions are required")
+    return questions, answers
+
+
+def legacy_cluster_applicants(body: bytes):
+    data = json.loads(body)
+    embeddings = data.get('embeddings')
+    if not embeddings:
+        raise ValueError("embeddings or resume_texts are required")
+    return embeddings, data.get('n_clusters', 8)
+
+
+CASES = {
+    "match-application": (legacy_match_application, lambda b: decode_request(MatchApplicationRequest, b)),
+    "generate-assessment": (
+        legacy_generate_assessment, lambda b: decode_request(AssessmentRequest, b).to_config()
+    ),
+    "score-assessment": (legacy_score_assessment, lambda b: decode_request(ScoreAssessmentRequest, b)),
+    "cluster-applicants": (legacy_cluster_applicants, lambda b: decode_request(ClusterApplicantsRequest, b)),
+}
+
+
+def best_time_us(fn, body: bytes, repeat: int) -> float:
+    timer = timeit.Timer(lambda: fn(body))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Request decode + validate benchmark")
+    parser.add_argument("--repeat", type=int, default=7, help="Timing repeats (best is reported)")
+    args = parser.parse_args()
+
+    payloads = build_payloads()
+    print(f"{'payload':<22} {'size':>10} {'dict + .get':>14} {'typed schema':>14} {'speedup':>8}")
+    for name, (legacy, typed) in CASES.items():
+        body = json.dumps(payloads[name]).encode()
+        legacy_us = best_time_us(legacy, body, args.repeat)
+        typed_us = best_time_us(typed, body, args.repeat)
+        print(f"{name:<22} {len(body) / 1024:>8.1f}KB {legacy_us:>12.1f}us {typed_us:>12.1f}us "
+              f"{legacy_us / typed_us:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: Scoring Response Serialization
+Compares stdlib json vs orjson serialization time and bytes on the wire
+(identity / gzip / zstd) for a realistic /api/score-assessment response built
+from question_bank.DSA_QUESTIONS (including the 10,000-element test arrays).
+
+Run:
+    python tests/benchmark_serialization.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import time
+
+from question_bank import DSA_QUESTIONS
+import response_encoding
+from response_encoding import compress
+
+ROUNDS = 20
+
+
+def build_scoring_response() -> dict:
+    """Score-assessment shaped response: 15 MCQ, 10 SQL, every bank DSA question."""
+    dsa_details = []
+    for index, question in enumerate(DSA_QUESTIONS):
+        test_results = [
+            {
+                "test_case": i + 1,
+                "passed": i % 4 != 3,
+                "input": test.get("input"),
+                "expected": test.get("expectedOutput"),
+                "actual": test.get("expectedOutput") if i % 4 != 3 else None
+            }
+            for i, test in enumerate(question["testCases"])
+        ]
+        passed = sum(1 for r in test_results if r["passed"])
+        dsa_details.append({
+            "question_id": f"dsa-{index}",
+            "correct": passed / len(test_results) >= 0.8,
+            "score": passed / len(test_results),
+            "total_tests": len(test_results),
+            "passed_tests": passed,
+            "failed_tests": len(test_results) - passed,
+            "test_results": test_results
+        })
+
+    return {
+        "overall_score": 71.5,
+        "mcq": {
+            "total": 15, "correct": 11, "incorrect": 4, "score": 11 / 15,
+            "details": [
+                {"question_id": f"mcq-{i}", "correct": i % 4 != 0, "user_answer": "B", "correct_answer": "B"}
+                for i in range(15)
+            ]
+        },
+        "sql": {
+            "total": 10, "correct": 7, "incorrect": 3, "score": 0.7,
+            "details": [
+                {"question_id": f"sql-{i}", "correct": i % 3 != 0, "score": 1.0 if i % 3 else 0.0,
+                 "message": "Query results match expected output"}
+                for i in range(10)
+            ]
+        },
+        "dsa": {
+            "total": len(dsa_details),
+            "correct": sum(1 for d in dsa_details if d["correct"]),
+            "incorrect": sum(1 for d in dsa_details if not d["correct"]),
+            "score": 0.66,
+            "details": dsa_details
+        },
+        "breakdown": {"mcq": 36.7, "sql": 17.5, "dsa": 17.3}
+    }
+
+
+def time_call(fn, *args) -> float:
+    """Best-of-ROUNDS wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    response = build_scoring_response()
+
+    stdlib_ms = time_call(lambda obj: json.dumps(obj).encode("utf-8"), response)
+    body = response_encoding.dumps(response)
+    fast_ms = time_call(response_encoding.dumps, response)
+
+    print(f"Scoring response: {len(DSA_QUESTIONS)} DSA questions, {len(body) / 1024:.1f} KB of JSON\n")
+    print(f"{'serializer':<24} {'time ms':>10}")
+    print(f"{'stdlib json':<24} {stdlib_ms:>10.2f}")
+    label = "orjson" if response_encoding.ORJSON_AVAILABLE else "stdlib (orjson missing)"
+    print(f"{label:<24} {fast_ms:>10.2f}")
+
+    print(f"\n{'encoding':<24} {'bytes':>10} {'ratio':>8} {'time ms':>10}")
+    print(f"{'identity':<24} {len(body):>10} {1.0:>8.2f} {0.0:>10.2f}")
+    encodings = ["gzip"] + (["zstd"] if response_encoding.ZSTD_AVAILABLE else [])
+    for encoding in encodings:
+        compressed = compress(body, encoding)
+        elapsed = time_call(compress, body, encoding)
+        print(f"{encoding:<24} {len(compressed):>10} {len(body) / len(compressed):>8.2f} {elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Test: Admission Control
+Tests concurrency limits, fast rejection, priority ordering, displacement and
+the thread budget shared by all groups
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import threading
+import time
+
+import pytest
+
+from admission_control import AdmissionController, AdmissionRejected, ThreadBudget, resolve_admission
+
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def _admit_in_thread(controller, priority, order):
+    def run():
+        try:
+            admitted_at = controller.acquire(priority)
+        except AdmissionRejected as e:
+            order.append((priority, e.reason))
+            return
+        order.append((priority, "admitted"))
+        controller.release(admitted_at)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_overflow_is_rejected_with_retry_after():
+    controller = AdmissionController("test_overflow", max_concurrent=1, max_queue=0)
+    admitted_at = controller.acquire()
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire()
+    assert excinfo.value.reason == "queue_full"
+    assert excinfo.value.retry_after >= 1
+
+    controller.release(admitted_at)
+    controller.release(controller.acquire())
+
+
+def test_interactive_admitted_before_batch():
+    controller = AdmissionController("test_priority", max_concurrent=1, max_queue=4)
+    held = controller.acquire()
+    order = []
+
+    batch = _admit_in_thread(controller, "batch", order)
+    _wait_until(lambda: controller.queued == 1)
+    interactive = _admit_in_thread(controller, "interactive", order)
+    _wait_until(lambda: controller.queued == 2)
+
+    controller.release(held)
+    batch.join()
+    interactive.join()
+    assert order == [("interactive", "admitted"), ("batch", "admitted")]
+
+
+def test_interactive_displaces_queued_batch_when_full():
+    controller = AdmissionController("test_displace", max_concurrent=1, max_queue=1)
+    held = controller.acquire()
+    order = []
+
+    batch = _admit_in_thread(controller, "batch", order)
+    _wait_until(lambda: controller.queued == 1)
+    interactive = _admit_in_thread(controller, "interactive", order)
+    batch.join()
+    assert order == [("batch", "displaced")]
+
+    controller.release(held)
+    interactive.join()
+    assert order[-1] == ("interactive", "admitted")
+
+
+def test_queue_timeout():
+    controller = AdmissionController("test_timeout", max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    held = controller.acquire()
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire()
+    assert excinfo.value.reason == "timeout"
+    assert controller.queued == 0
+    controller.release(held)
+
+
+def test_resolve_admission_uses_endpoint_default_and_header():
+    controller, priority = resolve_admission("/api/match-applications", None)
+    assert controller.group == "encode" and priority == "batch"
+    assert resolve_admission("/api/match-applications", "interactive")[1] == "interactive"
+    assert resolve_admission("/api/analyze-jd", None) is None
+
+
+def test_groups_share_a_thread_budget():
+    budget = ThreadBudget(2)
+    encode = AdmissionController("test_budget_encode", max_concurrent=1, max_queue=8, budget=budget)
+    cpu = AdmissionController("test_budget_cpu", max_concurrent=1, max_queue=8, budget=budget)
+    held = encode.acquire()
+    order = []
+    waiting = _admit_in_thread(encode, "batch", order)
+    _wait_until(lambda: encode.queued == 1)
+
+    # Queues have room, but every budgeted thread is held: reject at once
+    start = time.perf_counter()
+    with pytest.raises(AdmissionRejected) as excinfo:
+        cpu.acquire()
+    assert excinfo.value.reason == "threads_exhausted"
+    assert time.perf_counter() - start < 0.5
+
+    encode.release(held)
+    waiting.join()
+    assert order == [("batch", "admitted")] and budget.held == 0
+    cpu.release(cpu.acquire())
+    assert budget.held == 0
+
+
+def test_rejected_requests_give_their_thread_back():
+    budget = ThreadBudget(4)
+    controller = AdmissionController("test_budget_timeout", max_concurrent=1, max_queue=1,
+                                     queue_timeout=0.05, budget=budget)
+    held = controller.acquire()
+    with pytest.raises(AdmissionRejected):
+        controller.acquire()  # times out in the queue
+    controller.release(held)
+    assert budget.held == 0
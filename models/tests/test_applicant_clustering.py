@@ -0,0 +1,100 @@
+"""
+Test: Applicant Clustering
+Tests mini-batch k-means grouping, skill labels, incremental assignment and
+that the endpoints run clustering on the cpu pool
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+import service_pools
+
+from applicant_clustering import cluster_applicants, assign_applicants, fit_minibatch_kmeans
+from jd_analyzer import extract_skill_set
+
+
+def make_pool(n_per_group=300, dim=64, seed=0):
+    """Three well-separated groups of unit vectors with matching resume texts."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(3, dim))
+    groups = np.repeat(np.arange(3), n_per_group)
+    X = centers[groups] + 0.05 * rng.normal(size=(groups.size, dim))
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    texts = [
+        ["Backend engineer: Java, Spring Boot, Docker",
+         "Data scientist: Python, Pandas, NumPy",
+         "Frontend developer: React, TypeScript"][g]
+        for g in groups
+    ]
+    return X, groups, texts
+
+
+def test_clusters_recover_groups():
+    X, groups, _ = make_pool()
+    fit = fit_minibatch_kmeans(X, n_clusters=3, batch_size=128)
+
+    # Every true group maps onto exactly one cluster
+    for g in range(3):
+        assert len(set(fit["labels"][groups == g].tolist())) == 1
+    assert len(set(fit["labels"].tolist())) == 3
+
+
+def test_cluster_labels_use_skill_dictionary():
+    X, groups, texts = make_pool()
+    result = cluster_applicants(X, n_clusters=3, resume_texts=texts, batch_size=128)
+
+    assert result["total_candidates"] == len(texts)
+    assert sum(c["size"] for c in result["clusters"]) == len(texts)
+
+    java_cluster = result["labels"][0]
+    skills = {s["skill"] for s in result["clusters"][java_cluster]["top_skills"]}
+    assert {"Java", "Spring Boot", "Docker"} <= skills
+
+
+def test_skill_scan_ignores_unicode_case_folds():
+    # "ſ" case-folds to "s" but does not lower to it
+    assert extract_skill_set("Javaſcript and Pythoſ") == []
+    assert extract_skill_set("JAVASCRIPT and python") == ["JavaScript", "Python"]
+
+
+def test_incremental_assignment_matches_fit():
+    X, groups, _ = make_pool()
+    result = cluster_applicants(X, n_clusters=3, batch_size=128)
+
+    assigned = assign_applicants(X[:10], result["model_state"])
+    assert assigned["labels"] == result["labels"][:10]
+    assert assigned["model_state"]["counts"] == result["model_state"]["counts"]
+
+    updated = assign_applicants(X[:10], result["model_state"], update_centroids=True)
+    assert sum(updated["model_state"]["counts"]) == sum(result["model_state"]["counts"]) + 10
+
+
+def test_rejects_more_clusters_than_applicants():
+    X, _, _ = make_pool(n_per_group=1)
+    try:
+        fit_minibatch_kmeans(X, n_clusters=5)
+    except ValueError:
+        return
+    assert False, "Expected ValueError"
+
+
+def test_endpoints_cluster_on_the_cpu_pool(monkeypatch):
+    import ai_service
+
+    monkeypatch.setenv("AI_SERVICE_OFFLOAD", "1")
+    X, _, texts = make_pool(n_per_group=20, dim=16)
+    client = ai_service.app.test_client()
+    completed = service_pools.get_pool_stats().get("cpu", {}).get("completed", 0)
+
+    response = client.post('/api/cluster-applicants', json={
+        "embeddings": X.tolist(), "resume_texts": texts, "n_clusters": 3
+    })
+    assert response.status_code == 200
+    model_state = response.get_json()["model_state"]
+    response = client.post('/api/assign-applicants', json={"embeddings": X[:5].tolist(), "model_state": model_state})
+    assert response.status_code == 200 and len(response.get_json()["labels"]) == 5
+
+    assert service_pools.get_pool_stats()["cpu"]["completed"] - completed == 2
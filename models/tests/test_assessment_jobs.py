@@ -0,0 +1,112 @@
+"""
+Test: Assessment Jobs
+Tests background generation jobs, partial per-section results, store bounds
+and sharing the store between worker processes
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import multiprocessing
+import subprocess
+import threading
+import time
+
+import pytest
+
+from assessment_jobs import JobStore, JobStoreFull, get_job_store, submit_generation_job
+
+
+def _wait_for_status(job_id, statuses, timeout=5.0):
+    deadline = time.time() + timeout
+    while True:
+        job = get_job_store().get(job_id)
+        if job["status"] in statuses:
+            return job
+        assert time.time() < deadline, f"job stuck in {job['status']}"
+        time.sleep(0.01)
+
+
+def test_job_exposes_partial_sections_then_completes():
+    release = threading.Event()
+
+    def fake_generate(config, on_section=None, **kwargs):
+        on_section("mcq", [{"question": "Q1"}])
+        release.wait(5)
+        on_section("subjective", [])
+        on_section("coding", [{"problem": "P1"}])
+
+    job_id = submit_generation_job(fake_generate, {"difficulty": "Medium"})
+
+    deadline = time.time() + 5
+    while get_job_store().get(job_id)["sections_completed"] != ["mcq"]:
+        assert time.time() < deadline
+        time.sleep(0.01)
+    partial = get_job_store().get(job_id)
+    assert partial["status"] == "running"
+    assert partial["result"] == {"mcq": [{"question": "Q1"}]}
+
+    release.set()
+    job = _wait_for_status(job_id, ("completed",))
+    assert job["sections_completed"] == ["mcq", "subjective", "coding"]
+    assert job["result"]["coding"] == [{"problem": "P1"}]
+
+
+def test_failed_job_keeps_error():
+    def failing_generate(config, on_section=None, **kwargs):
+        raise RuntimeError("429 quota exceeded")
+
+    job = _wait_for_status(submit_generation_job(failing_generate, {}), ("failed",))
+    assert "quota" in job["error"]
+
+
+def test_store_bounds_finished_and_active_jobs(tmp_path):
+    store = JobStore(max_jobs=2, max_active=1, path=str(tmp_path / "jobs.sqlite3"))
+
+    finished = []
+    for _ in range(3):
+        job_id = store.create()
+        store.update(job_id, status="completed", finished_at=time.time())
+        finished.append(job_id)
+    store.create()  # evicts the oldest finished job beyond max_jobs
+    assert store.get(finished[0]) is None
+    assert store.get(finished[2]) is not None
+
+    with pytest.raises(JobStoreFull):
+        store.create()
+
+
+def _poll_from_other_worker(path, job_id, results):
+    results.put(JobStore(path=path).get(job_id))
+
+
+def test_jobs_are_visible_to_every_worker(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(path=path)
+    job_id = store.create()
+    store.add_section(job_id, "mcq", [{"question": "Q1"}])
+
+    # A poll routed to another gunicorn worker
+    results = multiprocessing.get_context("spawn").Queue()
+    worker = multiprocessing.get_context("spawn").Process(
+        target=_poll_from_other_worker, args=(path, job_id, results)
+    )
+    worker.start()
+    job = results.get(timeout=30)
+    worker.join()
+    assert job["sections_completed"] == ["mcq"] and job["result"]["mcq"] == [{"question": "Q1"}]
+    assert store.stats()["queued"] == 1
+
+
+def test_job_of_exited_worker_is_failed(tmp_path):
+    store = JobStore(max_active=1, path=str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create()
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    store._connection().execute("UPDATE jobs SET owner_pid = ? WHERE job_id = ?", (exited.pid, job_id))
+
+    # The orphan no longer counts as active
+    store.create()
+    job = store.get(job_id)
+    assert job["status"] == "failed" and "exited" in job["error"]
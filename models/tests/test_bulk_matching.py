@@ -0,0 +1,73 @@
+"""
+Test: Bulk Application Matching
+Tests evaluate_applications() ordering, deduplication and parity with evaluate_application()
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import zlib
+
+import numpy as np
+
+from ai_resume_matcher import evaluate_application, evaluate_applications
+
+
+class FakeModel:
+    """Hashed bag-of-words 768-d embeddings; records every encode call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, normalize_embeddings=False):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), 768), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % 768] += 1.0
+        if normalize_embeddings:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+
+JD = "Backend developer Java Spring Boot SQL Docker"
+RESUMES = [
+    "Java Spring Boot developer with SQL and Docker",
+    "Frontend React JavaScript CSS",
+    "Java Spring Boot developer with SQL and Docker",
+]
+
+
+def test_results_in_input_order_and_match_single_evaluation():
+    model = FakeModel()
+    items = [{"jd_text": JD, "resume_text": r, "min_score_threshold": 0.5} for r in RESUMES]
+    results = evaluate_applications(items, model=model)
+
+    assert len(results) == 3
+    for item, result in zip(items, results):
+        single = evaluate_application(JD, item["resume_text"], 0.5, model=FakeModel())
+        assert result["shortlisted"] == single["shortlisted"]
+        assert abs(result["score"] - single["score"]) < 1e-3
+
+
+def test_repeated_texts_encoded_once_in_one_pass():
+    model = FakeModel()
+    items = [{"jd_text": JD, "resume_text": r, "min_score_threshold": 0.5} for r in RESUMES]
+    evaluate_applications(items, model=model)
+
+    assert len(model.calls) == 1
+    assert sorted(model.calls[0]) == sorted({JD, RESUMES[0], RESUMES[1]})
+
+
+def test_invalid_items_reported_in_place():
+    items = [
+        {"jd_text": JD, "resume_text": RESUMES[0], "min_score_threshold": 0.5},
+        {"jd_text": JD, "resume_text": "", "min_score_threshold": 0.5},
+        {"jd_text": JD, "resume_text": RESUMES[1], "min_score_threshold": 2.0},
+    ]
+    results = evaluate_applications(items, model=FakeModel())
+
+    assert "shortlisted" in results[0]
+    assert "error" in results[1]
+    assert "error" in results[2]
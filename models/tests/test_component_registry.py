@@ -0,0 +1,131 @@
+"""
+Test: Component Registry
+Tests lazy loading, idle and LRU memory-pressure unloading, metrics and the
+resume matcher model's registration in ai_service
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import time
+
+import numpy as np
+
+import component_registry
+from component_registry import COMPONENT_LOADS_TOTAL, COMPONENT_UNLOADS_TOTAL, ComponentRegistry
+
+MB = 1024 * 1024
+TOKEN = "test-admin-token"
+
+
+class Loaded:
+    def __init__(self, name: str, size_mb: int):
+        self.name = name
+        self.size_mb = size_mb
+
+
+def _registry(monkeypatch, budget_mb=0, idle_seconds=0.0, base_mb=100):
+    """Registry whose simulated RSS is base_mb plus the size of every loaded component."""
+    registry = ComponentRegistry(budget_bytes=budget_mb * MB, idle_seconds=idle_seconds, interval=3600)
+    unloaded = []
+
+    def fake_rss():
+        return base_mb * MB + sum(c.size_bytes for c in registry._components.values() if c.instance is not None)
+
+    monkeypatch.setattr(component_registry, "_rss_bytes", fake_rss)
+    for name, size_mb in (("a", 50), ("b", 50), ("c", 50)):
+        registry.register(
+            f"test-{name}",
+            load=lambda name=name, size_mb=size_mb: Loaded(name, size_mb),
+            unload=lambda instance: unloaded.append(instance.name),
+            size=lambda instance: instance.size_mb * MB
+        )
+    return registry, unloaded
+
+
+def test_lazy_load_once_and_idle_unload(monkeypatch):
+    registry, unloaded = _registry(monkeypatch, idle_seconds=0.05)
+    loads_before = COMPONENT_LOADS_TOTAL.get("test-a")
+    assert registry.stats()["test-a"]["loaded"] is False
+
+    first = registry.get("test-a")
+    assert registry.get("test-a") is first
+    assert COMPONENT_LOADS_TOTAL.get("test-a") == loads_before + 1
+    assert registry.stats()["test-a"]["size_kb"] == 50 * 1024
+
+    time.sleep(0.06)
+    assert registry.enforce() == ["test-a"] and unloaded == ["a"]
+    assert COMPONENT_UNLOADS_TOTAL.get("test-a", "idle") >= 1
+    assert registry.get("test-a") is not first and registry.stats()["test-a"]["loads"] == 2
+
+
+def test_pressure_unloads_least_recently_used(monkeypatch):
+    registry, unloaded = _registry(monkeypatch, budget_mb=220)
+    for name in ("test-a", "test-b", "test-c"):
+        registry.get(name)
+    registry.touch("test-a")
+
+    # 100 + 3 x 50 = 250 MB > 220 MB: only the least recently used one goes
+    assert registry.enforce() == ["test-b"] and unloaded == ["b"]
+    assert registry.enforce() == []
+
+    # Reloading b (known to need 50 MB) evicts the next LRU component first
+    registry.get("test-b")
+    assert unloaded == ["b", "c"]
+
+
+def test_pressure_keeps_components_when_unloading_cannot_help(monkeypatch):
+    # The rest of the process (250 MB) is over the 220 MB budget on its own
+    registry, unloaded = _registry(monkeypatch, budget_mb=220, base_mb=250)
+    registry.get("test-a")
+    assert registry.enforce() == [] and unloaded == []
+    registry.get("test-b")
+    assert registry.enforce() == [] and unloaded == []
+
+
+def test_governor_runs_in_workers_not_in_the_prefork_master(monkeypatch):
+    registry, _ = _registry(monkeypatch, idle_seconds=1.0)
+    monkeypatch.setattr(registry, "_govern", lambda: None)
+    master_pid = os.getpid()
+
+    registry.suspend_governor()
+    registry.get("test-a")  # preload in the master
+    assert registry._governor_pid is None
+
+    # A forked worker only touches the preloaded component and starts its own governor
+    monkeypatch.setattr(component_registry.os, "getpid", lambda: master_pid + 1)
+    registry.touch("test-a")
+    assert registry._governor_pid == master_pid + 1
+
+
+def test_model_component_unload_and_reload(monkeypatch):
+    import ai_service
+
+    class FakeModel:
+        def encode(self, texts, **kwargs):
+            return np.ones((len(texts), 768), dtype=np.float32)
+
+    monkeypatch.setattr(ai_service, "_model_cache", None)
+    monkeypatch.setattr(ai_service, "load_model", FakeModel)
+    monkeypatch.delenv("AI_ENCODER_SOCKET", raising=False)
+    monkeypatch.setenv("AI_SERVICE_ADMIN_TOKEN", TOKEN)
+    registry = ai_service.get_component_registry()
+    client = ai_service.app.test_client()
+    admin = {"X-Admin-Token": TOKEN}
+    try:
+        model = ai_service.get_or_load_model()
+        assert isinstance(model, FakeModel) and ai_service._model_cache is model
+
+        components = client.get('/api/admin/components', headers=admin).get_json()["components"]
+        assert components["resume_matcher"]["loaded"] is True
+
+        assert client.delete('/api/admin/components/resume_matcher', headers=admin).get_json() == {"unloaded": True}
+        assert ai_service._model_cache is None
+        assert client.delete('/api/admin/components/nope', headers=admin).status_code == 404
+
+        assert ai_service.get_or_load_model() is not model
+        assert 'ai_service_component_unloads_total{component="resume_matcher",reason="manual"}' in \
+            client.get('/metrics').get_data(as_text=True)
+    finally:
+        registry.unload("resume_matcher")
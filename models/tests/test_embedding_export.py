@@ -0,0 +1,94 @@
+"""
+Test: Embedding Export
+Tests the raw/MessagePack embedding wire formats and the /api/embeddings
+endpoint, including parity with /api/match-application scores
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import zlib
+
+import numpy as np
+import pytest
+
+from embedding_export import (
+    HEADER, MAGIC, decode_msgpack, decode_raw, encode_json, encode_msgpack, encode_raw
+)
+
+JD = "Backend developer Java Spring Boot SQL Docker"
+RESUMES = [
+    "Jane Doe - Java Spring Boot developer with SQL and Docker experience",
+    "John Roe - React and CSS frontend engineer"
+]
+
+
+class FakeModel:
+    """Hashed bag-of-words 768-d embeddings."""
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, normalize_embeddings=False):
+        vectors = np.zeros((len(texts), 768), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % 768] += 1.0
+        if normalize_embeddings:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import ai_service
+    monkeypatch.setattr(ai_service, "_model_cache", FakeModel())
+    return ai_service.app.test_client()
+
+
+def test_raw_layout_and_round_trip():
+    vectors = np.random.default_rng(0).standard_normal((3, 8)).astype(np.float32)
+    data = encode_raw(vectors, "test-model")
+
+    magic, version, itemsize, model_len, count, dim = HEADER.unpack_from(data)
+    assert (magic, version, itemsize, model_len, count, dim) == (MAGIC, 1, 4, 10, 3, 8)
+    assert len(data) == HEADER.size + 10 + 3 * 8 * 4
+
+    model_id, decoded = decode_raw(data)
+    assert model_id == "test-model" and np.array_equal(decoded, vectors)
+
+    model_id, half = decode_raw(encode_raw(vectors, "test-model", "float16"))
+    assert half.dtype == np.float16 and np.allclose(half, vectors, atol=1e-2)
+
+    with pytest.raises(ValueError):
+        decode_raw(data[:-1])
+
+
+def test_msgpack_round_trip_and_size():
+    vectors = np.random.default_rng(1).standard_normal((4, 768)).astype(np.float32)
+    model_id, decoded = decode_msgpack(encode_msgpack(vectors, "m", "float32"))
+    assert model_id == "m" and np.array_equal(decoded, vectors)
+    assert len(encode_msgpack(vectors, "m", "float16")) < len(encode_json(vectors, "m")) / 5
+
+
+def test_endpoint_vectors_reproduce_match_scores(client):
+    response = client.post('/api/embeddings', json={"texts": [JD] + RESUMES})
+    assert response.status_code == 200
+    assert response.content_type == "application/octet-stream"
+    assert response.headers["X-Embedding-Count"] == "3" and response.headers["X-Embedding-Dim"] == "768"
+
+    model_id, vectors = decode_raw(response.get_data())
+    assert model_id == response.headers["X-Embedding-Model"]
+    for index, resume in enumerate(RESUMES, 1):
+        match = client.post('/api/match-application', json={"jd_text": JD, "resume_text": resume}).get_json()
+        assert int(float(vectors[0] @ vectors[index]) * 100) == match["score"]
+
+
+def test_endpoint_formats_and_validation(client):
+    msgpack = client.post('/api/embeddings', json={"text": JD, "format": "msgpack", "dtype": "float16"})
+    assert msgpack.content_type == "application/x-msgpack"
+    assert decode_msgpack(msgpack.get_data())[1].shape == (1, 768)
+
+    as_json = client.post('/api/embeddings', json={"texts": RESUMES, "format": "json"}).get_json()
+    assert as_json["count"] == 2 and len(as_json["embeddings"][1]) == 768
+
+    assert client.post('/api/embeddings', json={"texts": []}).status_code == 400
+    assert client.post('/api/embeddings', json={"text": JD, "format": "csv"}).status_code == 400
@@ -0,0 +1,138 @@
+"""
+Test: Shared Encoder Server
+Tests the Unix-socket protocol and cross-worker batching with a fake model
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import socket
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import encoder_server
+from encoder_server import EncoderServer, RemoteEncoder, _PendingRequest, recv_frame, send_frame
+
+
+class FakeModel:
+    """Deterministic 8-d 'embeddings' (text length and first character)."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, normalize_embeddings=False):
+        self.calls.append(len(texts))
+        vectors = np.array([[len(t), ord(t[0])] + [1.0] * 6 for t in texts], dtype=np.float32)
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
+def start_server(model, **kwargs):
+    socket_path = os.path.join(tempfile.mkdtemp(), "encoder.sock")
+    server = EncoderServer(model, socket_path, **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    for _ in range(100):
+        if os.path.exists(socket_path):
+            break
+        time.sleep(0.01)
+    return server, socket_path
+
+
+def test_remote_encode_matches_local():
+    model = FakeModel()
+    server, socket_path = start_server(model)
+    try:
+        encoder = RemoteEncoder(socket_path)
+        texts = ["java spring", "python"]
+        remote = encoder.encode(texts, normalize_embeddings=True)
+        local = FakeModel().encode(texts, normalize_embeddings=True)
+        assert remote.shape == (2, 8)
+        assert np.allclose(remote, local)
+        assert encoder.encode("single").shape == (8,)
+    finally:
+        server.shutdown()
+
+
+def test_concurrent_workers_share_batches():
+    model = FakeModel()
+    server, socket_path = start_server(model, batch_window_ms=50)
+    try:
+        encoder = RemoteEncoder(socket_path)
+        results = {}
+
+        def worker(i):
+            results[i] = encoder.encode([f"text {i}"])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert all(results[i][0][0] == len(f"text {i}") for i in range(8))
+        # 8 single-text requests were coalesced into fewer encode calls
+        assert sum(model.calls) == 8
+        assert len(model.calls) < 8
+    finally:
+        server.shutdown()
+
+
+def test_trickle_of_requests_does_not_extend_the_batch_window():
+    server = EncoderServer(FakeModel(), os.path.join(tempfile.mkdtemp(), "encoder.sock"), batch_window_ms=100)
+    stop = threading.Event()
+
+    def trickle():
+        # Each arrival comes well inside the window of the previous one
+        while not stop.is_set():
+            server._queue.put(_PendingRequest(["x"], False))
+            time.sleep(0.03)
+
+    server._queue.put(_PendingRequest(["first"], False))
+    threading.Thread(target=trickle, daemon=True).start()
+    try:
+        start = time.monotonic()
+        batch = server._collect_batch()
+        elapsed = time.monotonic() - start
+    finally:
+        stop.set()
+    assert elapsed < 0.25
+    assert 1 < len(batch) < server.max_batch
+
+
+def test_large_calls_are_split_to_fit_frames(monkeypatch):
+    monkeypatch.setattr(encoder_server, "MAX_FRAME_BYTES", 200)
+    monkeypatch.setattr(encoder_server, "MAX_TEXTS_PER_REQUEST", 3)
+    model = FakeModel()
+    server, socket_path = start_server(model)
+    try:
+        encoder = RemoteEncoder(socket_path)
+        texts = [f"{i} " + "x" * 40 for i in range(10)]
+        payloads = list(encoder._requests(texts, False))
+        assert len(payloads) > 3 and all(len(p) <= 200 for p in payloads)
+
+        remote = encoder.encode(texts)
+        assert remote.shape == (10, 8)
+        assert np.allclose(remote, FakeModel().encode(texts))
+        assert max(model.calls) <= 3
+    finally:
+        server.shutdown()
+
+
+def test_non_object_request_gets_an_error_reply():
+    server, socket_path = start_server(FakeModel())
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(socket_path)
+        send_frame(conn, json.dumps(["not", "an", "object"]).encode())
+        assert json.loads(recv_frame(conn)) == {"error": "Request must be a JSON object"}
+        conn.close()
+        # The server keeps serving
+        assert RemoteEncoder(socket_path).encode("still up").shape == (8,)
+    finally:
+        server.shutdown()
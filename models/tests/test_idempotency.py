@@ -0,0 +1,110 @@
+"""
+Test: Idempotency Keys
+Tests the bounded key store and that retried requests attach to the in-flight
+run or replay its stored response instead of recomputing
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import threading
+import time
+import uuid
+
+import pytest
+
+from idempotency import (
+    IDEMPOTENCY_HEADER, REPLAYED_HEADER, IdempotencyConflict, IdempotencyStore, StoredResponse, claim_key,
+    fingerprint_body, get_idempotency_store
+)
+
+MCQ_PAYLOAD = {
+    "questions": [{"id": "1", "type": "mcq", "options": ["3", "4"], "correctAnswer": "4"}],
+    "answers": {"1": "4"}
+}
+
+
+def test_store_owner_conflict_and_transient_results():
+    store = IdempotencyStore(max_entries=2)
+    entry, owner = store.begin("/api/x", "k1", "body-a")
+    assert owner
+    assert store.begin("/api/x", "k1", "body-a") == (entry, False)
+    assert store.begin("/api/y", "k1", "body-b")[1]  # keys are per endpoint
+    with pytest.raises(IdempotencyConflict):
+        store.begin("/api/x", "k1", "body-b")
+
+    store.finish(entry, StoredResponse(503, b"{}", "application/json"))
+    assert entry.done.is_set()
+    # Transient failures are not kept: the next request runs again
+    assert store.begin("/api/x", "k1", "body-a")[1]
+
+
+def test_store_evicts_oldest_finished_only():
+    store = IdempotencyStore(max_entries=1)
+    running, _ = store.begin("/api/x", "running", "f")
+    for key in ("a", "b"):
+        entry, _ = store.begin("/api/x", key, "f")
+        store.finish(entry, StoredResponse(200, key.encode(), "application/json"))
+    store.begin("/api/x", "c", "f")  # triggers eviction
+
+    assert store.stats() == {"in_flight": 2, "stored": 1, "max_entries": 1}
+    assert store.begin("/api/x", "a", "f")[1]  # evicted
+    assert store.begin("/api/x", "b", "f")[0].response.body == b"b"
+    assert store.begin("/api/x", "running", "f")[0] is running
+
+
+def test_waiter_attaches_to_in_flight_run():
+    key = uuid.uuid4().hex
+    entry, stored = claim_key("/api/test", key, b"{}")
+    assert entry is not None and stored is None
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(claim_key("/api/test", key, b"{}")))
+    waiter.start()
+    time.sleep(0.1)
+    assert waiter.is_alive()
+
+    get_idempotency_store().finish(entry, StoredResponse(200, b'{"ok":true}', "application/json"))
+    waiter.join(timeout=2)
+    assert results == [(None, StoredResponse(200, b'{"ok":true}', "application/json"))]
+    assert entry.fingerprint == fingerprint_body(b"{}")
+
+
+def test_retry_of_concurrent_scoring_runs_once(monkeypatch):
+    import assessment_scorer
+    from ai_service import app
+
+    calls = []
+    original = assessment_scorer.score_assessment
+
+    def slow_score(*args, **kwargs):
+        calls.append(1)
+        time.sleep(0.3)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(assessment_scorer, "score_assessment", slow_score)
+    headers = {IDEMPOTENCY_HEADER: uuid.uuid4().hex}
+    responses = []
+
+    def post():
+        responses.append(app.test_client().post('/api/score-assessment', json=MCQ_PAYLOAD, headers=headers))
+
+    threads = [threading.Thread(target=post) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert [r.status_code for r in responses] == [200, 200]
+    assert responses[0].get_data() == responses[1].get_data()
+    assert sorted(r.headers.get(REPLAYED_HEADER, "") for r in responses) == ["", "true"]
+
+    # Later retry: stored response; same key with another body: rejected
+    client = app.test_client()
+    replay = client.post('/api/score-assessment', json=MCQ_PAYLOAD, headers=headers)
+    assert replay.headers[REPLAYED_HEADER] == "true" and len(calls) == 1
+    conflict = client.post('/api/score-assessment', json={**MCQ_PAYLOAD, "answers": {"1": "3"}}, headers=headers)
+    assert conflict.status_code == 422
@@ -0,0 +1,97 @@
+"""
+Test: Memory Report
+Tests tracemalloc snapshot diffs, per-endpoint peak allocation and the admin
+memory endpoints
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import tracemalloc
+
+import pytest
+
+import memory_report
+from memory_report import AllocationPeaks, HeapSnapshots, deep_sizeof
+
+TOKEN = "test-admin-token"
+MCQ_PAYLOAD = {
+    "questions": [{"id": "1", "type": "mcq", "options": ["3", "4"], "correctAnswer": "4"}],
+    "answers": {"1": "4"}
+}
+
+
+@pytest.fixture(autouse=True)
+def stop_tracing():
+    yield
+    tracemalloc.stop()
+
+
+def test_snapshot_growth_points_at_allocating_line():
+    snapshots = HeapSnapshots(top=10)
+    first = snapshots.take()
+    assert first["tracing_started"] is True and "growth" not in first
+
+    retained = [str(i) * 20 for i in range(20000)]
+    second = snapshots.take()
+    assert second["tracing_started"] is False
+    assert second["growth"][0]["location"].endswith(f"{os.path.basename(__file__)}:{_line_of('retained = [')}")
+    assert second["growth"][0]["size_diff_kb"] > 500
+    assert len(retained) == 20000
+
+
+def test_allocation_peak_recorded_per_endpoint():
+    peaks = AllocationPeaks()
+    assert peaks.begin() is None  # not tracing: nothing recorded
+
+    tracemalloc.start()
+    start = peaks.begin()
+    temporary = bytearray(2 * 1024 * 1024)
+    del temporary
+    peaks.end("/api/x", start)
+
+    stats = peaks.stats()["/api/x"]
+    assert stats["requests"] == 1 and stats["max_peak_kb"] >= 2048
+
+
+def test_deep_sizeof_counts_nested_containers():
+    nested = {"a": ["x" * 1000, "y" * 1000], "b": ("z" * 1000,)}
+    assert deep_sizeof(nested) > 3000
+    shared = "s" * 1000
+    assert deep_sizeof([shared, shared]) < deep_sizeof([shared, "t" * 1000])
+
+
+def test_admin_memory_endpoints(monkeypatch):
+    from ai_service import app
+
+    monkeypatch.setattr(memory_report, "_peaks", AllocationPeaks())
+    monkeypatch.setattr(memory_report, "_snapshots", HeapSnapshots())
+    monkeypatch.setenv("AI_SERVICE_ADMIN_TOKEN", TOKEN)
+    client = app.test_client()
+    admin = {"X-Admin-Token": TOKEN}
+
+    assert client.get('/api/admin/memory').status_code == 403
+    assert client.post('/api/admin/memory/snapshot').status_code == 403
+
+    report = client.get('/api/admin/memory', headers=admin).get_json()
+    assert report["rss"]["peak_rss_kb"] > 0 and report["tracing"] is False
+    assert "idempotency_responses_kb" in report["caches"] and report["endpoint_peaks"] == {}
+
+    assert client.post('/api/admin/memory/snapshot', headers=admin).get_json()["tracing_started"] is True
+    assert client.post('/api/score-assessment', json=MCQ_PAYLOAD).status_code == 200
+    assert "growth" in client.post('/api/admin/memory/snapshot', headers=admin).get_json()
+
+    peaks = client.get('/api/admin/memory', headers=admin).get_json()["endpoint_peaks"]
+    assert peaks["/api/score-assessment"]["requests"] == 1
+
+    assert client.delete('/api/admin/memory/snapshot', headers=admin).get_json() == {"tracing": False}
+    assert not tracemalloc.is_tracing()
+
+
+def _line_of(prefix: str) -> int:
+    with open(__file__) as f:
+        for number, line in enumerate(f, 1):
+            if line.strip().startswith(prefix):
+                return number
+    raise ValueError(prefix)
@@ -0,0 +1,138 @@
+"""
+Test: NDJSON Streaming
+Tests streamed batch responses (result lines + final summary) for bulk scoring
+and bulk PDF parsing, mid-stream errors and deadlines
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import io
+import json
+
+import pytest
+from flask import Flask
+
+from ndjson_stream import NDJSON_MIMETYPE, ndjson_response
+
+MCQ_QUESTIONS = [
+    {"id": "1", "type": "mcq", "options": ["3", "4"], "correctAnswer": "4"},
+    {"id": "2", "type": "mcq", "options": ["a", "b"], "correctAnswer": "b"}
+]
+
+ENDLESS_QUERY = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT max(i) FROM n"
+
+
+def _lines(response):
+    assert response.mimetype == NDJSON_MIMETYPE
+    return [json.loads(line) for line in response.get_data().splitlines()]
+
+
+def _submissions():
+    return {
+        "questions": MCQ_QUESTIONS,
+        "submissions": [
+            {"id": "a", "answers": {"1": "4", "2": "b"}},
+            {"id": "b", "answers": {"1": "3", "2": "b"}},
+            {"id": "c"}
+        ]
+    }
+
+
+def test_bulk_scoring_json_and_stream_agree():
+    from ai_service import app
+    client = app.test_client()
+
+    document = client.post('/api/score-assessments', json=_submissions())
+    assert document.status_code == 200
+    body = document.get_json()
+    assert (body["total"], body["scored"], body["errors"]) == (3, 2, 1)
+
+    streamed = client.post(
+        '/api/score-assessments', json=_submissions(), headers={"Accept": NDJSON_MIMETYPE}
+    )
+    assert streamed.status_code == 200
+    lines = _lines(streamed)
+    results, summary = lines[:-1], lines[-1]
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert all(r["type"] == "result" for r in results)
+    assert [r.get("overall_score") for r in results] == [r.get("overall_score") for r in body["results"]]
+    assert "error" in results[2]
+    assert summary["type"] == "summary" and summary["complete"] is True
+    assert summary["emitted"] == 3 and summary["average_score"] == body["average_score"]
+
+
+def test_stream_stops_at_deadline_with_summary():
+    from ai_service import app
+    client = app.test_client()
+
+    sql_questions = [{"id": "1", "type": "sql", "schema": "CREATE TABLE t (id INTEGER);", "expected_result": []}]
+    payload = {
+        "questions": sql_questions,
+        "submissions": [{"answers": {"1": ENDLESS_QUERY}}, {"answers": {"1": "SELECT id FROM t"}}],
+        "timeout_seconds": 0.3
+    }
+
+    lines = _lines(client.post('/api/score-assessments?stream=1', json=payload))
+    assert len(lines) == 2  # the cut-short submission, then the summary
+    assert lines[0]["deadline_exceeded"] is True
+    assert lines[-1]["complete"] is False and lines[-1]["deadline_exceeded"] is True
+
+    document = client.post('/api/score-assessments', json=payload)
+    assert document.status_code == 504
+    assert len(document.get_json()["partial"]["results"]) == 1
+
+
+def test_mid_stream_error_is_reported_before_summary():
+    app = Flask(__name__)
+
+    def records():
+        yield {"index": 0, "value": 1}
+        raise RuntimeError("boom")
+
+    with app.test_request_context():
+        lines = _lines(ndjson_response(records(), {"total": 2}))
+    assert [line["type"] for line in lines] == ["result", "error", "summary"]
+    assert lines[-1]["complete"] is False and lines[-1]["emitted"] == 1
+
+
+def test_bulk_pdf_parsing_streams_each_file():
+    fitz = pytest.importorskip("fitz")
+    from ai_service import app
+
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Jane Doe - Backend Engineer - Python, Django, PostgreSQL, Docker")
+    pdf = doc.tobytes()
+    doc.close()
+
+    response = app.test_client().post(
+        '/api/parse-pdfs?stream=1',
+        data={"files": [(io.BytesIO(pdf), "jane.pdf"), (io.BytesIO(b"not a pdf"), "bad.pdf")]},
+        content_type="multipart/form-data"
+    )
+    lines = _lines(response)
+    assert lines[0]["success"] is True and "Backend Engineer" in lines[0]["text"]
+    assert lines[1]["success"] is False and lines[1]["filename"] == "bad.pdf"
+    assert lines[2] == {"type": "summary", "complete": True, "emitted": 2, "total": 2, "parsed": 1, "errors": 1}
+
+
+def test_admission_slot_held_until_stream_ends():
+    from ai_service import app
+    from admission_control import get_controller
+    from service_metrics import REQUESTS_IN_FLIGHT
+
+    controller = get_controller("cpu")
+    response = app.test_client().post(
+        '/api/score-assessments?stream=1', json=_submissions(), buffered=False
+    )
+    body = iter(response.response)
+    assert json.loads(next(body))["index"] == 0
+    assert controller.active == 1
+    assert REQUESTS_IN_FLIGHT.get("/api/score-assessments") == 1
+
+    lines = [json.loads(line) for line in body]
+    response.close()
+    assert lines[-1]["type"] == "summary"
+    assert controller.active == 0
+    assert REQUESTS_IN_FLIGHT.get("/api/score-assessments") == 0
@@ -0,0 +1,130 @@
+"""
+Test: In-memory PDF Parsing
+Tests bytes/memoryview extraction and the temp-file-free /api/parse-pdf upload
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import io
+import json
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from pdf_to_text import extract_resume_text_from_bytes
+
+RESUME_LINE = "Jane Doe - Backend Engineer - Python, Django, PostgreSQL, Docker, AWS - 5 years"
+
+
+def _make_pdf() -> bytes:
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), RESUME_LINE)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_extract_from_bytes_and_memoryview():
+    data = _make_pdf()
+    assert "Backend Engineer" in extract_resume_text_from_bytes(data)
+    assert "Backend Engineer" in extract_resume_text_from_bytes(memoryview(data))
+    assert "Backend Engineer" in extract_resume_text_from_bytes(data, prefer_pdfplumber=False)
+
+
+def test_non_pdf_data_is_rejected():
+    with pytest.raises(ValueError):
+        extract_resume_text_from_bytes(b"plain text, not a pdf")
+
+
+def test_parse_pdf_endpoint():
+    from ai_service import app
+
+    client = app.test_client()
+    response = client.post(
+        '/api/parse-pdf',
+        data={"file": (io.BytesIO(_make_pdf()), "resume.pdf")},
+        content_type="multipart/form-data"
+    )
+    assert response.status_code == 200
+    assert "Backend Engineer" in response.get_json()["text"]
+
+    invalid = client.post(
+        '/api/parse-pdf',
+        data={"file": (io.BytesIO(b"not a pdf"), "resume.pdf")},
+        content_type="multipart/form-data"
+    )
+    assert invalid.status_code == 400
+
+
+def test_large_uploads_stay_in_memory():
+    from ai_service import app
+
+    large = b"%PDF-1.7\n" + b"0" * (2 * 1024 * 1024)
+    with app.test_request_context(
+        '/api/parse-pdf', method="POST",
+        data={"file": (io.BytesIO(large), "resume.pdf")},
+        content_type="multipart/form-data"
+    ):
+        from flask import request
+        assert isinstance(request.files["file"].stream, io.BytesIO)
+
+
+def test_uploads_without_content_length_are_capped(monkeypatch):
+    import ai_service
+
+    monkeypatch.setitem(ai_service.BODY_LIMITS, '/api/parse-pdf', 64 * 1024)
+    client = ai_service.app.test_client()
+    body = (
+        b'--b\r\nContent-Disposition: form-data; name="file"; filename="resume.pdf"\r\n\r\n'
+        + b"%PDF-1.7\n" + b"0" * (128 * 1024) + b"\r\n--b--\r\n"
+    )
+    response = client.post(
+        '/api/parse-pdf', input_stream=io.BytesIO(body),
+        headers={"Content-Type": "multipart/form-data; boundary=b", "Transfer-Encoding": "chunked"},
+        environ_overrides={"wsgi.input_terminated": True}
+    )
+    assert response.status_code == 413
+    assert "65536" in response.get_json()["error"]
+
+    json_body = b'{"texts": ["' + b"a" * (128 * 1024) + b'"]}'
+    monkeypatch.setitem(ai_service.BODY_LIMITS, '/api/embeddings', 64 * 1024)
+    response = client.post(
+        '/api/embeddings', input_stream=io.BytesIO(json_body),
+        headers={"Content-Type": "application/json", "Transfer-Encoding": "chunked"},
+        environ_overrides={"wsgi.input_terminated": True}
+    )
+    assert response.status_code == 413
+
+
+def test_chunked_body_of_exactly_the_limit_is_accepted(monkeypatch):
+    import ai_service
+
+    body = json.dumps({"submissions": [{"answers": {}}]}).encode()
+    client = ai_service.app.test_client()
+
+    def post_chunked(limit):
+        monkeypatch.setitem(ai_service.BODY_LIMITS, '/api/score-assessments', limit)
+        return client.post(
+            '/api/score-assessments', input_stream=io.BytesIO(body),
+            headers={"Content-Type": "application/json", "Transfer-Encoding": "chunked"},
+            environ_overrides={"wsgi.input_terminated": True}
+        )
+
+    assert post_chunked(len(body)).status_code == 200
+    assert post_chunked(len(body) - 1).status_code == 413
+
+
+def test_clustering_endpoints_allow_large_pools():
+    import ai_service
+    from flask import request
+
+    for path in ('/api/cluster-applicants', '/api/assign-applicants'):
+        with ai_service.app.test_request_context(path, method='POST'):
+            assert request.body_limit == ai_service.MAX_CLUSTER_BYTES
+    # ~20k applicants x 768-d embeddings as JSON
+    assert ai_service.MAX_CLUSTER_BYTES > 20000 * 768 * 20
+    assert ai_service.app.config['MAX_CONTENT_LENGTH'] >= ai_service.MAX_CLUSTER_BYTES
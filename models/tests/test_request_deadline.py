@@ -0,0 +1,154 @@
+"""
+Test: Request Deadlines
+Tests deadline parsing and cooperative cancellation with partial results in
+code execution, SQL verification, PDF parsing and question generation
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import time
+
+import pytest
+
+from request_deadline import DeadlineExceeded, expired, remaining, resolve_deadline
+
+SLOW_CODE = """
+import time
+
+def solution(x):
+    time.sleep(3)
+    return x
+"""
+
+# Unbounded recursive CTE: only an interrupt stops it
+ENDLESS_QUERY = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT max(i) FROM n"
+
+
+def test_resolve_deadline_header_body_and_invalid():
+    start = 1000.0
+    assert resolve_deadline("2.5", 10, start=start) == 1002.5
+    assert resolve_deadline(None, 10, start=start) == 1010.0
+    assert resolve_deadline(None, None, start=start, use_default=False) is None
+    for invalid in ("soon", "0", "-1", True):
+        with pytest.raises(ValueError):
+            resolve_deadline(invalid)
+
+    assert remaining(None) is None and not expired(None)
+    assert expired(time.time() - 1) and remaining(time.time() - 1) == 0.0
+
+
+def test_dsa_evaluation_kills_running_test_and_skips_rest():
+    from code_executor import evaluate_dsa_solution
+
+    test_cases = [{"input": i, "expected_output": i} for i in range(3)]
+    started = time.time()
+    result = evaluate_dsa_solution(SLOW_CODE, test_cases, "python", deadline=time.time() + 0.5)
+
+    assert time.time() - started < 2.5
+    assert result["deadline_exceeded"] is True
+    assert result["total_tests"] == 3 and result["passed_tests"] == 0
+    assert result["results"][0]["deadline_exceeded"] is True
+    assert all(r["skipped"] for r in result["results"][1:])
+
+
+def test_sql_query_interrupted_at_deadline():
+    from sql_verifier import verify_sql_answer
+
+    started = time.time()
+    result = verify_sql_answer(
+        ENDLESS_QUERY,
+        schema="CREATE TABLE t (id INTEGER);",
+        expected_result=[],
+        deadline=time.time() + 0.2
+    )
+    assert time.time() - started < 2
+    assert result["deadline_exceeded"] is True
+    assert result["correct"] is False
+
+
+def test_scoring_returns_partial_result():
+    from assessment_scorer import score_assessment
+
+    questions = [
+        {"id": "1", "type": "mcq", "options": ["3", "4"], "correctAnswer": "4"},
+        {"id": "2", "type": "sql", "schema": "CREATE TABLE t (id INTEGER);", "expected_result": []},
+        {"id": "3", "type": "sql", "schema": "CREATE TABLE t (id INTEGER);", "expected_result": []}
+    ]
+    answers = {"1": "4", "2": ENDLESS_QUERY, "3": "SELECT id FROM t"}
+
+    result = score_assessment(questions, answers, deadline=time.time() + 0.2)
+    assert result["deadline_exceeded"] is True
+    assert result["mcq"]["correct"] == 1
+    assert result["sql"]["details"][1]["skipped"] is True
+
+
+def test_pdf_extraction_stops_at_deadline():
+    fitz = pytest.importorskip("fitz")
+    from pdf_to_text import extract_resume_text_from_bytes
+
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Backend Engineer with Python, Django and PostgreSQL experience")
+    data = doc.tobytes()
+    doc.close()
+
+    with pytest.raises(DeadlineExceeded):
+        extract_resume_text_from_bytes(data, deadline=time.time() - 1)
+
+
+def test_question_top_up_stops_at_deadline():
+    pytest.importorskip("google.generativeai")
+    from assessment_generator import generate_mcq_questions
+
+    class SlowModel:
+        def generate_content(self, prompt, request_options=None):
+            time.sleep(0.15)
+            return type("Response", (), {"text": json.dumps({"questions": [
+                {"question": "Q", "difficulty": "Low", "estimated_time": 1}
+            ]})})()
+
+    config = {
+        "difficulty": "Medium", "experience_level": "Mid", "experience_years": 2,
+        "sections": {"mcq": {"question_count": 50, "total_time_minutes": 50}}
+    }
+    started = time.time()
+    questions = generate_mcq_questions(config, SlowModel(), deadline=time.time() + 0.5)
+    assert time.time() - started < 1.5
+    assert 1 <= len(questions) < 50
+
+
+def test_execute_code_endpoint_returns_504_with_partial():
+    from ai_service import app, CODE_EXECUTOR_AVAILABLE
+    if not CODE_EXECUTOR_AVAILABLE:
+        pytest.skip("code executor not available")
+
+    client = app.test_client()
+    response = client.post(
+        '/api/execute-code',
+        json={"code": SLOW_CODE, "test_cases": [{"input": 1, "expected_output": 1}] * 2},
+        headers={"X-Request-Timeout": "0.5"}
+    )
+    assert response.status_code == 504
+    body = response.get_json()
+    assert body["deadline_exceeded"] is True
+    assert body["partial"]["total_tests"] == 2
+
+    invalid = client.post('/api/execute-code', json={"code": "x", "timeout_seconds": "later"})
+    assert invalid.status_code == 400
+
+
+def test_deadline_passed_before_admission_returns_504(monkeypatch):
+    import ai_service
+    from admission_control import AdmissionRejected, get_controller
+
+    def overloaded(priority, max_wait=None):
+        raise AdmissionRejected("cpu", "queue full", 1)
+
+    # A request that is already out of time is a 504, not an overload 503
+    monkeypatch.setattr(get_controller("cpu"), "acquire", overloaded)
+    monkeypatch.setattr(ai_service, "resolve_deadline", lambda *args: time.time() - 1)
+    response = ai_service.app.test_client().post('/api/execute-code', json={"code": "x", "test_cases": []})
+    assert response.status_code == 504
+    assert response.get_json()["deadline_exceeded"] is True
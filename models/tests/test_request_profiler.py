@@ -0,0 +1,67 @@
+"""
+Test: On-Demand Request Profiling
+Tests the guarded X-Profile header, inline execution of profiled work and the
+admin profile download endpoints
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pstats
+
+import pytest
+
+import request_profiler
+
+TOKEN = "test-admin-token"
+MCQ_PAYLOAD = {
+    "questions": [{"id": "1", "type": "mcq", "options": ["3", "4"], "correctAnswer": "4"}],
+    "answers": {"1": "4"}
+}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(request_profiler, "PROFILE_DIR", str(tmp_path))
+    from ai_service import app
+    return app.test_client()
+
+
+def test_header_ignored_without_admin_token(client, monkeypatch):
+    monkeypatch.delenv("AI_SERVICE_ADMIN_TOKEN", raising=False)
+    response = client.post('/api/score-assessment', json=MCQ_PAYLOAD, headers={"X-Profile": "1"})
+    assert response.status_code == 200 and "X-Profile-Id" not in response.headers
+    assert client.get('/api/admin/profiles').status_code == 404
+
+    monkeypatch.setenv("AI_SERVICE_ADMIN_TOKEN", TOKEN)
+    response = client.post(
+        '/api/score-assessment', json=MCQ_PAYLOAD, headers={"X-Profile": "1", "X-Admin-Token": "wrong"}
+    )
+    assert "X-Profile-Id" not in response.headers
+    assert client.get('/api/admin/profiles', headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+
+def test_profiled_request_runs_inline_and_is_downloadable(client, monkeypatch, tmp_path):
+    monkeypatch.setenv("AI_SERVICE_ADMIN_TOKEN", TOKEN)
+    # Offloaded work would run in the CPU process pool, out of the profiler's sight
+    monkeypatch.setenv("AI_SERVICE_OFFLOAD", "1")
+    admin = {"X-Admin-Token": TOKEN}
+
+    response = client.post('/api/score-assessment', json=MCQ_PAYLOAD, headers={"X-Profile": "1", **admin})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    report = client.get(f'/api/admin/profiles/{profile_id}?format=text', headers=admin)
+    assert report.status_code == 200
+    assert report.get_data(as_text=True).startswith("/api/score-assessment status=200")
+    assert "score_assessment" in report.get_data(as_text=True)
+
+    download = client.get(f'/api/admin/profiles/{profile_id}', headers=admin)
+    (tmp_path / "downloaded.prof").write_bytes(download.get_data())
+    stats = pstats.Stats(str(tmp_path / "downloaded.prof"))
+    assert any(func[2] == "score_assessment" for func in stats.stats)
+
+    listed = client.get('/api/admin/profiles', headers=admin).get_json()["profiles"]
+    assert [p["profile_id"] for p in listed] == [profile_id]
+    assert client.get('/api/admin/profiles/../../etc', headers=admin).status_code == 404
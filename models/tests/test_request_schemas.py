@@ -0,0 +1,107 @@
+"""
+Test: Request Schemas
+Tests typed request decoding, validation errors and the assessment config mapping
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+
+import pytest
+
+from request_schemas import (
+    AssessmentRequest, ExecuteCodeRequest, MatchApplicationRequest, RequestValidationError,
+    decode_request, peek_timeout
+)
+
+
+def _encode(payload) -> bytes:
+    return json.dumps(payload).encode()
+
+
+def test_decode_applies_defaults_and_ignores_unknown_fields():
+    body = decode_request(MatchApplicationRequest, _encode({
+        "jd_text": "Python developer", "resume_text": "5 years of Python", "source": "backend"
+    }))
+    assert body.min_score_threshold == 0.50
+    assert body.jd_text == "Python developer"
+
+
+@pytest.mark.parametrize("payload, fragment", [
+    ({"resume_text": "x"}, "jd_text"),
+    ({"jd_text": "", "resume_text": "x"}, "$.jd_text"),
+    ({"jd_text": "a", "resume_text": "b", "min_score_threshold": "high"}, "$.min_score_threshold"),
+    ({"jd_text": "a", "resume_text": "b", "min_score_threshold": 150}, "$.min_score_threshold"),
+])
+def test_validation_errors_name_the_field(payload, fragment):
+    with pytest.raises(RequestValidationError) as excinfo:
+        decode_request(MatchApplicationRequest, _encode(payload))
+    assert fragment in str(excinfo.value)
+
+
+def test_empty_and_malformed_bodies():
+    with pytest.raises(RequestValidationError, match="required"):
+        decode_request(ExecuteCodeRequest, b"")
+    with pytest.raises(RequestValidationError, match="Malformed JSON"):
+        decode_request(ExecuteCodeRequest, b"{not json")
+
+
+def test_assessment_config_sections_and_flat_formats():
+    flat = decode_request(AssessmentRequest, _encode({"difficulty": "Hard", "mcq_count": 5})).to_config()
+    assert flat["difficulty"] == "Hard"
+    assert flat["sections"]["mcq"] == {"total_time_minutes": 20, "question_count": 5}
+    assert flat["sections"]["subjective"]["topic"] == "SQL"
+
+    nested = decode_request(AssessmentRequest, _encode({
+        "experience_level": "Senior",
+        "dsa_time_minutes": 90,
+        "sections": {"coding": {"topic": "Graphs", "question_count": 3}}
+    })).to_config()
+    assert nested["sections"]["coding"] == {"total_time_minutes": 90, "question_count": 3, "topic": "Graphs"}
+    assert nested["sections"]["mcq"] == {"total_time_minutes": 20, "question_count": 15}
+
+    # The backend forwards its config map as-is, including nulls
+    nulls = decode_request(AssessmentRequest, _encode({"resume_text": None, "job_description": None, "jd_text": "SQL"}))
+    assert nulls.resume == "" and nulls.job_description_text == "SQL"
+
+    with pytest.raises(RequestValidationError, match="experience_level"):
+        decode_request(AssessmentRequest, _encode({"experience_level": "Principal"}))
+
+
+def test_peek_timeout_reads_only_that_field():
+    assert peek_timeout(_encode({"code": "x" * 1000, "timeout_seconds": 2.5})) == 2.5
+    assert peek_timeout(_encode([1, 2, 3])) is None
+    assert peek_timeout(b"{broken") is None
+
+
+def test_endpoint_returns_400_with_field_path():
+    from ai_service import app
+
+    response = app.test_client().post('/api/execute-code', json={"code": "print(1)", "test_cases": "none"})
+    assert response.status_code == 400
+    assert "$.test_cases" in response.get_json()["error"]
+
+
+def test_bulk_endpoints_report_bad_items_individually():
+    from ai_service import app
+
+    client = app.test_client()
+    response = client.post('/api/score-assessments', json={
+        "questions": [{"id": "1", "type": "mcq", "correctAnswer": "4"}],
+        "submissions": [1, {"id": "ok", "answers": {"1": "4"}}]
+    })
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert "error" in results[0] and results[1]["mcq"]["correct"] == 1
+
+
+def test_score_assessment_accepts_null_answers():
+    from ai_service import app
+
+    response = app.test_client().post('/api/score-assessment', json={
+        "questions": [{"id": "1", "type": "mcq", "correctAnswer": "4"}], "answers": None
+    })
+    assert response.status_code == 200
+    assert response.get_json()["mcq"]["correct"] == 0
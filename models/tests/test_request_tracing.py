@@ -0,0 +1,123 @@
+"""
+Test: Request Tracing
+Tests request/trace id propagation, stage spans nested under the request's
+span (including stages replayed from pool workers) and the OTLP/JSON export
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import request_tracing
+import service_metrics
+from request_tracing import (
+    SPAN_KIND_SERVER, STATUS_ERROR, Span, SpanExporter, Tracer, parse_traceparent, propagate_span
+)
+from service_metrics import call_capturing_stages, replay_stages, stage
+
+REQUEST_ID = "3f2b6c1e-8d4a-4e5f-9a0b-1c2d3e4f5a6b"
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+class CollectingExporter(SpanExporter):
+    """Keeps exported spans in memory instead of writing them."""
+
+    def __init__(self):
+        super().__init__("stdout")
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = Tracer(CollectingExporter(), sample_rate=1.0)
+    monkeypatch.setattr(request_tracing, "_tracer", tracer)
+    monkeypatch.setattr(service_metrics, "_stage_tracer", tracer)
+    return tracer
+
+
+def test_ids_come_from_the_caller():
+    assert parse_traceparent(f"00-{TRACE_ID}-00f067aa0ba902b7-01") == (TRACE_ID, "00f067aa0ba902b7", True)
+    assert parse_traceparent(f"00-{TRACE_ID}-00f067aa0ba902b7-00")[2] is False
+    assert parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    assert parse_traceparent("garbage") is None
+
+    tracer = Tracer(CollectingExporter(), sample_rate=0.0)
+    span = tracer.start_request("/api/x", REQUEST_ID)
+    assert span is None  # not sampled
+    span = tracer.start_request("/api/x", REQUEST_ID, f"00-{TRACE_ID}-00f067aa0ba902b7-01")
+    assert span.trace_id == TRACE_ID and span.parent_span_id == "00f067aa0ba902b7"
+
+    tracer.sample_rate = 1.0
+    span = tracer.start_request("/api/x", REQUEST_ID)
+    # A UUID request id is the trace id
+    assert span.trace_id == REQUEST_ID.replace("-", "") and span.attributes["request.id"] == REQUEST_ID
+    assert len(tracer.start_request("/api/x", "order-17").trace_id) == 32
+
+
+def test_request_span_with_nested_stage_spans(tracer):
+    import ai_service
+
+    client = ai_service.app.test_client()
+    response = client.post('/api/execute-code', json={
+        "code": "def solution(x):\n    return x * 2",
+        "language": "python",
+        "test_cases": [{"input": 2, "expected_output": 4}, {"input": 3, "expected_output": 6}]
+    }, headers={"X-Request-Id": REQUEST_ID})
+    assert response.status_code == 200
+    assert response.headers["X-Request-Id"] == REQUEST_ID
+    assert client.get('/health').headers["X-Request-Id"]  # generated when the caller sends none
+
+    spans = [s for s in tracer.exporter.spans if s.trace_id == REQUEST_ID.replace("-", "")]
+    root = next(s for s in spans if s.kind == SPAN_KIND_SERVER)
+    assert root.name == "/api/execute-code" and root.parent_span_id is None
+    assert root.attributes["http.response.status_code"] == 200
+
+    subprocess_spans = [s for s in spans if s.name == "code_execution_subprocess"]
+    assert len(subprocess_spans) == 2
+    for span in subprocess_spans:
+        assert span.parent_span_id == root.span_id
+        assert root.start_ns <= span.start_ns <= span.end_ns <= root.end_ns
+
+
+def test_spans_follow_work_to_threads_and_processes(tracer):
+    def on_pool_thread():
+        with stage("on_pool_thread"):
+            return 1
+
+    def in_worker():
+        with stage("in_child_process"):
+            return 2
+
+    root = Span("/api/score-assessment", TRACE_ID, kind=SPAN_KIND_SERVER)
+    token = request_tracing._current_span.set(root)
+    try:
+        with ThreadPoolExecutor(1) as pool:
+            with stage("outer"):
+                assert pool.submit(propagate_span(on_pool_thread)).result() == 1
+            # A process-pool worker has no span: its stages are captured and replayed here
+            result, observations = pool.submit(call_capturing_stages, in_worker).result()
+        assert result == 2 and not any(s.name == "in_child_process" for s in tracer.exporter.spans)
+        replay_stages(observations)
+    finally:
+        request_tracing._current_span.reset(token)
+
+    spans = {span.name: span for span in tracer.exporter.spans}
+    assert spans["outer"].parent_span_id == root.span_id
+    assert spans["on_pool_thread"].parent_span_id == spans["outer"].span_id
+    assert spans["in_child_process"].parent_span_id == root.span_id
+
+    failed = Span("gemini_generate", TRACE_ID)
+    failed.set_error("ValueError: boom")
+    line = json.loads(tracer.exporter.encode([spans["outer"], failed]))
+    otlp_spans = line["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert otlp_spans[0]["traceId"] == TRACE_ID and otlp_spans[0]["parentSpanId"] == root.span_id
+    assert int(otlp_spans[0]["endTimeUnixNano"]) >= int(otlp_spans[0]["startTimeUnixNano"])
+    assert otlp_spans[1]["status"] == {"code": STATUS_ERROR, "message": "ValueError: boom"}
@@ -0,0 +1,58 @@
+"""
+Test: Response Cache
+Tests LRU eviction, TTL expiry, the disk tier and cached /api/analyze-jd responses
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import time
+
+from response_cache import ResponseCache, make_cache_key
+
+
+def test_cache_key_is_canonical():
+    assert make_cache_key({"a": 1, "b": "x"}, "v1") == make_cache_key({"b": "x", "a": 1}, "v1")
+    assert make_cache_key({"a": 1}, "v1") != make_cache_key({"a": 1}, "v2")
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResponseCache("test_lru", max_entries=2, ttl_seconds=60)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}  # "a" is now most recently used
+    cache.put("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.stats()["evictions"] == 1
+
+    expiring = ResponseCache("test_ttl", max_entries=2, ttl_seconds=0.01)
+    expiring.put("a", {"v": 1})
+    time.sleep(0.02)
+    assert expiring.get("a") is None
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    ResponseCache("test_disk", max_entries=4, disk_dir=str(tmp_path)).put("key", {"skills": ["Python"]})
+
+    fresh = ResponseCache("test_disk", max_entries=4, disk_dir=str(tmp_path))
+    assert fresh.get("key") == {"skills": ["Python"]}
+    assert fresh.stats()["disk_hits"] == 1
+    assert fresh.get("key") == {"skills": ["Python"]}
+    assert fresh.stats()["memory_hits"] == 1
+
+
+def test_analyze_jd_served_from_cache():
+    from ai_service import app
+
+    client = app.test_client()
+    payload = {"job_description": "Backend engineer with Python, Django and PostgreSQL. 3+ years experience."}
+    first = client.post('/api/analyze-jd', json=payload)
+    second = client.post('/api/analyze-jd', json=payload)
+
+    assert first.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == first.get_json()
@@ -0,0 +1,63 @@
+"""
+Test: Response Encoding
+Tests the fast JSON serializer and Accept-Encoding negotiated compression
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import gzip
+import json
+
+import numpy as np
+from flask import Flask, jsonify
+
+import response_encoding
+from response_encoding import dumps, init_app
+
+
+def _make_app():
+    app = Flask(__name__)
+    init_app(app)
+
+    @app.route('/large')
+    def large():
+        return jsonify({"values": list(range(5000))})
+
+    @app.route('/small')
+    def small():
+        return jsonify({"ok": True})
+
+    return app
+
+
+def test_dumps_handles_numpy_and_big_integers():
+    assert json.loads(dumps({"score": np.float32(0.5), "ids": np.arange(3)})) == {"score": 0.5, "ids": [0, 1, 2]}
+    # Beyond orjson's 64-bit range: falls back to the stdlib encoder
+    assert json.loads(dumps({"factorial": 2 ** 80})) == {"factorial": 2 ** 80}
+
+
+def test_large_body_is_compressed_when_accepted():
+    client = _make_app().test_client()
+
+    response = client.get('/large', headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.get_data()))["values"][-1] == 4999
+
+    plain = client.get('/large')
+    assert "Content-Encoding" not in plain.headers
+    assert plain.get_json()["values"][-1] == 4999
+
+
+def test_small_body_is_not_compressed():
+    response = _make_app().test_client().get('/small', headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_zstd_preferred_when_available():
+    if not response_encoding.ZSTD_AVAILABLE:
+        return
+    response = _make_app().test_client().get('/large', headers={"Accept-Encoding": "gzip, zstd"})
+    assert response.headers["Content-Encoding"] == "zstd"
@@ -0,0 +1,91 @@
+"""
+Test: Sampling Profiler
+Tests per-endpoint stack attribution, the memory budget and the admin
+flame-graph endpoints
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import threading
+import time
+
+import sampling_profiler
+from sampling_profiler import TRUNCATED_STACK, SamplingProfiler
+
+TOKEN = "test-admin-token"
+
+
+def spin_marker(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def _busy_thread(profiler: SamplingProfiler, endpoint: str, stop: threading.Event):
+    ready = threading.Event()
+
+    def run():
+        profiler.bind(endpoint)
+        ready.set()
+        spin_marker(stop)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    ready.wait()
+    return thread
+
+
+def test_samples_attributed_to_bound_endpoint():
+    profiler = SamplingProfiler(rate_hz=100)
+    stop = threading.Event()
+    thread = _busy_thread(profiler, "/api/score-assessment", stop)
+    for _ in range(5):
+        profiler.sample_once()
+    stop.set()
+    thread.join()
+
+    lines = profiler.collapsed("/api/score-assessment").splitlines()
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == 5
+    assert all("test_sampling_profiler.py:spin_marker" in line for line in lines)
+    assert profiler.collapsed().startswith("/api/score-assessment;")
+    assert profiler.stats()["samples_by_endpoint"] == {"/api/score-assessment": 5}
+
+
+def test_memory_budget_folds_new_stacks():
+    profiler = SamplingProfiler(max_bytes=300)
+    for i in range(10):
+        profiler._add("/api/x", f"a.py:f;b.py:g{i}")
+    stats = profiler.stats()
+    assert stats["stack_bytes"] <= 300 + len(TRUNCATED_STACK) + sampling_profiler.STACK_OVERHEAD_BYTES
+    assert stats["truncated_samples"] > 0 and stats["samples"] == 10
+    assert f"{TRUNCATED_STACK} {stats['truncated_samples']}" in profiler.collapsed("/api/x")
+
+
+def test_admin_endpoints_and_request_binding(monkeypatch):
+    from ai_service import app
+
+    profiler = SamplingProfiler(rate_hz=500)
+    profiler.start()
+    monkeypatch.setattr(sampling_profiler, "_sampler", profiler)
+    monkeypatch.setenv("AI_SERVICE_ADMIN_TOKEN", TOKEN)
+    client = app.test_client()
+    admin = {"X-Admin-Token": TOKEN}
+    try:
+        client.post('/api/execute-code', json={
+            "code": "def f(x):\n    return x", "test_cases": [{"input": [1], "expected_output": 1}]
+        })
+        time.sleep(0.05)
+        assert profiler._threads == {}  # unbound once the request finished
+
+        assert client.get('/api/admin/flamegraph').status_code == 403
+        flamegraph = client.get('/api/admin/flamegraph', headers=admin)
+        assert flamegraph.status_code == 200 and flamegraph.mimetype == "text/plain"
+
+        stats = client.get('/api/admin/sampler', headers=admin).get_json()
+        assert stats["enabled"] is True and stats["rate_hz"] == 500.0
+
+        assert client.delete('/api/admin/flamegraph', headers=admin).get_json() == {"reset": True}
+        assert profiler.samples == 0
+    finally:
+        profiler.stop()
@@ -0,0 +1,85 @@
+"""
+Test: Service Logging
+Tests JSON log lines, per-endpoint levels and sampling, and that a full
+writer queue drops records instead of blocking the caller
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import io
+import json
+import logging
+import queue
+
+from flask import Flask, g
+
+from service_logging import (
+    LOG_RECORDS_DROPPED_TOTAL, EndpointFilter, JSONFormatter, NonBlockingQueueHandler, ServiceLogging
+)
+
+
+def _record(level=logging.INFO, msg="hello %s", args=("world",), exc_info=None, **extra):
+    record = logging.LogRecord("ai_service", level, __file__, 1, msg, args, exc_info)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_lines_include_extra_fields_and_traceback():
+    stream = io.StringIO()
+    service_logging = ServiceLogging(stream, "json")
+    service_logging.start()
+    logger = logging.getLogger("test_service_logging")
+    try:
+        logger.info("Assessment scored", extra={"overall_score": 80.0, "config": {"sections": {"mcq": 5}}})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Error in score_assessment_endpoint")
+    finally:
+        service_logging.stop()
+
+    scored, failed = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert scored["msg"] == "Assessment scored" and scored["level"] == "INFO"
+    assert scored["overall_score"] == 80.0 and scored["config"] == {"sections": {"mcq": 5}}
+    assert failed["level"] == "ERROR" and "ValueError: boom" in failed["exc"]
+
+    # Values orjson cannot serialize fall back to str()
+    line = json.loads(JSONFormatter().format(_record(payload={1, 2})))
+    assert line["msg"] == "hello world" and line["payload"] == "{1, 2}"
+
+
+def test_endpoint_levels_and_sampling():
+    app = Flask(__name__)
+    log_filter = EndpointFilter(
+        logging.INFO, {"/api/execute-code": logging.DEBUG, "/api/score-assessment": logging.WARNING},
+        {"/api/match-application": 0.0}
+    )
+    assert log_filter.min_level == logging.DEBUG
+
+    def kept(endpoint, level):
+        with app.test_request_context():
+            g.metrics_endpoint = endpoint
+            return log_filter.filter(_record(level))
+
+    assert kept("/api/execute-code", logging.DEBUG)
+    assert not kept("/api/analyze-jd", logging.DEBUG)
+    assert not kept("/api/score-assessment", logging.INFO)
+    assert kept("/api/score-assessment", logging.WARNING)
+    assert not kept("/api/match-application", logging.INFO)
+    # Warnings and errors are never sampled out
+    assert kept("/api/match-application", logging.ERROR)
+    # Outside a request the default level applies
+    assert log_filter.filter(_record(logging.INFO)) and not log_filter.filter(_record(logging.DEBUG))
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(2))
+    dropped_before = LOG_RECORDS_DROPPED_TOTAL.get()
+    for _ in range(5):
+        handler.handle(_record())
+    assert handler.queue.qsize() == 2
+    assert LOG_RECORDS_DROPPED_TOTAL.get() - dropped_before == 3
+    # The message is interpolated on the caller's thread
+    assert handler.queue.get_nowait().msg == "hello world"
@@ -0,0 +1,73 @@
+"""
+Test: Service Metrics
+Tests Prometheus text rendering, stage timing and the /metrics endpoint
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from service_metrics import (
+    Histogram, REGISTRY, STAGE_DURATION, STAGE_ERRORS_TOTAL,
+    call_capturing_stages, render_metrics, replay_stages, stage
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_latency_seconds", "Test histogram", ("endpoint",), buckets=(0.1, 1.0))
+    try:
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5.0, "/a")
+
+        lines = histogram.render()
+        assert 'test_latency_seconds_bucket{endpoint="/a",le="0.1"} 1' in lines
+        assert 'test_latency_seconds_bucket{endpoint="/a",le="1"} 2' in lines
+        assert 'test_latency_seconds_bucket{endpoint="/a",le="+Inf"} 3' in lines
+        assert 'test_latency_seconds_count{endpoint="/a"} 3' in lines
+    finally:
+        REGISTRY.remove(histogram)
+
+
+def test_stage_records_duration_and_errors():
+    before = STAGE_DURATION.get_count("test_stage")
+    with stage("test_stage"):
+        pass
+    with pytest.raises(ValueError):
+        with stage("test_stage"):
+            raise ValueError("boom")
+
+    assert STAGE_DURATION.get_count("test_stage") == before + 2
+    assert STAGE_ERRORS_TOTAL.get("test_stage") >= 1
+
+
+def test_captured_stages_are_replayed():
+    def work():
+        with stage("child_stage"):
+            return 42
+
+    before = STAGE_DURATION.get_count("child_stage")
+    result, observations = call_capturing_stages(work)
+    assert result == 42
+    # Captured, not recorded, until the parent replays them
+    assert STAGE_DURATION.get_count("child_stage") == before
+
+    replay_stages(observations)
+    assert STAGE_DURATION.get_count("child_stage") == before + 1
+
+
+def test_metrics_endpoint_counts_requests():
+    from ai_service import app
+
+    client = app.test_client()
+    client.get('/health')
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    body = response.get_data(as_text=True)
+    assert 'ai_service_requests_total{endpoint="/health",method="GET",status="200"}' in body
+    assert 'ai_service_request_duration_seconds_bucket{endpoint="/health",le="+Inf"}' in body
+    assert render_metrics().startswith("# HELP")
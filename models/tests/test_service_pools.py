@@ -0,0 +1,45 @@
+"""
+Test: Service Worker Pools
+Tests inline fallback, offloaded execution and queue-depth tracking
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import threading
+
+import service_pools
+from service_pools import TrackedPool, run_blocking
+
+
+def test_run_blocking_inline_when_offload_disabled(monkeypatch):
+    monkeypatch.setenv("AI_SERVICE_OFFLOAD", "0")
+    assert run_blocking("io", threading.current_thread) is threading.current_thread()
+
+
+def test_run_blocking_uses_pool_when_offload_enabled(monkeypatch):
+    monkeypatch.setenv("AI_SERVICE_OFFLOAD", "1")
+    worker = run_blocking("io", threading.current_thread)
+    assert worker is not threading.current_thread()
+    assert service_pools.get_pool_stats()["io"]["completed"] >= 1
+
+
+def test_queue_depth_counts_waiting_tasks():
+    pool = TrackedPool("test", "thread", max_workers=1)
+    release = threading.Event()
+    futures = [pool.submit(release.wait) for _ in range(3)]
+
+    stats = pool.stats()
+    assert stats["in_flight"] == 3
+    assert stats["queue_depth"] == 2
+
+    release.set()
+    for future in futures:
+        future.result()
+    pool.shutdown()
+
+    stats = pool.stats()
+    assert stats["in_flight"] == 0
+    assert stats["max_queue_depth"] == 2
+    assert stats["completed"] == 3
@@ -0,0 +1,107 @@
+"""
+Test: Shortlist Pipeline
+Tests the single-call PDF -> shortlist endpoint, its parity with
+parse-pdf + match-application and JD reuse by jd_id
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import io
+import zlib
+
+import numpy as np
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+JD = "Backend developer Java Spring Boot SQL Docker"
+RESUME = "Jane Doe - Java Spring Boot developer with SQL and Docker experience"
+
+
+class FakeModel:
+    """Hashed bag-of-words 768-d embeddings; records every encode call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, normalize_embeddings=False):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), 768), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % 768] += 1.0
+        if normalize_embeddings:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+
+def _pdf(text: str) -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import ai_service
+    import shortlist_pipeline
+
+    model = FakeModel()
+    monkeypatch.setattr(ai_service, "_model_cache", model)
+    monkeypatch.setattr(shortlist_pipeline, "_jd_cache", shortlist_pipeline.JDEmbeddingCache())
+    client = ai_service.app.test_client()
+    client.model = model
+    return client
+
+
+def _post(client, **form):
+    return client.post(
+        '/api/shortlist-pdf',
+        data={"file": (io.BytesIO(_pdf(RESUME)), "resume.pdf"), **form},
+        content_type="multipart/form-data"
+    )
+
+
+def test_matches_parse_then_match(client):
+    combined = _post(client, jd_text=JD, min_score_threshold="40", include_text="true")
+    assert combined.status_code == 200
+    body = combined.get_json()
+
+    parsed = client.post(
+        '/api/parse-pdf', data={"file": (io.BytesIO(_pdf(RESUME)), "resume.pdf")},
+        content_type="multipart/form-data"
+    ).get_json()
+    matched = client.post('/api/match-application', json={
+        "jd_text": JD, "resume_text": parsed["text"], "min_score_threshold": 40
+    }).get_json()
+
+    assert body["text"] == parsed["text"]
+    for field in ("shortlisted", "score", "threshold"):
+        assert body[field] == matched[field]
+    assert "text" not in _post(client, jd_text=JD).get_json()
+
+
+def test_jd_id_reuses_cached_embedding(client):
+    first = _post(client, jd_text=JD, min_score_threshold="40").get_json()
+    encoded_before = len(client.model.calls)
+
+    second = _post(client, jd_id=first["jd_id"], min_score_threshold="40").get_json()
+    assert second["score"] == first["score"]
+    assert len(client.model.calls) == encoded_before + 1  # resume only
+
+    unknown = _post(client, jd_id="0" * 32)
+    assert unknown.status_code == 404 and unknown.get_json()["unknown_jd_id"] is True
+
+
+def test_invalid_inputs(client):
+    assert _post(client).status_code == 400
+    assert _post(client, jd_text=JD, min_score_threshold="high").status_code == 400
+    bad_pdf = client.post(
+        '/api/shortlist-pdf', data={"file": (io.BytesIO(b"not a pdf"), "bad.pdf"), "jd_text": JD},
+        content_type="multipart/form-data"
+    )
+    assert bad_pdf.status_code == 400
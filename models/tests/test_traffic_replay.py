@@ -0,0 +1,123 @@
+"""
+Test: Traffic Record and Replay
+Tests request sanitization, the gzip JSONL recording middleware, the Gemini
+stub and replaying a recording against a local instance
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import io
+import threading
+
+import pytest
+
+import traffic_recorder
+from traffic_recorder import REDACTED, sanitize
+from traffic_replay import load_records, replay, start_local_service, stub_gemini, summarize
+
+MCQ_PAYLOAD = {
+    "questions": [{"id": "1", "type": "mcq", "options": ["3", "4"], "correctAnswer": "4"}],
+    "answers": {"1": "4"}
+}
+
+
+def test_sanitize_redacts_secrets_and_masks_resume_text():
+    body = {
+        "api_key": "AIza-secret",
+        "jd_text": "Python developer",
+        "resume_text": "Jane Doe, jane@mail.com, +91 98765",
+        "items": [{"resume_text": "Bob 42", "auth_token": "t"}],
+        "resume_texts": ["Ann 7"]
+    }
+    clean = sanitize(body)
+    assert clean["api_key"] == REDACTED and clean["items"][0]["auth_token"] == REDACTED
+    assert clean["jd_text"] == "Python developer"
+    assert clean["resume_text"] == "xxxx xxx, xxxx@xxxx.xxx, +00 00000"
+    assert clean["items"][0]["resume_text"] == "xxx 00" and clean["resume_texts"] == ["xxx 0"]
+
+
+@pytest.fixture
+def recording(tmp_path, monkeypatch):
+    monkeypatch.setattr(traffic_recorder, "RECORD_DIR", str(tmp_path))
+    monkeypatch.setattr(traffic_recorder, "_recorder", None)
+    from ai_service import app
+
+    client = app.test_client()
+    client.post('/api/score-assessment', json={**MCQ_PAYLOAD, "api_key": "secret"})
+    client.post('/api/execute-code', json={"code": "def f(): pass", "test_cases": []})
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Jane Doe - Backend Engineer - Python, Django, PostgreSQL, Docker")
+    client.post('/api/parse-pdf', data={"file": (io.BytesIO(doc.tobytes()), "jane.pdf")},
+                content_type="multipart/form-data")
+    traffic_recorder.get_traffic_recorder().close()
+    return [str(path) for path in tmp_path.iterdir()]
+
+
+def test_recorder_writes_sanitized_records(recording):
+    assert len(recording) == 1 and recording[0].endswith(".jsonl.gz")
+    records = load_records(recording)
+
+    assert [(r["endpoint"], r["status"]) for r in records] == [
+        ("/api/score-assessment", 200), ("/api/execute-code", 400), ("/api/parse-pdf", 200)
+    ]
+    assert records[0]["body"]["api_key"] == REDACTED
+    assert all(r["duration_ms"] > 0 and r["ts"] for r in records)
+    upload = records[2]["files"][0]
+    assert upload["pages"] == 1 and upload["size"] > 0
+    assert "Jane" not in open(recording[0], "rb").read().decode("latin-1")
+
+
+def test_replay_against_local_instance(recording):
+    from werkzeug.serving import make_server
+    from ai_service import app
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        records = load_records(recording)
+        results = replay(records, f"http://127.0.0.1:{server.server_port}", speed=0, concurrency=2)
+    finally:
+        server.shutdown()
+
+    assert [r["status"] for r in results] == [200, 400, 200]
+    report = summarize(records, results)
+    assert report["all"]["requests"] == 3 and report["all"]["errors"] == 0
+    assert report["/api/parse-pdf"]["p50_ms"] > 0
+
+
+def test_stubbed_gemini_generates_full_assessment(monkeypatch):
+    genai = pytest.importorskip("google.generativeai")
+    for name in ("configure", "list_models", "GenerativeModel"):
+        monkeypatch.setattr(genai, name, getattr(genai, name))  # restored after the test
+    stub_gemini(latency=0)
+    from assessment_generator import generate_assessment
+
+    config = {
+        "experience_years": 2, "experience_level": "Mid", "difficulty": "Hard",
+        "sections": {
+            "mcq": {"total_time_minutes": 20, "question_count": 5},
+            "subjective": {"topic": "SQL", "total_time_minutes": 30, "question_count": 3},
+            "coding": {"topic": "DSA", "total_time_minutes": 60, "question_count": 2}
+        }
+    }
+    result = generate_assessment(config, api_key="stub")
+    assert [len(result[s]) for s in ("mcq", "subjective", "coding")] == [5, 3, 2]
+
+
+def test_local_service_does_not_record_the_replay(tmp_path, monkeypatch):
+    import ai_service
+
+    monkeypatch.setattr(traffic_recorder, "RECORD_DIR", str(tmp_path))
+    monkeypatch.setattr(traffic_recorder, "_recorder", None)
+
+    def no_warmup():
+        thread = threading.Thread(target=lambda: None)
+        thread.start()
+        return thread
+
+    monkeypatch.setattr(ai_service, "start_warmup", no_warmup)
+    start_local_service(0.0)
+    assert traffic_recorder.get_traffic_recorder() is None
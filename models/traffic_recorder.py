@@ -0,0 +1,189 @@
+"""
+Traffic Recorder - opt-in capture of sanitized production requests for replay
+Latency regressions seen in production are hard to reproduce with synthetic
+inputs: payload sizes, endpoint mix and arrival pattern all matter. When
+AI_SERVICE_RECORD_DIR is set, every request (or a sample of them) is appended
+to a gzip-compressed JSONL log with its arrival time, status and duration.
+traffic_replay.py re-issues the log against a local instance.
+
+Sanitization (nothing secret or personal is written):
+- secrets:         body/form fields named like api_key, token, secret or password
+                   are replaced by "[REDACTED]"
+- resume text:     resume_text / resumeText / resume_texts / text keep their
+                   shape (length, whitespace, punctuation) with letters turned
+                   into "x" and digits into "0", so encoding cost is preserved
+- uploaded files:  only size and an approximate page count are kept (the
+                   replay tool synthesizes a PDF of that shape)
+- headers:         only the ones that change service behaviour (content type,
+                   Accept, Accept-Encoding, timeout and priority)
+Job descriptions, assessment questions and candidate answers (code, SQL) are
+kept as sent: they drive the cost being measured and are not personal data.
+
+One file per process: <dir>/traffic-<pid>-<start time>.jsonl.gz. Records are
+flushed every AI_SERVICE_RECORD_FLUSH_EVERY records and at exit; a file cut
+short by a crash is still readable up to its last flush.
+
+Environment:
+    AI_SERVICE_RECORD_DIR          - directory for recordings (unset = off)
+    AI_SERVICE_RECORD_SAMPLE       - fraction of requests recorded (default: 1.0)
+    AI_SERVICE_RECORD_FLUSH_EVERY  - records between flushes (default: 50)
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from flask import Request
+
+logger = logging.getLogger(__name__)
+
+RECORD_DIR = os.getenv("AI_SERVICE_RECORD_DIR")
+SAMPLE_RATE = float(os.getenv("AI_SERVICE_RECORD_SAMPLE", 1.0))
+FLUSH_EVERY = int(os.getenv("AI_SERVICE_RECORD_FLUSH_EVERY", 50))
+
+REDACTED = "[REDACTED]"
+SECRET_FIELD_PATTERN = re.compile(r"api_?key|token|secret|password", re.IGNORECASE)
+PERSONAL_TEXT_FIELDS = {"resume_text", "resumeText", "resume_texts", "text", "texts"}
+RECORDED_HEADERS = (
+    "Content-Type", "Accept", "Accept-Encoding", "X-Request-Timeout", "X-Request-Priority"
+)
+
+_LETTERS = re.compile(r"[^\W\d_]")
+_DIGITS = re.compile(r"\d")
+# Page objects in a PDF ("/Type /Page", not "/Type /Pages"); approximate but cheap
+_PDF_PAGE = re.compile(rb"/Type\s*/Page(?![a-zA-Z])")
+
+
+def mask_text(text: str) -> str:
+    """Same-shaped placeholder for personal text (letters -> x, digits -> 0)."""
+    return _DIGITS.sub("0", _LETTERS.sub("x", text))
+
+
+def _mask_personal(value: Any) -> Any:
+    if isinstance(value, str):
+        return mask_text(value)
+    if isinstance(value, list):
+        return [_mask_personal(item) for item in value]
+    return value
+
+
+def sanitize(value: Any) -> Any:
+    """Copy of a JSON body with secrets redacted and resume text masked."""
+    if isinstance(value, dict):
+        clean = {}
+        for key, item in value.items():
+            if SECRET_FIELD_PATTERN.search(key):
+                clean[key] = REDACTED
+            elif key in PERSONAL_TEXT_FIELDS:
+                clean[key] = _mask_personal(item)
+            else:
+                clean[key] = sanitize(item)
+        return clean
+    if isinstance(value, list):
+        return [sanitize(item) for item in value]
+    return value
+
+
+def _describe_upload(field: str, upload) -> Dict[str, Any]:
+    stream = upload.stream
+    data = stream.getvalue() if hasattr(stream, "getvalue") else b""
+    return {
+        "field": field,
+        "size": len(data),
+        "pages": len(_PDF_PAGE.findall(data)),
+        "content_type": upload.content_type
+    }
+
+
+def describe_request(req: Request) -> Dict[str, Any]:
+    """
+    Sanitized, replayable description of a request (call before the request
+    context ends: uploads are closed then).
+    """
+    record: Dict[str, Any] = {
+        "method": req.method,
+        "path": req.path,
+        "query": req.query_string.decode("latin-1"),
+        "endpoint": req.url_rule.rule if req.url_rule is not None else "unmatched",
+        "headers": {name: req.headers[name] for name in RECORDED_HEADERS if name in req.headers},
+        "body_bytes": req.content_length or 0
+    }
+    if req.mimetype == "multipart/form-data":
+        record["form"] = sanitize(req.form.to_dict())
+        record["files"] = [
+            _describe_upload(field, upload)
+            for field, upload in req.files.items(multi=True)
+            if upload.filename
+        ]
+    elif req.is_json:
+        body = req.get_json(silent=True)
+        if body is not None:
+            record["body"] = sanitize(body)
+    return record
+
+
+class TrafficRecorder:
+    """
+    Thread-safe gzip JSONL writer for request records.
+
+    Args:
+        path: Output file (.jsonl.gz)
+        sample_rate: Fraction of requests recorded (0-1)
+        flush_every: Records between flushes
+    """
+
+    def __init__(self, path: str, sample_rate: float = SAMPLE_RATE, flush_every: int = FLUSH_EVERY):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.flush_every = max(1, flush_every)
+        self.recorded = 0
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def should_record(self) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def write(self, record: Dict[str, Any], status: int, duration_seconds: float) -> None:
+        """Append one finished request (record from describe_request)."""
+        line = json.dumps(
+            {**record, "status": status, "duration_ms": round(duration_seconds * 1000, 3)},
+            separators=(",", ":"), ensure_ascii=False
+        )
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self.recorded += 1
+            if self.recorded % self.flush_every == 0:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+# Global recorder (one per service process, None when recording is off)
+_recorder: Optional[TrafficRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_traffic_recorder() -> Optional[TrafficRecorder]:
+    global _recorder
+    if not RECORD_DIR:
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            os.makedirs(RECORD_DIR, exist_ok=True)
+            path = os.path.join(RECORD_DIR, f"traffic-{os.getpid()}-{int(time.time())}.jsonl.gz")
+            _recorder = TrafficRecorder(path)
+            atexit.register(_recorder.close)
+            logger.info("Recording traffic", extra={"path": path, "sample_rate": _recorder.sample_rate})
+        return _recorder
@@ -0,0 +1,359 @@
+"""
+Traffic Replay - re-issue recorded production traffic against a local instance
+Reads the gzip JSONL logs written by traffic_recorder.py (AI_SERVICE_RECORD_DIR)
+and sends every request again, at the original pace, faster, or as fast as
+possible, then reports latency percentiles and throughput per endpoint next to
+the latencies recorded in production.
+
+By default the service is started in this process on a free local port with
+Gemini stubbed: google.generativeai is replaced by a fake that answers every
+prompt with well-formed questions after --gemini-latency seconds, so generation
+traffic costs no quota and has stable latency. Everything else (encoding, PDF
+parsing, scoring, code execution) runs for real. Use --target to replay against
+an instance that is already running (Gemini is then whatever it uses).
+
+Recorded resume text is masked and uploads are replaced by synthesized PDFs
+with the recorded page count and size (see traffic_recorder.py), so matching
+scores differ from production while the work per request stays comparable.
+
+Run:
+    python traffic_replay.py recordings/traffic-*.jsonl.gz
+    python traffic_replay.py traffic.jsonl.gz --speed 4 --endpoint /api/match-application
+    python traffic_replay.py traffic.jsonl.gz --speed 0 --concurrency 8 --json-out report.json
+    python traffic_replay.py traffic.jsonl.gz --target http://localhost:5000
+"""
+
+import argparse
+import gzip
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import traffic_recorder
+from traffic_recorder import REDACTED, SECRET_FIELD_PATTERN
+
+
+# ============================================================================
+# LOADING RECORDS
+# ============================================================================
+
+def load_records(paths: Iterable[str], endpoints: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Read recordings (several files are merged by arrival time).
+
+    A file cut short by a crash is read up to its last complete record.
+    """
+    records = []
+    for path in paths:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # partially written last line
+                    if endpoints and record.get("endpoint") not in endpoints:
+                        continue
+                    records.append(record)
+            except (EOFError, gzip.BadGzipFile):
+                print(f"Warning: {path} is truncated; replaying the records read so far")
+    records.sort(key=lambda r: r.get("ts") or 0)
+    return records
+
+
+# ============================================================================
+# REBUILDING REQUESTS
+# ============================================================================
+
+def _drop_redacted(value):
+    """Remove redacted secrets so the local instance uses its own (stub) credentials."""
+    if isinstance(value, dict):
+        return {
+            key: _drop_redacted(item) for key, item in value.items()
+            if not (item == REDACTED and SECRET_FIELD_PATTERN.search(key))
+        }
+    if isinstance(value, list):
+        return [_drop_redacted(item) for item in value]
+    return value
+
+
+_pdf_cache: Dict[Tuple[int, int], bytes] = {}
+_pdf_cache_lock = threading.Lock()
+
+
+def synthesize_pdf(pages: int, size: int) -> bytes:
+    """
+    PDF with the recorded page count (filler text per page), padded with an
+    embedded attachment to roughly the recorded size.
+    """
+    pages = max(1, min(pages, 50))
+    key = (pages, size // 4096)
+    with _pdf_cache_lock:
+        if key in _pdf_cache:
+            return _pdf_cache[key]
+    try:
+        import fitz
+    except ImportError:
+        print("Warning: PyMuPDF not installed; uploads are replayed as placeholder bytes")
+        return b"%PDF-1.4 placeholder" + b"\0" * max(0, size - 20)
+
+    filler = ("Experienced software engineer. Python, Java, SQL, Docker, Kubernetes, AWS. "
+              "Built and operated backend services and data pipelines. ") * 4
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page().insert_textbox(fitz.Rect(50, 50, 550, 800), filler * 6, fontsize=9)
+    data = doc.tobytes()
+    if size > len(data):
+        doc.embfile_add("padding", os.urandom(size - len(data)))
+        data = doc.tobytes()
+    doc.close()
+    with _pdf_cache_lock:
+        _pdf_cache[key] = data
+    return data
+
+
+def _multipart(form: Dict[str, str], files: List[Dict]) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in form.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for index, upload in enumerate(files):
+        header = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{upload["field"]}"; '
+            f'filename="replay-{index}.pdf"\r\n'
+            f'Content-Type: {upload.get("content_type") or "application/pdf"}\r\n\r\n'
+        )
+        parts.append(header.encode() + synthesize_pdf(upload.get("pages", 1), upload.get("size", 0)) + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def build_request(record: Dict, target: str) -> urllib.request.Request:
+    """urllib request equivalent to a recorded one."""
+    url = target.rstrip("/") + record["path"] + (f"?{record['query']}" if record.get("query") else "")
+    headers = dict(record.get("headers", {}))
+    data = None
+    if "files" in record or "form" in record:
+        data, headers["Content-Type"] = _multipart(_drop_redacted(record.get("form", {})), record.get("files", []))
+    elif "body" in record:
+        data = json.dumps(_drop_redacted(record["body"])).encode()
+        headers["Content-Type"] = "application/json"
+    return urllib.request.Request(url, data=data, headers=headers, method=record["method"])
+
+
+# ============================================================================
+# LOCAL INSTANCE WITH STUBBED GEMINI
+# ============================================================================
+
+class StubGenerativeModel:
+    """Stands in for google.generativeai.GenerativeModel: canned JSON after a fixed delay."""
+
+    latency = 1.0
+
+    def __init__(self, model_name: str = "models/gemini-stub", **kwargs):
+        self.name = model_name
+
+    def generate_content(self, prompt: str, request_options: Optional[Dict] = None):
+        timeout = (request_options or {}).get("timeout")
+        if timeout is not None and timeout < self.latency:
+            time.sleep(timeout)
+            raise TimeoutError("Stub Gemini call timed out")
+        time.sleep(self.latency)
+        return SimpleNamespace(text=json.dumps(stub_reply(prompt)))
+
+
+def stub_reply(prompt: str):
+    """Well-formed answer for the generator's prompts ("Low" passes every difficulty filter)."""
+    match = re.search(r"Generate exactly (\d+)", prompt)
+    count = int(match.group(1)) if match else 1
+    if "test case inputs" in prompt:
+        return []
+    if "Multiple Choice" in prompt:
+        return {"questions": [
+            {"question": f"Stub MCQ {i + 1}?", "options": ["A", "B", "C", "D"], "correct_answer": "A",
+             "difficulty": "Low", "estimated_time": 1}
+            for i in range(count)
+        ]}
+    if "Coding Problems" in prompt:
+        return {"problems": [
+            {"title": f"Stub problem {i + 1}", "problem": "Return the indices of two numbers adding to target.",
+             "pattern": "Array + Hashing", "problem_type": "two_sum", "difficulty": "Low", "estimated_time": 30}
+            for i in range(count)
+        ]}
+    return {"questions": [
+        {"question": f"Write a SQL query for stub question {i + 1}.", "difficulty": "Low", "estimated_time": 3}
+        for i in range(count)
+    ]}
+
+
+def stub_gemini(latency: float) -> None:
+    """Replace the google.generativeai entry points the service uses."""
+    import google.generativeai as genai
+
+    StubGenerativeModel.latency = latency
+    genai.configure = lambda **kwargs: None
+    genai.list_models = lambda: [
+        SimpleNamespace(name="models/gemini-stub", supported_generation_methods=["generateContent"])
+    ]
+    genai.GenerativeModel = StubGenerativeModel
+
+
+def start_local_service(gemini_latency: float) -> str:
+    """Start ai_service in this process on a free port; returns its base URL."""
+    # Never record the replay itself (RECORD_DIR was read when traffic_recorder was imported)
+    os.environ.pop("AI_SERVICE_RECORD_DIR", None)
+    traffic_recorder.RECORD_DIR = None
+    os.environ.setdefault("GEMINI_API_KEY", "replay-stub-key")
+    stub_gemini(gemini_latency)
+
+    import logging
+    from werkzeug.serving import make_server
+    from ai_service import app, start_warmup
+
+    # Per-request access log lines would drown the report
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    start_warmup().join()
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="replay-service", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+# ============================================================================
+# REPLAY AND REPORT
+# ============================================================================
+
+def _send(record: Dict, target: str, timeout: float) -> Dict:
+    request = build_request(record, target)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except Exception as e:
+        print(f"Request to {record['path']} failed: {e}")
+        status = 0
+    end = time.perf_counter()
+    return {"endpoint": record.get("endpoint", record["path"]), "status": status, "start": start, "end": end}
+
+
+def replay(records: List[Dict], target: str, speed: float = 1.0, concurrency: int = 32,
+           timeout: float = 300.0) -> List[Dict]:
+    """
+    Send records with their original spacing divided by speed (0 = no waiting).
+
+    Returns:
+        One {endpoint, status, start, end} result per record
+    """
+    if not records:
+        return []
+    first_ts = records[0].get("ts") or 0
+    replay_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = []
+        for record in records:
+            if speed > 0 and record.get("ts") is not None:
+                delay = replay_start + (record["ts"] - first_ts) / speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            futures.append(pool.submit(_send, record, target, timeout))
+        return [future.result() for future in futures]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def summarize(records: List[Dict], results: List[Dict]) -> Dict[str, Dict]:
+    """Per-endpoint latency percentiles and throughput (plus "all")."""
+    groups: Dict[str, Tuple[List[Dict], List[Dict]]] = {}
+    for record, result in zip(records, results):
+        for name in (result["endpoint"], "all"):
+            recorded, replayed = groups.setdefault(name, ([], []))
+            recorded.append(record)
+            replayed.append(result)
+
+    report = {}
+    for name, (recorded, replayed) in groups.items():
+        latencies = [(r["end"] - r["start"]) * 1000 for r in replayed]
+        window = max(r["end"] for r in replayed) - min(r["start"] for r in replayed)
+        recorded_ms = [r["duration_ms"] for r in recorded if r.get("duration_ms") is not None]
+        report[name] = {
+            "requests": len(replayed),
+            "errors": sum(1 for r in replayed if r["status"] == 0 or r["status"] >= 500),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p90_ms": round(percentile(latencies, 90), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "throughput_rps": round(len(replayed) / window, 2) if window > 0 else None,
+            "recorded_p50_ms": round(percentile(recorded_ms, 50), 1),
+            "recorded_p99_ms": round(percentile(recorded_ms, 99), 1)
+        }
+    return report
+
+
+def print_report(report: Dict[str, Dict]) -> None:
+    print(f"{'endpoint':<32} {'n':>6} {'err':>5} {'p50':>9} {'p90':>9} {'p99':>9} {'req/s':>8} "
+          f"{'rec p50':>9} {'rec p99':>9}")
+    for name in sorted(report, key=lambda n: (n == "all", n)):
+        row = report[name]
+        rps = f"{row['throughput_rps']:.2f}" if row["throughput_rps"] is not None else "-"
+        print(f"{name:<32} {row['requests']:>6} {row['errors']:>5} {row['p50_ms']:>7.1f}ms "
+              f"{row['p90_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms {rps:>8} "
+              f"{row['recorded_p50_ms']:>7.1f}ms {row['recorded_p99_ms']:>7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded AI service traffic")
+    parser.add_argument("recordings", nargs="+", help="traffic-*.jsonl.gz files")
+    parser.add_argument("--target", help="Base URL of a running instance (default: start one locally)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Pace multiplier (1 = original, 4 = four times faster, 0 = no waiting)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Maximum requests in flight")
+    parser.add_argument("--endpoint", action="append", help="Only replay this endpoint (repeatable)")
+    parser.add_argument("--limit", type=int, help="Replay at most this many records")
+    parser.add_argument("--gemini-latency", type=float, default=1.0,
+                        help="Seconds per stubbed Gemini call (local instance only)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json-out", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    records = load_records(args.recordings, args.endpoint)
+    if args.limit:
+        records = records[:args.limit]
+    if not records:
+        print("No records to replay")
+        return
+
+    target = args.target or start_local_service(args.gemini_latency)
+    print(f"Replaying {len(records)} requests against {target} (speed {args.speed or 'max'})")
+    results = replay(records, target, args.speed, args.concurrency, args.timeout)
+
+    report = summarize(records, results)
+    print_report(report)
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()